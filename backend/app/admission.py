@@ -0,0 +1,173 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, TypeVar
+from fastapi import HTTPException, Response
+from app.circuit import NEO4J_FAILURES
+from app.config import settings
+from app.database import current_dataset
+from app.metrics import ADMISSION_COST, ADMISSION_DECISIONS
+from app.neo4j_guard import QueryTimeout
+from app.services.network import GraphBackend
+
+T = TypeVar("T")
+
+
+# ─────────────────────────────────────────────
+# ADMISSION DES REQUÊTES RÉSEAU COÛTEUSES
+# ─────────────────────────────────────────────
+# Le coût de chaque requête de graphe est estimé avant exécution (GraphCostModel).
+# Sous ADMISSION_COST_THRESHOLD : exécutée directement. Au-delà : elle doit
+# obtenir un des ADMISSION_MAX_EXPENSIVE créneaux du worker (attente bornée
+# par ADMISSION_WAIT_SECONDS). Sans créneau, dans l'ordre :
+#   1. dernière réponse complète en cache (même paramètres, même jeu de données)
+#   2. version réduite sous le seuil (ex. moins de versets, tri mushaf),
+#      exécutée comme la requête complète (disjoncteur, budget, repli)
+#   3. 503 + Retry-After
+# La requête reçoit la source du graphe (services.network.graph_backends).
+# Source principale en difficulté — disjoncteur ouvert (circuit.py),
+# indisponible, ou budget dépassé (neo4j_guard.QueryTimeout) : cache, sinon
+# même requête sur la source de repli (PostgreSQL, table ayah_pair), sinon
+# 504 / 503.
+# Les réponses dégradées portent X-Degraded (cached | reduced | partial | fallback)
+# et pas d'ETag.
+
+_slots = threading.BoundedSemaphore(settings.ADMISSION_MAX_EXPENSIVE)
+
+# Dernières réponses complètes de la source principale (LRU, par worker)
+_cache: OrderedDict[tuple, object] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key: tuple):
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    return None
+
+
+def _cache_put(key: tuple, value):
+    with _cache_lock:
+        _cache[key] = value
+        _cache.move_to_end(key)
+        while len(_cache) > settings.ADMISSION_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def _is_partial(result) -> bool:
+    meta = getattr(result, "meta", None)
+    return bool(getattr(meta, "partial", False))
+
+
+def is_expensive(cost: int) -> bool:
+    return settings.ADMISSION_ENABLED and cost >= settings.ADMISSION_COST_THRESHOLD
+
+
+def run(
+    route: str,
+    params: tuple,
+    cost: int,
+    response: Response,
+    backends: tuple[GraphBackend, GraphBackend | None],
+    query: Callable[[GraphBackend], T],
+    degrade: Callable[[GraphBackend], T] | None = None,
+) -> T:
+    """
+    Exécute `query` sur la source principale si la requête est admise, sinon
+    la dégrade ou la rejette. Une seule décision comptée par requête.
+    `backends` : (source principale, source de repli ou None).
+    `degrade`  : variante sous le seuil de coût (None s'il n'y en a pas).
+    """
+    ADMISSION_COST.observe(cost, route=route)
+    key = (route, current_dataset().version, *params)
+    if not is_expensive(cost):
+        return _compute(route, key, response, backends, query, "cheap")
+
+    if _slots.acquire(timeout=settings.ADMISSION_WAIT_SECONDS):
+        try:
+            return _compute(route, key, response, backends, query, "admitted")
+        finally:
+            _slots.release()
+
+    cached = _cache_get(key)
+    if cached is not None:
+        return _cached(route, response, cached)
+    if degrade is not None:
+        # Même chemin que la requête complète : disjoncteur, budget, source de repli
+        return _compute(route, key, response, backends, degrade, "reduced")
+    return _fallback(route, key, response)
+
+
+def _compute(route: str, key: tuple, response: Response,
+             backends: tuple[GraphBackend, GraphBackend | None], query: Callable[[GraphBackend], T],
+             decision: str) -> T:
+    """Interroge la source principale si son disjoncteur le permet ; garde la réponse complète en cache."""
+    primary, secondary = backends
+    fallback = (lambda: query(secondary)) if secondary is not None else None
+    breaker = primary.breaker
+    if breaker is None:
+        return _store(route, key, response, query(primary), decision)
+
+    if not breaker.allow():
+        return _fallback(route, key, response, fallback=fallback, outage=True)
+
+    try:
+        result = query(primary)
+    except QueryTimeout:
+        breaker.record_failure()
+        return _fallback(route, key, response, fallback=fallback, timed_out=True)
+    except NEO4J_FAILURES:
+        breaker.record_failure()
+        return _fallback(route, key, response, fallback=fallback, outage=True)
+    except Exception:
+        breaker.record_success()   # la source a répondu (erreur de la requête, client parti)
+        raise
+    breaker.record_success()
+    return _store(route, key, response, result, decision)
+
+
+def _store(route: str, key: tuple, response: Response, result: T, decision: str) -> T:
+    ADMISSION_DECISIONS.inc(route=route, decision=decision)
+    if decision == "reduced":
+        # Réponse réduite : jamais en cache (le cache ne sert que des réponses complètes)
+        response.headers["X-Degraded"] = "reduced"
+    elif _is_partial(result):
+        response.headers["X-Degraded"] = "partial"
+    elif result is not None:
+        _cache_put(key, result)
+    return result
+
+
+def _cached(route: str, response: Response, cached: T) -> T:
+    ADMISSION_DECISIONS.inc(route=route, decision="cached")
+    response.headers["X-Degraded"] = "cached"
+    return cached
+
+
+def _fallback(route: str, key: tuple, response: Response, fallback: Callable[[], T] | None = None,
+              timed_out: bool = False, outage: bool = False) -> T:
+    cached = _cache_get(key)
+    if cached is not None:
+        return _cached(route, response, cached)
+
+    if fallback is not None:
+        ADMISSION_DECISIONS.inc(route=route, decision="fallback")
+        response.headers["X-Degraded"] = "fallback"
+        return fallback()
+
+    if timed_out:
+        ADMISSION_DECISIONS.inc(route=route, decision="timeout")
+        raise HTTPException(
+            status_code=504,
+            detail="Requête réseau interrompue : délai Neo4j dépassé",
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+        )
+
+    ADMISSION_DECISIONS.inc(route=route, decision="rejected")
+    detail = ("Graphe indisponible — réessayer plus tard" if outage
+              else "Serveur occupé par des requêtes réseau coûteuses — réessayer plus tard")
+    raise HTTPException(
+        status_code=503,
+        detail=detail,
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+    )
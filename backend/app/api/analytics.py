@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from neo4j import Session as Neo4jSession
-from app.database import get_neo4j_session
+from app import admission
+from app.database import LazyPgSession, get_lazy_pg_session, get_neo4j_session
+from app.indexes.registry import Indexes, get_indexes
 from app.schemas.analytics import TopRootsResponse, MeccanMedinanResponse
-from app.services import analytics as analytics_service
+from app.services import network as network_service
 
 # Préfixe automatique : tous les endpoints analytiques sous /analytics
 router = APIRouter(prefix="/analytics", tags=["Analytique"])
@@ -10,23 +12,37 @@ router = APIRouter(prefix="/analytics", tags=["Analytique"])
 
 @router.get("/top-roots", response_model=TopRootsResponse)
 def get_top_roots(
+    response: Response,
     limit: int = Query(default=20, ge=1, le=100, description="Nombre de racines à retourner"),
-    session: Neo4jSession = Depends(get_neo4j_session),
+    session: Neo4jSession = Depends(get_neo4j_session, scope="function"),
+    open_db: LazyPgSession = Depends(get_lazy_pg_session),
+    indexes: Indexes = Depends(get_indexes),
 ):
     """
     Retourne les racines classées par nombre de versets distincts.
     Exemple : GET /analytics/top-roots?limit=20
     """
-    return analytics_service.get_top_roots(session, limit)
+    return admission.run(
+        "top_roots", (limit,), indexes.graph_cost.analytics(), response,
+        network_service.graph_backends(session, open_db),
+        lambda graph: graph.top_roots(limit),
+    )
 
 
 @router.get("/meccan-vs-medinan", response_model=MeccanMedinanResponse)
 def get_meccan_vs_medinan(
+    response: Response,
     limit: int = Query(default=20, ge=1, le=100, description="Nombre de racines par période"),
-    session: Neo4jSession = Depends(get_neo4j_session),
+    session: Neo4jSession = Depends(get_neo4j_session, scope="function"),
+    open_db: LazyPgSession = Depends(get_lazy_pg_session),
+    indexes: Indexes = Depends(get_indexes),
 ):
     """
     Compare les top racines entre sourates mecquoises et médinoises.
     Exemple : GET /analytics/meccan-vs-medinan?limit=20
     """
-    return analytics_service.get_meccan_vs_medinan(session, limit)
+    return admission.run(
+        "meccan_vs_medinan", (limit,), indexes.graph_cost.analytics(), response,
+        network_service.graph_backends(session, open_db),
+        lambda graph: graph.meccan_vs_medinan(limit),
+    )
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.indexes.registry import Indexes, get_indexes
+from app.schemas.analyze import AnalyzeResponse
+from app.services import analyze as analyze_service
+
+# Préfixe automatique : tous les endpoints ici seront sous /analyze
+router = APIRouter(prefix="/analyze", tags=["Analyse"])
+
+
+@router.get("", response_model=AnalyzeResponse)
+def analyze(
+    q: str = Query(..., min_length=1, description="Mot(s) arabe(s), fléchis ou non"),
+    indexes: Indexes = Depends(get_indexes),
+):
+    """
+    Racines et lemmes candidats pour chaque mot saisi.
+    Exemple : GET /analyze?q=يعلمون الكتاب → Elm, ktb
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(
+            status_code=422,
+            detail="La requête ne peut pas être vide",
+        )
+
+    return analyze_service.analyze_query(indexes, q)
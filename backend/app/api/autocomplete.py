@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, Query
+from app.indexes.prefix import MAX_SUGGESTIONS
+from app.indexes.registry import Indexes, get_indexes
+from app.schemas.autocomplete import AutocompleteResponse
+from app.services import autocomplete as autocomplete_service
+
+# Préfixe automatique : tous les endpoints ici seront sous /autocomplete
+router = APIRouter(prefix="/autocomplete", tags=["Autocomplétion"])
+
+
+@router.get("", response_model=AutocompleteResponse)
+def autocomplete(
+    q:     str        = Query(...,          min_length=1, description="Début d'une racine, d'un lemme ou d'un mot (Buckwalter ou arabe)"),
+    kind:  str | None = Query(default=None, pattern="^(root|lemma|form)$", description="Restreindre à un type de suggestion"),
+    limit: int        = Query(default=10,   ge=1, le=MAX_SUGGESTIONS, description=f"Nombre de suggestions (max {MAX_SUGGESTIONS})"),
+    indexes: Indexes = Depends(get_indexes),
+):
+    """
+    Autocomplétion par préfixe, classée par nombre d'occurrences.
+    Exemple : GET /autocomplete?q=ka&kind=root  ou  GET /autocomplete?q=كت
+    """
+    return autocomplete_service.autocomplete(indexes, q.strip(), kind, limit)
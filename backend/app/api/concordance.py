@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.database import get_pg_session
+from app.indexes.registry import Indexes, get_indexes
+from app.schemas.concordance import ConcordanceResponse
+from app.services import concordance as concordance_service
+
+# Préfixe automatique : tous les endpoints ici seront sous /concordance
+router = APIRouter(prefix="/concordance", tags=["Concordance"])
+
+
+@router.get("", response_model=ConcordanceResponse)
+def get_concordance(
+    root:   str | None = Query(default=None, description="Racine en Buckwalter (ex: ktb)"),
+    lemma:  str | None = Query(default=None, description="Lemme en Buckwalter (ex: kita`b)"),
+    window: int = Query(default=5,  ge=1, le=20,  description="Nombre de mots de contexte de chaque côté"),
+    cursor: int = Query(default=0,  ge=0,         description="Curseur renvoyé par la page précédente (next_cursor)"),
+    limit:  int = Query(default=50, ge=1, le=200, description="Nombre de lignes par page (max 200)"),
+    db: Session = Depends(get_pg_session),
+    indexes: Indexes = Depends(get_indexes),
+):
+    """
+    Concordance KWIC (mot-clé en contexte) de chaque occurrence d'une racine ou d'un lemme.
+    Exemple : GET /concordance?root=Elm&window=5&limit=50 puis &cursor=<next_cursor>
+    """
+    # Exactement un des deux critères
+    if (root is None) == (lemma is None):
+        raise HTTPException(
+            status_code=422,
+            detail="Indiquer soit 'root', soit 'lemma'",
+        )
+
+    result = concordance_service.get_concordance(
+        db, indexes, root, lemma, window, cursor, limit,
+    )
+
+    if result is None:
+        label = f"Racine '{root}'" if root is not None else f"Lemme '{lemma}'"
+        raise HTTPException(status_code=404, detail=f"{label} introuvable")
+
+    return result
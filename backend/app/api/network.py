@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from neo4j import Session as Neo4jSession
-from app.database import get_neo4j_session
-from app.schemas.network import NetworkResponse, RootNetworkResponse
+from app import admission
+from app.config import settings
+from app.database import LazyPgSession, get_lazy_pg_session, get_neo4j_session
+from app.indexes.registry import Indexes, get_indexes
+from app.schemas.network import NetworkResponse, RootNetworkResponse, RootGraphResponse
 from app.services import network as network_service
+from app.services import root_network as root_network_service
 
 # Préfixe automatique : tous les endpoints réseau seront sous /network
 router = APIRouter(prefix="/network", tags=["Réseau sémantique"])
@@ -12,17 +16,24 @@ router = APIRouter(prefix="/network", tags=["Réseau sémantique"])
 def get_ayah_network(
     surah_number: int,
     ayah_number: int,
+    response: Response,
     min_roots: int = Query(default=2, ge=1, le=10, description="Seuil minimum de racines partagées"),
     limit: int = Query(default=50, ge=1, le=200, description="Nombre max de voisins retournés"),
-    session: Neo4jSession = Depends(get_neo4j_session),
+    session: Neo4jSession = Depends(get_neo4j_session, scope="function"),
+    open_db: LazyPgSession = Depends(get_lazy_pg_session),
+    indexes: Indexes = Depends(get_indexes),
 ):
     """
     Retourne le sous-graphe SHARES_ROOT autour d'un verset.
     Format compatible react-force-graph : {nodes, links}.
     Exemple : GET /network/ayah/2/255?min_roots=2&limit=50
+    Neo4j indisponible : servie depuis PostgreSQL (X-Degraded: fallback).
     """
-    result = network_service.get_ayah_network(
-        session, surah_number, ayah_number, min_roots, limit,
+    result = admission.run(
+        "network_ayah", (surah_number, ayah_number, min_roots, limit),
+        indexes.graph_cost.ayah_network(surah_number, ayah_number), response,
+        network_service.graph_backends(session, open_db),
+        lambda graph: graph.ayah_network(surah_number, ayah_number, min_roots, limit),
     )
 
     if result is None:
@@ -37,20 +48,63 @@ def get_ayah_network(
 @router.get("/root/{buckwalter}", response_model=RootNetworkResponse)
 def get_root_network(
     buckwalter: str,
+    response: Response,
     sort: str = Query(default="mushaf", pattern="^(mushaf|connected)$", description="Tri : mushaf (ordre Coran) ou connected (plus connectés)"),
     max_nodes: int = Query(default=30, ge=5, le=100, description="Nombre max de versets affichés"),
     min_roots: int = Query(default=2, ge=1, le=10, description="Seuil minimum de racines partagées"),
     limit: int = Query(default=100, ge=1, le=500, description="Nombre max de liens retournés"),
-    session: Neo4jSession = Depends(get_neo4j_session),
+    session: Neo4jSession = Depends(get_neo4j_session, scope="function"),
+    open_db: LazyPgSession = Depends(get_lazy_pg_session),
+    indexes: Indexes = Depends(get_indexes),
 ):
     """
     Retourne le sous-graphe des versets contenant une racine,
     avec leurs connexions SHARES_ROOT mutuelles.
     Format compatible react-force-graph : {nodes, links}.
     Exemple : GET /network/root/Elm?sort=connected&max_nodes=30&min_roots=2
+    Trop coûteuse et aucun créneau libre : tri mushaf sur moins de versets (X-Degraded: reduced).
     """
-    result = network_service.get_root_network(
-        session, buckwalter, max_nodes, min_roots, limit, sort,
+    cost_model = indexes.graph_cost
+    reduced = cost_model.max_nodes_within(buckwalter, settings.ADMISSION_COST_THRESHOLD)
+    degrade = None
+    if reduced is not None:
+        reduced = min(reduced, max_nodes)
+        degrade = lambda graph: graph.root_network(buckwalter, reduced, min_roots, limit, "mushaf")
+
+    result = admission.run(
+        "network_root", (buckwalter, sort, max_nodes, min_roots, limit),
+        cost_model.root_network(buckwalter, sort, max_nodes), response,
+        network_service.graph_backends(session, open_db),
+        lambda graph: graph.root_network(buckwalter, max_nodes, min_roots, limit, sort),
+        degrade,
+    )
+
+    if result is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Racine '{buckwalter}' introuvable",
+        )
+
+    return result
+
+
+@router.get("/roots/{buckwalter}", response_model=RootGraphResponse)
+def get_root_cooccurrence(
+    buckwalter: str,
+    mode: str = Query(default="top", pattern="^(top|ego)$", description="top (étoile) ou ego (étoile + liens entre voisins)"),
+    score: str = Query(default="weight", pattern="^(weight|pmi|npmi)$", description="Tri des voisins : co-occurrences brutes, PMI ou PMI normalisée"),
+    min_weight: int = Query(default=2, ge=1, le=1000, description="Nombre minimum de versets partagés"),
+    limit: int = Query(default=20, ge=1, le=100, description="Nombre max de racines voisines"),
+    indexes: Indexes = Depends(get_indexes),
+):
+    """
+    Retourne le réseau de co-occurrence d'une racine (racines = nœuds,
+    poids = nombre de versets communs), calculé une fois au démarrage.
+    Format compatible react-force-graph : {nodes, links}.
+    Exemple : GET /network/roots/Elm?mode=ego&score=npmi&min_weight=3&limit=30
+    """
+    result = root_network_service.get_root_cooccurrence(
+        indexes, buckwalter, mode, score, min_weight, limit,
     )
 
     if result is None:
@@ -59,4 +113,4 @@ def get_root_network(
             detail=f"Racine '{buckwalter}' introuvable",
         )
 
-    return result
\ No newline at end of file
+    return result
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.database import get_pg_session
+from app.indexes.registry import Indexes, get_indexes
+from app.schemas.query import RootQueryResponse
+from app.services import query as query_service
+
+# Préfixe automatique : tous les endpoints ici seront sous /query
+router = APIRouter(prefix="/query", tags=["Requêtes booléennes"])
+
+
+def _split_roots(value: str | None) -> list[str]:
+    """'ktb, Elm' → ['ktb', 'Elm'] — dédoublonné, ordre conservé."""
+    if not value:
+        return []
+    roots = [bw.strip() for bw in value.split(",")]
+    return list(dict.fromkeys(bw for bw in roots if bw))
+
+
+@router.get("/roots", response_model=RootQueryResponse)
+def query_roots(
+    roots_all:  str | None = Query(default=None, alias="all",  description="Racines requises, séparées par des virgules (ET)"),
+    roots_any:  str | None = Query(default=None, alias="any",  description="Au moins une de ces racines (OU)"),
+    roots_none: str | None = Query(default=None, alias="none", description="Racines exclues (SAUF)"),
+    surah:  int | None = Query(default=None, ge=1, le=114, description="Limiter à une sourate"),
+    period: str | None = Query(default=None, pattern="^(meccan|medinan)$", description="Limiter à une période"),
+    page:   int = Query(default=1,  ge=1,         description="Numéro de page (commence à 1)"),
+    limit:  int = Query(default=20, ge=1, le=100, description="Nombre de versets par page (max 100)"),
+    db: Session = Depends(get_pg_session),
+    indexes: Indexes = Depends(get_indexes),
+):
+    """
+    Versets contenant des racines X et Y mais pas Z, en ordre Mushaf.
+    Exemple : GET /query/roots?all=ktb,Elm&none=kfr&period=medinan
+    """
+    all_bw, any_bw, none_bw = _split_roots(roots_all), _split_roots(roots_any), _split_roots(roots_none)
+
+    # Une requête uniquement négative renverrait presque tout le Coran
+    if not all_bw and not any_bw:
+        raise HTTPException(
+            status_code=422,
+            detail="Indiquer au moins une racine dans 'all' ou 'any'",
+        )
+
+    try:
+        return query_service.query_roots(
+            db, indexes, all_bw, any_bw, none_bw, surah, period, page, limit,
+        )
+    except query_service.UnknownRootError as e:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Racine '{e.buckwalter}' introuvable",
+        )
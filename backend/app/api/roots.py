@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.database import get_pg_session
+from app.indexes.registry import Indexes, get_indexes
 from app.schemas.root import RootResponse
 from app.services import root as root_service
 
@@ -14,11 +15,19 @@ def get_root(
     page:  int = Query(default=1,  ge=1,          description="Numéro de page (commence à 1)"),
     limit: int = Query(default=20, ge=1,  le=100,  description="Nombre de versets par page (max 100)"),
     db: Session = Depends(get_pg_session),
+    indexes: Indexes = Depends(get_indexes),
 ):
     """
     Retourne une racine arabe avec ses versets paginés.
     Exemple : GET /root/ktb?page=1&limit=20 → racine كتب + 20 premiers versets
+    Accepte aussi un mot arabe fléchi : GET /root/يعلمون → racine Elm
     """
+    # Mot arabe → racine par simple lookup dans la table de l'analyseur
+    if buckwalter not in indexes.corpus.root_by_bw:
+        root_id = indexes.analyzer.root_for(buckwalter)
+        if root_id is not None:
+            buckwalter = indexes.corpus.root_bw[root_id]
+
     root = root_service.get_root(db, buckwalter, page, limit)
 
     if not root:
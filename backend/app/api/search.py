@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.database import get_pg_session
-from app.schemas.search import SearchResponse
+from app.indexes.registry import Indexes, get_indexes
+from app.schemas.search import SearchResponse, RankedSearchResponse, FuzzySearchResponse
 from app.services import search as search_service
 
 # Préfixe automatique : tous les endpoints ici seront sous /search
@@ -28,3 +29,49 @@ def search(
         )
 
     return search_service.search_ayahs(db, q, page, limit)
+
+
+@router.get("/ranked", response_model=RankedSearchResponse)
+def search_ranked(
+    q:     str = Query(...,          min_length=2,      description='Requête : mots, "phrase exacte", root:ktb, lemma:kita`b'),
+    match: str = Query(default="any", pattern="^(any|all)$", description="any = au moins une clause, all = toutes"),
+    page:  int = Query(default=1,    ge=1,              description="Numéro de page (commence à 1)"),
+    limit: int = Query(default=20,   ge=1, le=100,      description="Nombre de résultats par page (max 100)"),
+    db: Session = Depends(get_pg_session),
+    indexes: Indexes = Depends(get_indexes),
+):
+    """
+    Recherche classée par pertinence (BM25) sur plusieurs termes.
+    Exemple : GET /search/ranked?q=الصلوة الزكوة&match=all
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(
+            status_code=422,
+            detail="Le terme de recherche ne peut pas être vide",
+        )
+
+    return search_service.search_ranked(db, indexes, q, match, page, limit)
+
+
+@router.get("/fuzzy", response_model=FuzzySearchResponse)
+def search_fuzzy(
+    q:         str   = Query(...,          min_length=2,       description="Terme(s) de recherche en arabe"),
+    threshold: float = Query(default=0.4,  ge=0.1, le=1.0,     description="Similarité minimale par mot (0.1 → 1)"),
+    page:      int   = Query(default=1,    ge=1,               description="Numéro de page (commence à 1)"),
+    limit:     int   = Query(default=20,   ge=1, le=100,       description="Nombre de résultats par page (max 100)"),
+    db: Session = Depends(get_pg_session),
+    indexes: Indexes = Depends(get_indexes),
+):
+    """
+    Recherche approchée : variantes orthographiques et fautes de frappe tolérées.
+    Exemple : GET /search/fuzzy?q=الكتاب&threshold=0.4
+    """
+    q = q.strip()
+    if not q:
+        raise HTTPException(
+            status_code=422,
+            detail="Le terme de recherche ne peut pas être vide",
+        )
+
+    return search_service.search_fuzzy(db, indexes, q, threshold, page, limit)
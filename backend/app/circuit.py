@@ -0,0 +1,78 @@
+import threading
+import time
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+from app.config import settings
+from app.metrics import CIRCUIT_STATE, CIRCUIT_TRANSITIONS
+from app.neo4j_guard import QueryTimeout
+
+
+# ─────────────────────────────────────────────
+# DISJONCTEUR NEO4J
+# ─────────────────────────────────────────────
+#   closed    : les requêtes vont à Neo4j ; CIRCUIT_FAILURE_THRESHOLD échecs
+#               consécutifs (indisponible, redémarrage, budget dépassé) → open
+#   open      : plus aucun appel à Neo4j pendant CIRCUIT_RESET_SECONDS —
+#               admission.py sert le cache ou le repli PostgreSQL
+#   half_open : une seule requête sonde Neo4j ; succès → closed, échec → open
+# Un disjoncteur par worker (pas d'état partagé entre processus).
+
+# Erreurs qui signalent Neo4j en difficulté (et pas une requête invalide)
+NEO4J_FAILURES = (ServiceUnavailable, SessionExpired, TransientError, QueryTimeout)
+
+_STATES = ("closed", "open", "half_open")
+
+
+class CircuitBreaker:
+    """Disjoncteur à trois états, sûr entre threads."""
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self._publish()
+
+    def _publish(self):
+        for state in _STATES:
+            CIRCUIT_STATE.set(1 if state == self.state else 0, breaker=self.name, state=state)
+
+    def _move(self, state: str):
+        if state != self.state:
+            self.state = state
+            CIRCUIT_TRANSITIONS.inc(breaker=self.name, state=state)
+            self._publish()
+
+    def allow(self) -> bool:
+        """True si l'appelant peut interroger Neo4j (en half_open : la sonde seulement)."""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self._move("half_open")
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._move("closed")
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._probing = False
+                self._move("open")
+
+
+neo4j_breaker = CircuitBreaker(
+    "neo4j", settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_SECONDS,
+)
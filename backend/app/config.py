@@ -1,3 +1,5 @@
+from typing import Literal
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -6,23 +8,94 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: int = 5432
     POSTGRES_USER: str = "postgres"
-    POSTGRES_PASSWORD: str
+    POSTGRES_PASSWORD: str = ""     # obligatoire sauf en mode instantané (DATA_SNAPSHOT)
     POSTGRES_DB: str = "wikiquran"
 
     # --- Neo4j ---
     NEO4J_URI: str = "bolt://localhost:7687"
     NEO4J_USER: str = "neo4j"
-    NEO4J_PASSWORD: str
+    NEO4J_PASSWORD: str = ""        # idem
+
+    # --- Délais Neo4j (secondes, par route) ---
+    # Budget total des requêtes Cypher d'une requête HTTP : au-delà, le serveur
+    # interrompt la transaction et la réponse est dégradée (cache, partielle, 504).
+    NEO4J_TIMEOUT_SECONDS: float = 10.0         # routes non listées ci-dessous
+    NEO4J_TIMEOUT_AYAH_NETWORK: float = 5.0
+    NEO4J_TIMEOUT_ROOT_NETWORK: float = 15.0
+    NEO4J_TIMEOUT_ANALYTICS: float = 30.0
+
+    # --- Disjoncteur Neo4j ---
+    # Échecs consécutifs (indisponible, budget dépassé) avant ouverture ; ouvert,
+    # le réseau et l'analytique sont servis depuis le cache ou PostgreSQL
+    # (table ayah_pair), puis une requête sonde Neo4j après CIRCUIT_RESET_SECONDS.
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # --- Graphe ---
+    # Source du réseau et de l'analytique : "neo4j" (repli PostgreSQL via le
+    # disjoncteur) ou "postgres" (table ayah_pair seule, Neo4j jamais contacté).
+    GRAPH_BACKEND: Literal["neo4j", "postgres"] = "neo4j"
+
+    # --- Instantané embarqué (réplicas en lecture seule) ---
+    # Chemin d'un fichier SQLite produit par export_snapshot.py : toutes les
+    # routes sont alors servies depuis ce fichier (mmap), sans PostgreSQL ni
+    # Neo4j — GRAPH_BACKEND et la bascule bleu/vert sont ignorés.
+    # Vide = PostgreSQL + Neo4j.
+    DATA_SNAPSHOT: str = ""
 
     # --- CORS ---
     # En dev : "http://localhost:5173"
     # En prod : "https://quranicdata.org,https://www.quranicdata.org"
     CORS_ORIGINS: str = "http://localhost:5173"
 
+    # --- Corpus ---
+    # Chemin vers wikiquran_final.wqc (normalize.py) : les index en mémoire
+    # sont alors construits depuis ce fichier au lieu de PostgreSQL.
+    # Vide = lecture depuis PostgreSQL.
+    CORPUS_ARTIFACT: str = ""
+
+    # --- Jeu de données (bascule bleu/vert) ---
+    # Intervalle de lecture de public.dataset_pointer (secondes). 0 = pas de suivi :
+    # le jeu lu au démarrage reste actif jusqu'au redémarrage.
+    DATASET_POLL_SECONDS: float = 10.0
+
+    # --- Métriques ---
+    # En-tête Server-Timing (pg, neo4j, serialize) sur chaque réponse et
+    # histogrammes Prometheus sur /metrics. False = aucune instrumentation.
+    METRICS_ENABLED: bool = False
+
+    # --- Admission des requêtes réseau coûteuses ---
+    # Coût estimé en relations SHARES_ROOT parcourues (GraphCostModel). Au-delà
+    # du seuil, une requête doit obtenir un des ADMISSION_MAX_EXPENSIVE créneaux
+    # du worker ; sinon : réponse en cache, version réduite, ou 503 + Retry-After.
+    # Seuil : /network/root par défaut (30 versets, 435 paires) reste sous le seuil
+    # pour les racines les plus fréquentes (degré moyen ≈ 5 000) ; au-delà d'environ
+    # 45 versets sur ces racines, la requête devient coûteuse.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_COST_THRESHOLD: int = 5_000_000
+    ADMISSION_MAX_EXPENSIVE: int = 2          # par worker uvicorn
+    ADMISSION_WAIT_SECONDS: float = 0.5
+    ADMISSION_RETRY_AFTER: int = 5            # secondes (en-tête Retry-After du 503)
+    ADMISSION_CACHE_SIZE: int = 1024          # réponses Neo4j complètes gardées pour la dégradation
+
     # --- App ---
     APP_ENV: str = "development"
     APP_VERSION: str = "0.4.0"
 
+    @model_validator(mode="after")
+    def _require_passwords(self):
+        """Les mots de passe des bases ne sont facultatifs qu'en mode instantané."""
+        if not self.DATA_SNAPSHOT:
+            missing = [name for name in ("POSTGRES_PASSWORD", "NEO4J_PASSWORD") if not getattr(self, name)]
+            if missing:
+                raise ValueError(f"Réglages obligatoires manquants : {', '.join(missing)}")
+        return self
+
+    @property
+    def neo4j_enabled(self) -> bool:
+        """Réseau et analytique lus dans Neo4j (sinon table ayah_pair, PostgreSQL ou instantané)."""
+        return self.GRAPH_BACKEND == "neo4j" and not self.DATA_SNAPSHOT
+
     @property
     def postgres_url(self) -> str:
         """Construit l'URL de connexion PostgreSQL pour SQLAlchemy."""
@@ -1,19 +1,49 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import re
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from fastapi import Depends
 from neo4j import GraphDatabase
 from app.config import settings
+from app.neo4j_guard import CancelToken, GuardedSession, close_guarded, route_timeout, watch_disconnect
 
 
 # ─────────────────────────────────────────────
 # POSTGRESQL — SQLAlchemy (mode synchrone)
 # ─────────────────────────────────────────────
 
-# Moteur de connexion PostgreSQL
-engine = create_engine(
-    settings.postgres_url,
-    pool_pre_ping=True,   # Vérifie que la connexion est vivante avant chaque requête
-    echo=False,           # Passer à True pour afficher les requêtes SQL en dev
-)
+# Mode instantané (DATA_SNAPSHOT) : même schéma dans un fichier SQLite en
+# lecture seule, lu en mmap — ni serveur ni connexion réseau, chaque réplica
+# ouvre son propre fichier. Les modèles et services ne changent pas.
+SNAPSHOT_MMAP_BYTES = 1 << 30    # plafond ; SQLite ne mappe que la taille du fichier
+
+
+def _snapshot_engine(path: str):
+    engine = create_engine(
+        f"sqlite:///file:{path}?mode=ro&immutable=1&uri=true",
+        connect_args={"check_same_thread": False},   # connexions partagées par le threadpool
+        echo=False,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA mmap_size = {SNAPSHOT_MMAP_BYTES}")
+        cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+    return engine
+
+
+# Moteur de connexion PostgreSQL (ou instantané SQLite)
+if settings.DATA_SNAPSHOT:
+    engine = _snapshot_engine(settings.DATA_SNAPSHOT)
+else:
+    engine = create_engine(
+        settings.postgres_url,
+        pool_pre_ping=True,   # Vérifie que la connexion est vivante avant chaque requête
+        echo=False,           # Passer à True pour afficher les requêtes SQL en dev
+    )
 
 # Fabrique de sessions PostgreSQL
 SessionLocal = sessionmaker(
@@ -28,19 +58,66 @@ class Base(DeclarativeBase):
     pass
 
 
+def open_pg_session(schema: str | None = None) -> Session:
+    """
+    Ouvre une session sur le schéma du jeu de données actif (ou `schema`).
+    search_path est posé à chaque ouverture : une connexion du pool peut
+    avoir servi un autre jeu de données.
+    """
+    db = SessionLocal()
+    schema = schema or _dataset.pg_schema
+    if schema != "public" and db.get_bind().dialect.name == "postgresql":
+        db.execute(text(f'SET search_path TO "{schema}", public'))
+    return db
+
+
 def get_pg_session():
     """
     Générateur de session PostgreSQL.
     Utilisé comme dépendance FastAPI : Depends(get_pg_session).
     Ferme automatiquement la session après chaque requête.
     """
-    db = SessionLocal()
+    db = open_pg_session()
     try:
         yield db
     finally:
         db.close()
 
 
+class LazyPgSession:
+    """
+    Session PostgreSQL ouverte au premier appel seulement : le repli du graphe
+    (PostgresGraph derrière Neo4j) ne sert que si le disjoncteur s'ouvre, inutile
+    de prendre une connexion du pool et de poser search_path à chaque requête.
+    """
+
+    def __init__(self):
+        self._db: Session | None = None
+
+    def __call__(self) -> Session:
+        if self._db is None:
+            self._db = open_pg_session()
+        return self._db
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def get_lazy_pg_session():
+    """
+    Fabrique de session PostgreSQL, ouverte à la demande.
+    Utilisé comme dépendance FastAPI : Depends(get_lazy_pg_session).
+    Ferme la session après la requête si elle a été ouverte.
+    """
+    lazy = LazyPgSession()
+    try:
+        yield lazy
+    finally:
+        lazy.close()
+
+
 # ─────────────────────────────────────────────
 # NEO4J — Driver Bolt officiel
 # ─────────────────────────────────────────────
@@ -51,20 +128,116 @@ neo4j_driver = GraphDatabase.driver(
     auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD),
 )
 
+# Un driver par instance : un jeu de données peut vivre sur une autre instance
+# (Neo4j Community n'a qu'une base utilisateur — bleu/vert = deux instances)
+_neo4j_drivers = {settings.NEO4J_URI: neo4j_driver}
+
 
-def get_neo4j_session():
+def _driver_for(uri: str | None):
+    uri = uri or settings.NEO4J_URI
+    if uri not in _neo4j_drivers:
+        _neo4j_drivers[uri] = GraphDatabase.driver(
+            uri, auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD),
+        )
+    return _neo4j_drivers[uri]
+
+
+def open_neo4j_session():
+    """Session Neo4j sur l'instance et la base du jeu de données actif."""
+    driver = _driver_for(_dataset.neo4j_uri)
+    if _dataset.neo4j_database:
+        return driver.session(database=_dataset.neo4j_database)
+    return driver.session()
+
+
+def get_neo4j_session(token: CancelToken = Depends(watch_disconnect, scope="function")):
     """
     Générateur de session Neo4j.
-    Utilisé comme dépendance FastAPI : Depends(get_neo4j_session).
-    Ferme automatiquement la session après chaque requête.
+    Utilisé comme dépendance FastAPI : Depends(get_neo4j_session, scope="function").
+    Bornée par le budget de la route, annulée si le client se déconnecte
+    (neo4j_guard) ; fermée dès la fin de la route.
+    None si GRAPH_BACKEND=postgres ou DATA_SNAPSHOT : le graphe est lu dans
+    la table ayah_pair.
     """
-    session = neo4j_driver.session()
+    if not settings.neo4j_enabled:
+        yield None
+        return
+    session = open_neo4j_session()
+    guarded = GuardedSession(session, token, route_timeout(token.route))
     try:
-        yield session
+        if settings.METRICS_ENABLED:
+            from app.metrics import TimedSession
+            yield TimedSession(guarded)
+        else:
+            yield guarded
     finally:
+        close_guarded(guarded)
         session.close()
 
 
 def close_neo4j():
-    """Ferme le driver Neo4j proprement — appelé au shutdown de l'app."""
-    neo4j_driver.close()
+    """Ferme les drivers Neo4j proprement — appelé au shutdown de l'app."""
+    for driver in _neo4j_drivers.values():
+        driver.close()
+
+
+# ─────────────────────────────────────────────
+# JEU DE DONNÉES ACTIF — pointeur bleu/vert
+# ─────────────────────────────────────────────
+# Les imports chargent un nouveau schéma PostgreSQL et une nouvelle base
+# (ou instance) Neo4j pendant que l'API sert l'ancien jeu de données ;
+# switch_dataset.py bascule ensuite public.dataset_pointer en une transaction.
+
+_SCHEMA_NAME = re.compile(r"^[a-z_][a-z0-9_]{0,62}$")
+
+
+class DatasetPointer:
+    """Contenu de public.dataset_pointer : où lire et sous quelle version."""
+
+    def __init__(self, pg_schema: str = "public", neo4j_uri: str | None = None,
+                 neo4j_database: str | None = None, version: str = "public"):
+        if not _SCHEMA_NAME.match(pg_schema):
+            raise ValueError(f"Nom de schéma invalide : {pg_schema!r}")
+        self.pg_schema = pg_schema
+        self.neo4j_uri = neo4j_uri or None
+        self.neo4j_database = neo4j_database or None
+        self.version = version
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, DatasetPointer) and vars(self) == vars(other)
+
+
+# Sans pointeur (base antérieure au bleu/vert) : schéma public, base Neo4j par défaut
+DEFAULT_DATASET = DatasetPointer()
+
+_dataset: DatasetPointer = DEFAULT_DATASET
+
+
+def read_dataset_pointer(db: Session) -> DatasetPointer:
+    """Lit le pointeur ; DEFAULT_DATASET si la table ou la ligne n'existe pas."""
+    try:
+        row = db.execute(text(
+            "SELECT pg_schema, neo4j_uri, neo4j_database, version FROM public.dataset_pointer"
+        )).first()
+    except ProgrammingError:
+        db.rollback()
+        return DEFAULT_DATASET
+    if row is None:
+        return DEFAULT_DATASET
+    return DatasetPointer(row.pg_schema, row.neo4j_uri, row.neo4j_database, row.version)
+
+
+def read_snapshot_pointer(db: Session) -> DatasetPointer:
+    """Mode instantané : pas de bascule, la version est celle du fichier."""
+    version = db.execute(text("SELECT value FROM snapshot_info WHERE key = 'version'")).scalar()
+    return DatasetPointer(version=version or "snapshot")
+
+
+def current_dataset() -> DatasetPointer:
+    return _dataset
+
+
+def use_dataset(pointer: DatasetPointer):
+    """Les sessions ouvertes après cet appel lisent le nouveau jeu de données."""
+    global _dataset
+    _dataset = pointer
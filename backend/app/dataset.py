@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from app.config import settings
+from app.database import (
+    DatasetPointer, current_dataset, open_pg_session, read_dataset_pointer, read_snapshot_pointer,
+    use_dataset,
+)
+from app.indexes.registry import Indexes, build_indexes, load_indexes, set_indexes
+
+
+# ─────────────────────────────────────────────
+# BASCULE BLEU/VERT — suivi du pointeur de jeu de données
+# ─────────────────────────────────────────────
+# Démarrage : lecture du pointeur, puis index construits sur le schéma pointé.
+# Ensuite, toutes les DATASET_POLL_SECONDS : si la version a changé, les index
+# du nouveau jeu sont construits en arrière-plan (thread) pendant que l'API
+# continue de servir l'ancien ; sessions PostgreSQL/Neo4j et index basculent
+# ensemble une fois la construction terminée.
+# Mode instantané (DATA_SNAPSHOT) : un seul jeu, celui du fichier — pas de suivi.
+
+logger = logging.getLogger(__name__)
+
+
+def _read_pointer() -> DatasetPointer:
+    db = open_pg_session("public")
+    try:
+        if settings.DATA_SNAPSHOT:
+            return read_snapshot_pointer(db)
+        return read_dataset_pointer(db)
+    finally:
+        db.close()
+
+
+def _build_for(pointer: DatasetPointer, use_artifact: bool) -> Indexes:
+    db = open_pg_session(pointer.pg_schema)
+    try:
+        return build_indexes(db, use_artifact=use_artifact)
+    finally:
+        db.close()
+
+
+def load_active_dataset():
+    """Démarrage : pointeur courant + index construits depuis ce jeu de données."""
+    pointer = _read_pointer()
+    use_dataset(pointer)
+    db = open_pg_session()
+    try:
+        load_indexes(db)
+    finally:
+        db.close()
+
+
+def switch_to(pointer: DatasetPointer):
+    """
+    Construit les index du nouveau jeu puis bascule.
+    CORPUS_ARTIFACT décrit le jeu chargé au démarrage : après une bascule,
+    le corpus est relu depuis le nouveau schéma PostgreSQL.
+    """
+    indexes = _build_for(pointer, use_artifact=False)
+    use_dataset(pointer)
+    set_indexes(indexes)
+
+
+async def watch_dataset_pointer():
+    """Tâche de fond (lifespan) : surveille le pointeur et bascule à chaud."""
+    while True:
+        await asyncio.sleep(settings.DATASET_POLL_SECONDS)
+        try:
+            pointer = await asyncio.to_thread(_read_pointer)
+            if pointer != current_dataset():
+                await asyncio.to_thread(switch_to, pointer)
+                logger.info("Jeu de données actif : %s (schéma %s)", pointer.version, pointer.pg_schema)
+        except Exception:
+            # Base indisponible ou jeu incomplet : on garde le jeu actif, nouvel essai au tour suivant
+            logger.exception("Bascule de jeu de données impossible")
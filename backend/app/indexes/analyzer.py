@@ -0,0 +1,140 @@
+from app.indexes.corpus import Corpus
+from app.utils.arabic import fold, normalize, split_words
+from app.utils.buckwalter import buckwalter_to_arabic
+
+
+# ─────────────────────────────────────────────
+# ANALYSEUR DE REQUÊTE — forme de surface → racines / lemmes
+# ─────────────────────────────────────────────
+# Table construite au démarrage : forme normalisée et repliée → racines et lemmes,
+# depuis word.text_arabic (Buckwalter) et les mots alignés du texte Tanzil.
+# Forme inconnue : racinisation légère (préfixes / suffixes usuels) puis nouvel essai.
+
+# Proclitiques et enclitiques usuels, les plus longs d'abord (formes repliées)
+PREFIXES = ("وال", "فال", "بال", "كال", "لل", "ال", "و", "ف", "ب", "ك", "ل", "س")
+SUFFIXES = (
+    "هما", "كما", "تما", "ها", "هم", "هن", "كم", "كن", "نا", "ون", "ين",
+    "ان", "ات", "وا", "تم", "ه", "ي", "ك", "ت", "ا", "ن",
+)
+MIN_STEM = 2   # un radical garde au moins 2 lettres
+
+
+def surface_keys(buckwalter: str) -> set[str]:
+    """
+    Formes arabes normalisées d'un mot Buckwalter.
+    L'alef suscrit ` donne deux clés : كتب (graphie Uthmani) et كتاب (graphie courante).
+    """
+    keys = {
+        normalize(buckwalter_to_arabic(buckwalter.replace("`", alef)))
+        for alef in ("", "A")
+    }
+    keys.discard("")
+    return keys
+
+
+def light_stems(word: str) -> list[str]:
+    """
+    Radicaux candidats d'un mot replié, du plus long au plus court.
+    Exemple : 'والكتب' → ['الكتب', 'كتب', 'الكت', ...]
+    """
+    stems = set()
+    for prefix in ("", *PREFIXES):
+        if not word.startswith(prefix) or len(word) - len(prefix) < MIN_STEM:
+            continue
+        base = word[len(prefix):]
+        for suffix in ("", *SUFFIXES):
+            if base.endswith(suffix) and len(base) - len(suffix) >= MIN_STEM:
+                stems.add(base[:len(base) - len(suffix)] if suffix else base)
+    stems.discard(word)
+    return sorted(stems, key=lambda s: (-len(s), s))
+
+
+class Analysis:
+    """Résultat de l'analyse d'un mot de la requête."""
+
+    def __init__(self, token: str, key: str, method: str, stem: str | None,
+                 roots: list[tuple[int, int]], lemmas: list[tuple[str, int]]):
+        self.token = token      # mot tel que saisi
+        self.key = key          # forme normalisée et repliée
+        self.method = method    # 'root' | 'exact' | 'stem' | 'none'
+        self.stem = stem        # radical retenu (méthode 'stem')
+        self.roots = roots      # [(root_id, occurrences)] par fréquence décroissante
+        self.lemmas = lemmas    # [(lemma_bw, occurrences)]
+
+
+class QueryAnalyzer:
+    """Tables forme → {root_id: n} et forme → {lemme: n}, consultées par simple lookup."""
+
+    def __init__(self, corpus: Corpus):
+        self.corpus = corpus
+        self.roots: dict[str, dict[int, int]] = {}
+        self.lemmas: dict[str, dict[str, int]] = {}
+
+        # 1. Occurrences par mot
+        word_counts: dict[int, int] = {}
+        for words in corpus.ayah_words:
+            for _, word_id in words:
+                word_counts[word_id] = word_counts.get(word_id, 0) + 1
+
+        # 2. Formes du lexique (word.text_arabic, Buckwalter → arabe)
+        for word_id, form in corpus.word_form.items():
+            for key in surface_keys(form):
+                self._add(fold(key), word_id, word_counts.get(word_id, 0))
+
+        # 3. Formes du texte Tanzil, quand le découpage s'aligne sur les positions
+        for ordinal, words in enumerate(corpus.ayah_words):
+            tokens = split_words(corpus.ayah_text_normalized[ordinal])
+            if len(tokens) != len(words) or (words and words[-1][0] != len(words)):
+                continue
+            for token, (_, word_id) in zip(tokens, words):
+                self._add(fold(token), word_id, 1)
+
+        # 4. Racines saisies directement en arabe (كتب → ktb), prioritaires
+        self.root_keys: dict[str, int] = {
+            fold(normalize(arabic)): root_id for root_id, arabic in corpus.root_arabic.items()
+        }
+
+    def _add(self, key: str, word_id: int, count: int):
+        root_id = self.corpus.word_root.get(word_id)
+        if root_id is not None:
+            roots = self.roots.setdefault(key, {})
+            roots[root_id] = roots.get(root_id, 0) + count
+        lemma = self.corpus.word_lemma.get(word_id)
+        if lemma:
+            lemmas = self.lemmas.setdefault(key, {})
+            lemmas[lemma] = lemmas.get(lemma, 0) + count
+
+    @staticmethod
+    def _ranked(counts: dict) -> list:
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+    def analyze_word(self, token: str) -> Analysis:
+        """Un mot → racines et lemmes candidats (lookup exact, sinon radicaux)."""
+        key = fold(normalize(token))
+        root_id = self.root_keys.get(key)
+        if root_id is not None:
+            return Analysis(token, key, "root", None,
+                            [(root_id, self.corpus.root_occurrences.get(root_id, 0))],
+                            self._ranked(self.lemmas.get(key, {})))
+
+        if key in self.roots or key in self.lemmas:
+            return Analysis(token, key, "exact", None,
+                            self._ranked(self.roots.get(key, {})),
+                            self._ranked(self.lemmas.get(key, {})))
+
+        for stem in light_stems(key):
+            if stem in self.roots or stem in self.lemmas:
+                return Analysis(token, key, "stem", stem,
+                                self._ranked(self.roots.get(stem, {})),
+                                self._ranked(self.lemmas.get(stem, {})))
+
+        return Analysis(token, key, "none", None, [], [])
+
+    def analyze(self, query: str) -> list[Analysis]:
+        """Analyse chaque mot de la requête."""
+        return [self.analyze_word(token) for token in split_words(query)]
+
+    def root_for(self, token: str) -> int | None:
+        """Racine la plus probable d'un mot saisi en arabe, ou None."""
+        roots = self.analyze_word(token).roots
+        return roots[0][0] if roots else None
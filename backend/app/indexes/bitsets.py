@@ -0,0 +1,71 @@
+from app.indexes.corpus import Corpus
+
+
+# ─────────────────────────────────────────────
+# BITSETS RACINE → VERSETS
+# ─────────────────────────────────────────────
+# Un bitset = un entier Python : le bit n est levé si le verset d'ordinal n
+# (ordre Mushaf) contient la racine. 6 236 versets → 780 octets par racine,
+# même pour Alh — pas besoin de compression, et AND/OR/NOT sont natifs en C.
+
+def iter_bits(bits: int):
+    """Itère sur les ordinaux levés d'un bitset, dans l'ordre croissant (Mushaf)."""
+    while bits:
+        low = bits & -bits           # bit le plus faible
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class RootBitsets:
+    """Postings racine → versets sous forme de bitsets, plus masques sourate/période."""
+
+    def __init__(self, corpus: Corpus):
+        self.ayah_count = corpus.ayah_count
+        self.universe = (1 << self.ayah_count) - 1
+
+        # root_id → bitset des versets
+        self.by_root: dict[int, int] = {}
+        for ordinal in range(self.ayah_count):
+            bit = 1 << ordinal
+            for root_id in corpus.ayah_roots(ordinal):
+                self.by_root[root_id] = self.by_root.get(root_id, 0) | bit
+
+        # numéro de sourate → bitset de ses versets (plages contiguës en ordre Mushaf)
+        self.by_surah: dict[int, int] = {}
+        for ordinal, surah_number in enumerate(corpus.ayah_surah):
+            self.by_surah[surah_number] = self.by_surah.get(surah_number, 0) | (1 << ordinal)
+
+        # 'meccan' | 'medinan' → bitset
+        self.by_period: dict[str, int] = {}
+        for surah_number, mask in self.by_surah.items():
+            period = corpus.surah_types[surah_number]
+            self.by_period[period] = self.by_period.get(period, 0) | mask
+
+    def root(self, root_id: int) -> int:
+        """Bitset d'une racine (0 si la racine n'apparaît dans aucun verset)."""
+        return self.by_root.get(root_id, 0)
+
+    def ayah_count_for(self, root_id: int) -> int:
+        """Nombre de versets distincts contenant la racine."""
+        return self.root(root_id).bit_count()
+
+    def surah_counts(self, bits: int) -> list[tuple[int, int]]:
+        """Nombre de versets du bitset par sourate — sourates vides omises."""
+        counts = []
+        for surah_number in sorted(self.by_surah):
+            count = (bits & self.by_surah[surah_number]).bit_count()
+            if count:
+                counts.append((surah_number, count))
+        return counts
+
+    @staticmethod
+    def page(bits: int, offset: int, limit: int) -> list[int]:
+        """Ordinaux de la page demandée, en ordre Mushaf."""
+        ordinals = []
+        for i, ordinal in enumerate(iter_bits(bits)):
+            if i < offset:
+                continue
+            if len(ordinals) >= limit:
+                break
+            ordinals.append(ordinal)
+        return ordinals
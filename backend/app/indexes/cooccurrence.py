@@ -0,0 +1,68 @@
+from array import array
+from math import log2
+from app.indexes.corpus import Corpus
+from app.indexes.bitsets import RootBitsets
+
+
+# ─────────────────────────────────────────────
+# MATRICE DE CO-OCCURRENCE RACINE × RACINE
+# ─────────────────────────────────────────────
+# C = Rᵀ·R où R est la matrice d'incidence verset × racine (0/1).
+# C[r1][r2] = nombre de versets contenant r1 ET r2.
+# R étant très creuse (~10 racines par verset), le produit est accumulé
+# verset par verset : ~300 000 incréments pour tout le Coran.
+
+class RootCooccurrence:
+    """Voisins de chaque racine, triés par poids décroissant (tableaux compacts)."""
+
+    def __init__(self, corpus: Corpus, bitsets: RootBitsets):
+        self.ayah_count = corpus.ayah_count
+        self.bitsets = bitsets
+
+        # 1. Produit creux Rᵀ·R — triangle supérieur uniquement (r1 < r2)
+        upper: dict[int, dict[int, int]] = {}
+        for ordinal in range(corpus.ayah_count):
+            roots = sorted(corpus.ayah_roots(ordinal))
+            for i, r1 in enumerate(roots):
+                row = upper.setdefault(r1, {})
+                for r2 in roots[i + 1:]:
+                    row[r2] = row.get(r2, 0) + 1
+
+        # 2. Symétrisation
+        full: dict[int, list[tuple[int, int]]] = {}
+        for r1, row in upper.items():
+            for r2, weight in row.items():
+                full.setdefault(r1, []).append((r2, weight))
+                full.setdefault(r2, []).append((r1, weight))
+
+        # 3. Stockage compact : root_id → (ids voisins, poids), poids décroissant
+        self.neighbor_ids: dict[int, array] = {}
+        self.neighbor_weights: dict[int, array] = {}
+        for root_id, pairs in full.items():
+            pairs.sort(key=lambda p: (-p[1], p[0]))
+            self.neighbor_ids[root_id] = array("i", (r for r, _ in pairs))
+            self.neighbor_weights[root_id] = array("i", (w for _, w in pairs))
+
+        self.pair_count = sum(len(ids) for ids in self.neighbor_ids.values()) // 2
+
+    def neighbors(self, root_id: int, min_weight: int = 1):
+        """Itère sur (voisin, poids) avec poids ≥ min_weight — arrêt dès que le poids passe sous le seuil."""
+        ids = self.neighbor_ids.get(root_id, ())
+        weights = self.neighbor_weights.get(root_id, ())
+        for other, weight in zip(ids, weights):
+            if weight < min_weight:
+                break
+            yield other, weight
+
+    def pmi(self, r1: int, r2: int, weight: int) -> float:
+        """Information mutuelle ponctuelle : log2(P(r1,r2) / (P(r1)·P(r2)))."""
+        n1 = self.bitsets.ayah_count_for(r1)
+        n2 = self.bitsets.ayah_count_for(r2)
+        return log2(weight * self.ayah_count / (n1 * n2))
+
+    def npmi(self, r1: int, r2: int, weight: int) -> float:
+        """PMI normalisée dans [-1, 1] — 1 = les deux racines apparaissent toujours ensemble."""
+        p_joint = weight / self.ayah_count
+        if p_joint >= 1:
+            return 1.0
+        return self.pmi(r1, r2, weight) / -log2(p_joint)
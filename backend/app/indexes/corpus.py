@@ -0,0 +1,214 @@
+from sqlalchemy.orm import Session
+from app.models.surah import Surah
+from app.models.ayah import Ayah
+from app.models.root import Root
+from app.models.word import Word
+from app.models.word_occurrence import WordOccurrence
+from app.utils.arabic import normalize
+from app.utils.corpus_artifact import CorpusArtifact, NULL_INT
+
+
+# ─────────────────────────────────────────────
+# INSTANTANÉ DU CORPUS — chargé une fois au démarrage
+# ─────────────────────────────────────────────
+
+class Corpus:
+    """
+    Copie compacte en mémoire des tables PostgreSQL utiles aux index.
+    Les versets sont repérés par leur ordinal Mushaf (0 → 6235),
+    ce qui permet de les adresser par position dans un bitset ou une liste.
+    """
+
+    def __init__(self):
+        # --- Sourates : number → valeur ---
+        self.surah_names: dict[int, str] = {}
+        self.surah_types: dict[int, str] = {}         # 'meccan' | 'medinan'
+
+        # --- Versets : ordinal Mushaf → valeur ---
+        self.ayah_ids:     list[int] = []              # pg_id
+        self.ayah_surah:   list[int] = []              # numéro de sourate
+        self.ayah_number:  list[int] = []              # numéro du verset dans la sourate
+        self.ayah_text_normalized: list[str] = []      # colonne text_normalized
+        self.ayah_ordinal: dict[int, int] = {}         # pg_id → ordinal
+
+        # --- Racines : root_id → valeur ---
+        self.root_bw:          dict[int, str] = {}
+        self.root_arabic:      dict[int, str] = {}
+        self.root_occurrences: dict[int, int] = {}
+        self.root_by_bw:       dict[str, int] = {}     # buckwalter → root_id
+
+        # --- Mots : word_id → valeur ---
+        self.word_form:  dict[int, str] = {}           # forme Buckwalter (colonne text_arabic)
+        self.word_root:  dict[int, int | None] = {}
+        self.word_lemma: dict[int, str | None] = {}
+        self.word_pos:   dict[int, str | None] = {}
+
+        # --- Occurrences : ordinal → [(position, word_id), ...] triés par position ---
+        self.ayah_words: list[list[tuple[int, int]]] = []
+
+    @property
+    def ayah_count(self) -> int:
+        return len(self.ayah_ids)
+
+    def add_ayah(self, ayah_id: int, surah_number: int, ayah_number: int, text_normalized: str):
+        """Ajoute un verset — à appeler dans l'ordre Mushaf."""
+        self.ayah_ordinal[ayah_id] = len(self.ayah_ids)
+        self.ayah_ids.append(ayah_id)
+        self.ayah_surah.append(surah_number)
+        self.ayah_number.append(ayah_number)
+        self.ayah_text_normalized.append(text_normalized)
+        self.ayah_words.append([])
+
+    def ayah_roots(self, ordinal: int) -> set[int]:
+        """Racines distinctes d'un verset (mots sans racine ignorés)."""
+        roots = set()
+        for _, word_id in self.ayah_words[ordinal]:
+            root_id = self.word_root.get(word_id)
+            if root_id is not None:
+                roots.add(root_id)
+        return roots
+
+
+def load_corpus(db: Session) -> Corpus:
+    """
+    Charge le corpus depuis PostgreSQL en 5 requêtes (une par table).
+    ~80 000 lignes au total — quelques centaines de millisecondes.
+    """
+    corpus = Corpus()
+
+    # 1. Sourates
+    for number, name_arabic, type_ in db.query(Surah.number, Surah.name_arabic, Surah.type):
+        corpus.surah_names[number] = name_arabic
+        corpus.surah_types[number] = type_
+
+    # 2. Versets — ordre Mushaf (sourate 1→114, verset 1→n)
+    ayahs = (
+        db.query(Ayah.id, Surah.number, Ayah.number, Ayah.text_normalized)
+        .join(Surah, Surah.id == Ayah.surah_id)
+        .order_by(Surah.number, Ayah.number)
+    )
+    for ayah_id, surah_number, ayah_number, text_normalized in ayahs:
+        corpus.add_ayah(ayah_id, surah_number, ayah_number, text_normalized or "")
+
+    # 3. Racines
+    for root_id, bw, arabic, occurrences in db.query(
+        Root.id, Root.buckwalter, Root.arabic, Root.occurrences_count,
+    ):
+        corpus.root_bw[root_id] = bw
+        corpus.root_arabic[root_id] = arabic
+        corpus.root_occurrences[root_id] = occurrences or 0
+        corpus.root_by_bw[bw] = root_id
+
+    # 4. Mots
+    for word_id, form, root_id, lemma, pos in db.query(
+        Word.id, Word.text_arabic, Word.root_id, Word.lemma_buckwalter, Word.pos,
+    ):
+        corpus.word_form[word_id] = form
+        corpus.word_root[word_id] = root_id
+        corpus.word_lemma[word_id] = lemma
+        corpus.word_pos[word_id] = pos
+
+    # 5. Occurrences — déjà triées, pas de tri Python nécessaire
+    occurrences = (
+        db.query(WordOccurrence.ayah_id, WordOccurrence.position, WordOccurrence.word_id)
+        .order_by(WordOccurrence.ayah_id, WordOccurrence.position)
+    )
+    for ayah_id, position, word_id in occurrences:
+        ordinal = corpus.ayah_ordinal.get(ayah_id)
+        if ordinal is not None:
+            corpus.ayah_words[ordinal].append((position, word_id))
+
+    return corpus
+
+
+def load_corpus_from_final(final: dict) -> Corpus:
+    """
+    Construit le même instantané depuis le document wikiquran_final.json,
+    sans base de données — utilisé par les benchmarks hors ligne.
+    """
+    corpus = Corpus()
+
+    surah_numbers = {}
+    for s in final['surahs']:
+        corpus.surah_names[s['number']] = s['name_arabic']
+        corpus.surah_types[s['number']] = s['type']
+        surah_numbers[s['id']] = s['number']
+
+    ayahs = sorted(final['ayahs'], key=lambda a: (surah_numbers[a['surah_id']], a['number']))
+    for a in ayahs:
+        corpus.add_ayah(a['id'], surah_numbers[a['surah_id']], a['number'], normalize(a['text_arabic']))
+
+    for r in final['roots']:
+        corpus.root_bw[r['id']] = r['buckwalter']
+        corpus.root_arabic[r['id']] = r['arabic']
+        corpus.root_occurrences[r['id']] = r['occurrences_count']
+        corpus.root_by_bw[r['buckwalter']] = r['id']
+
+    for w in final['words']:
+        corpus.word_form[w['id']] = w['form_buckwalter']
+        corpus.word_root[w['id']] = w['root_id']
+        corpus.word_lemma[w['id']] = w['lemma_bw']
+        corpus.word_pos[w['id']] = w['pos']
+
+    for o in sorted(final['occurrences'], key=lambda o: (o['ayah_id'], o['position'])):
+        ordinal = corpus.ayah_ordinal.get(o['ayah_id'])
+        if ordinal is not None:
+            corpus.ayah_words[ordinal].append((o['position'], o['word_id']))
+
+    return corpus
+
+
+def load_corpus_from_artifact(path: str) -> Corpus:
+    """
+    Construit l'instantané depuis le fichier binaire wikiquran_final.wqc (mmap).
+    Lecture colonne par colonne, sans passer par des dicts ni par PostgreSQL.
+    Le fichier doit provenir du même normalize.py que les données importées (mêmes IDs).
+    """
+    corpus = Corpus()
+
+    with CorpusArtifact(path) as artifact:
+        surahs = artifact.table("surahs")
+        for number, name, type_ in zip(
+            surahs.column("number"), surahs.column("name_arabic"), surahs.column("type"),
+        ):
+            corpus.surah_names[number] = name
+            corpus.surah_types[number] = type_
+
+        # Versets — ordre Mushaf (sourate 1→114, verset 1→n)
+        ayahs = artifact.table("ayahs")
+        rows = zip(
+            ayahs.column("id"), ayahs.column("surah_number"),
+            ayahs.column("number"), ayahs.column("text_normalized"),
+        )
+        for ayah_id, surah_number, number, text_normalized in sorted(rows, key=lambda r: (r[1], r[2])):
+            corpus.add_ayah(ayah_id, surah_number, number, text_normalized or "")
+
+        roots = artifact.table("roots")
+        for root_id, bw, arabic, occurrences in zip(
+            roots.column("id"), roots.column("buckwalter"),
+            roots.column("arabic"), roots.column("occurrences_count"),
+        ):
+            corpus.root_bw[root_id] = bw
+            corpus.root_arabic[root_id] = arabic
+            corpus.root_occurrences[root_id] = occurrences
+            corpus.root_by_bw[bw] = root_id
+
+        words = artifact.table("words")
+        for word_id, form, root_id, lemma, pos in zip(
+            words.column("id"), words.column("form_buckwalter"), words.column("root_id"),
+            words.column("lemma_bw"), words.column("pos"),
+        ):
+            corpus.word_form[word_id] = form
+            corpus.word_root[word_id] = None if root_id == NULL_INT else root_id
+            corpus.word_lemma[word_id] = lemma
+            corpus.word_pos[word_id] = pos
+
+        occurrences = artifact.table("occurrences")
+        for ayah_id, position, word_id in sorted(zip(
+            occurrences.column("ayah_id"), occurrences.column("position"), occurrences.column("word_id"),
+        )):
+            ordinal = corpus.ayah_ordinal.get(ayah_id)
+            if ordinal is not None:
+                corpus.ayah_words[ordinal].append((position, word_id))
+
+    return corpus
@@ -0,0 +1,103 @@
+import heapq
+from array import array
+from app.indexes.search_engine import SearchEngine
+from app.utils.arabic import FOLD_MAP, fold, normalize, split_words
+
+
+# ─────────────────────────────────────────────
+# RECHERCHE APPROCHÉE — similarité de trigrammes
+# ─────────────────────────────────────────────
+# Vocabulaire replié (~15 000 formes) + postings trigramme → formes.
+# Une requête ne compare que les formes partageant assez de trigrammes
+# avec elle (élagage), puis remonte aux versets via l'index BM25.
+
+DEFAULT_THRESHOLD = 0.4   # similarité minimale d'un mot (pg_trgm : 0.3)
+
+
+def trigrams(word: str) -> set[str]:
+    """Trigrammes d'un mot, bordés comme pg_trgm : '  mot '."""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """Postings trigramme → formes repliées, formes → termes de l'index BM25."""
+
+    def __init__(self, engine: SearchEngine, table: dict[str, str] = FOLD_MAP):
+        self.engine = engine
+        self.table = table
+
+        # 1. Vocabulaire replié : forme → termes normalisés d'origine
+        by_form: dict[str, list[str]] = {}
+        for term in engine.postings:
+            by_form.setdefault(fold(term, table), []).append(term)
+
+        self.forms: list[str] = list(by_form)
+        self.form_terms: list[list[str]] = [by_form[f] for f in self.forms]
+        self.form_sizes = array("H")
+
+        # 2. Postings trigramme → identifiants de formes
+        postings: dict[str, array] = {}
+        for form_id, form in enumerate(self.forms):
+            grams = trigrams(form)
+            self.form_sizes.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, array("i")).append(form_id)
+        self.postings = postings
+
+    def similar_forms(self, word: str, threshold: float) -> list[tuple[int, float]]:
+        """
+        Formes du vocabulaire avec similarité de Jaccard ≥ threshold.
+        Élagage : sim ≤ communs / |q|, donc une forme doit partager
+        au moins threshold × |q| trigrammes avec la requête.
+        """
+        grams = trigrams(word)
+        size = len(grams)
+
+        counts: dict[int, int] = {}
+        for gram in grams:
+            for form_id in self.postings.get(gram, ()):
+                counts[form_id] = counts.get(form_id, 0) + 1
+
+        min_common = threshold * size
+        result = []
+        for form_id, common in counts.items():
+            if common < min_common:
+                continue
+            similarity = common / (size + self.form_sizes[form_id] - common)
+            if similarity >= threshold:
+                result.append((form_id, similarity))
+        return result
+
+    def search(
+        self,
+        query: str,
+        k: int,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> tuple[int, list[tuple[int, float, list[int]]]]:
+        """
+        Score d'un verset = moyenne, sur les mots de la requête,
+        de la meilleure similarité trouvée dans le verset.
+        Retourne (nombre total de versets, top-k [(ordinal, score, positions)]).
+        """
+        words = [fold(w, self.table) for w in split_words(normalize(query))]
+        if not words:
+            return 0, []
+
+        scores: dict[int, float] = {}
+        hits: dict[int, list[int]] = {}
+        for word in words:
+            # Meilleure similarité par verset pour ce mot de la requête
+            best: dict[int, float] = {}
+            for form_id, similarity in self.similar_forms(word, threshold):
+                for term in self.form_terms[form_id]:
+                    ordinals, positions_list = self.engine.postings[term]
+                    for ordinal, positions in zip(ordinals, positions_list):
+                        if similarity > best.get(ordinal, 0.0):
+                            best[ordinal] = similarity
+                        hits.setdefault(ordinal, []).extend(positions)
+            for ordinal, similarity in best.items():
+                scores[ordinal] = scores.get(ordinal, 0.0) + similarity / len(words)
+
+        top = heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+        return len(scores), [(o, s, sorted(set(hits[o]))) for o, s in top]
@@ -0,0 +1,81 @@
+import math
+from array import array
+from app.indexes.corpus import Corpus
+from app.indexes.bitsets import RootBitsets
+
+
+# ─────────────────────────────────────────────
+# COÛT ESTIMÉ DES REQUÊTES RÉSEAU (Neo4j)
+# ─────────────────────────────────────────────
+# Unité : relations SHARES_ROOT parcourues. Design A = une relation par racine
+# partagée, donc le degré d'un verset est Σ (versets de la racine − 1) sur ses
+# racines — calculé une fois, sans Neo4j, depuis les bitsets racine → versets.
+#   /network/ayah      : degré du verset (toutes ses relations sont agrégées)
+#   /network/root      : versets de la racine + liens entre les n = max_nodes retenus :
+#                        _CYPHER_ROOT_LINKS développe chacune des n(n-1)/2 paires,
+#                        soit ≈ degré moyen relations par paire (croissance en n²)
+#                        (+ connectivité de TOUS les versets si sort=connected)
+#   /analytics         : parcours de toutes les occurrences
+
+def _pairs(n: int) -> int:
+    return n * (n - 1) // 2
+
+
+class GraphCostModel:
+    """Degré par verset et degré moyen par racine, pour estimer le coût avant d'exécuter."""
+
+    def __init__(self, corpus: Corpus, bitsets: RootBitsets):
+        counts = {root_id: bits.bit_count() for root_id, bits in bitsets.by_root.items()}
+        self.root_ayahs: dict[str, int] = {
+            corpus.root_bw[root_id]: count for root_id, count in counts.items()
+        }
+
+        # Degré SHARES_ROOT de chaque verset (ordinal Mushaf)
+        self.ayah_degree = array("i")
+        degree_sum: dict[int, int] = {}
+        for ordinal in range(corpus.ayah_count):
+            roots = corpus.ayah_roots(ordinal)
+            degree = sum(counts[r] - 1 for r in roots)
+            self.ayah_degree.append(degree)
+            for root_id in roots:
+                degree_sum[root_id] = degree_sum.get(root_id, 0) + degree
+
+        # Degré moyen des versets d'une racine (coût d'expansion par nœud retenu)
+        self.root_mean_degree: dict[str, float] = {
+            corpus.root_bw[root_id]: total / counts[root_id]
+            for root_id, total in degree_sum.items()
+        }
+
+        self.ayah_ref: dict[tuple[int, int], int] = {
+            (surah, number): ordinal
+            for ordinal, (surah, number) in enumerate(zip(corpus.ayah_surah, corpus.ayah_number))
+        }
+        self.occurrence_count = sum(len(words) for words in corpus.ayah_words)
+
+    def ayah_network(self, surah_number: int, ayah_number: int) -> int:
+        ordinal = self.ayah_ref.get((surah_number, ayah_number))
+        return self.ayah_degree[ordinal] if ordinal is not None else 0
+
+    def root_network(self, buckwalter: str, sort: str, max_nodes: int) -> int:
+        ayahs = self.root_ayahs.get(buckwalter, 0)
+        degree = self.root_mean_degree.get(buckwalter, 0.0)
+        cost = ayahs + _pairs(min(ayahs, max_nodes)) * degree
+        if sort == "connected":
+            cost += ayahs * degree
+        return int(cost)
+
+    def analytics(self) -> int:
+        return self.occurrence_count
+
+    def max_nodes_within(self, buckwalter: str, budget: int, floor: int = 5) -> int | None:
+        """Plus grand max_nodes (tri mushaf) dont le coût tient dans le budget — None si même `floor` dépasse."""
+        ayahs = self.root_ayahs.get(buckwalter, 0)
+        degree = self.root_mean_degree.get(buckwalter, 0.0)
+        if degree == 0:
+            return None
+        # n(n-1)/2 · degré ≤ budget − versets  →  n ≤ (1 + √(1 + 8·paires)) / 2
+        pairs = (budget - ayahs) / degree
+        if pairs < 0:
+            return None
+        max_nodes = int((1 + math.sqrt(1 + 8 * pairs)) / 2)
+        return max_nodes if max_nodes >= floor else None
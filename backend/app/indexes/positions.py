@@ -0,0 +1,45 @@
+from array import array
+from app.indexes.corpus import Corpus
+
+
+# ─────────────────────────────────────────────
+# INDEX POSITIONNEL — (verset, position) → mot
+# ─────────────────────────────────────────────
+# Chaque occurrence est codée sur un entier : ordinal << SLOT_BITS | slot,
+# où slot est l'indice du mot dans corpus.ayah_words[ordinal].
+# Les postings d'une racine ou d'un lemme sont des array('i') en ordre Mushaf :
+# une page se lit par simple découpage, sans rien charger d'autre.
+
+SLOT_BITS = 9                     # 512 mots max par verset (2:282 en compte 128)
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+def unpack(key: int) -> tuple[int, int]:
+    """Occurrence codée → (ordinal du verset, slot du mot)."""
+    return key >> SLOT_BITS, key & SLOT_MASK
+
+
+class PositionIndex:
+    """Postings racine → occurrences et lemme → occurrences."""
+
+    def __init__(self, corpus: Corpus):
+        self.by_root: dict[int, array] = {}
+        self.by_lemma: dict[str, array] = {}
+
+        for ordinal, words in enumerate(corpus.ayah_words):
+            for slot, (_, word_id) in enumerate(words):
+                key = ordinal << SLOT_BITS | slot
+
+                root_id = corpus.word_root.get(word_id)
+                if root_id is not None:
+                    self.by_root.setdefault(root_id, array("i")).append(key)
+
+                lemma = corpus.word_lemma.get(word_id)
+                if lemma:
+                    self.by_lemma.setdefault(lemma, array("i")).append(key)
+
+    def root_occurrences(self, root_id: int) -> array:
+        return self.by_root.get(root_id, array("i"))
+
+    def lemma_occurrences(self, lemma: str) -> array | None:
+        return self.by_lemma.get(lemma)
@@ -0,0 +1,102 @@
+import heapq
+from bisect import bisect_left
+from app.indexes.analyzer import surface_keys
+from app.indexes.corpus import Corpus
+from app.indexes.positions import PositionIndex
+from app.utils.arabic import normalize
+from app.utils.buckwalter import buckwalter_to_arabic
+
+
+# ─────────────────────────────────────────────
+# INDEX DE PRÉFIXES — autocomplétion
+# ─────────────────────────────────────────────
+# Une seule liste triée de clés (Buckwalter et arabe normalisé mélangés) :
+# les clés commençant par un préfixe forment une plage contiguë, trouvée par bisect.
+# Les préfixes courts (plages de milliers de clés) ont leur top-N précalculé.
+
+MAX_SUGGESTIONS = 20      # limite maximale d'une réponse
+CACHED_PREFIX_LEN = 2     # préfixes ≤ 2 caractères : résultats précalculés
+
+KINDS = ("root", "lemma", "form")
+
+
+class Suggestion:
+    """Une entrée suggérable : racine, lemme ou forme de mot."""
+
+    __slots__ = ("kind", "buckwalter", "arabic", "count")
+
+    def __init__(self, kind: str, buckwalter: str, arabic: str, count: int):
+        self.kind = kind              # 'root' | 'lemma' | 'form'
+        self.buckwalter = buckwalter
+        self.arabic = arabic
+        self.count = count            # nombre d'occurrences dans le Coran
+
+
+class PrefixIndex:
+    """Liste triée clé → suggestion, classement par nombre d'occurrences."""
+
+    def __init__(self, corpus: Corpus, positions: PositionIndex):
+        suggestions: list[Suggestion] = []
+
+        # 1. Racines — occurrences réelles depuis l'index positionnel
+        for root_id, bw in corpus.root_bw.items():
+            suggestions.append(Suggestion(
+                "root", bw, corpus.root_arabic[root_id],
+                len(positions.root_occurrences(root_id)),
+            ))
+
+        # 2. Lemmes
+        for lemma, postings in positions.by_lemma.items():
+            suggestions.append(Suggestion("lemma", lemma, buckwalter_to_arabic(lemma), len(postings)))
+
+        # 3. Formes de mots — une forme peut porter plusieurs word_id
+        form_counts: dict[str, int] = {}
+        for words in corpus.ayah_words:
+            for _, word_id in words:
+                form = corpus.word_form[word_id]
+                form_counts[form] = form_counts.get(form, 0) + 1
+        for form, count in form_counts.items():
+            suggestions.append(Suggestion("form", form, buckwalter_to_arabic(form), count))
+
+        # 4. Clés : Buckwalter tel quel + formes arabes normalisées (sans diacritiques)
+        entries = []
+        for suggestion in suggestions:
+            entries.append((suggestion.buckwalter, suggestion))
+            for key in surface_keys(suggestion.buckwalter):
+                entries.append((key, suggestion))
+        entries.sort(key=lambda entry: entry[0])
+
+        self.keys = [key for key, _ in entries]
+        self.entries = [suggestion for _, suggestion in entries]
+
+        # 5. Top-N précalculé pour les préfixes courts, par type
+        self.cache: dict[tuple[str, str | None], list[Suggestion]] = {}
+        prefixes = {key[:n] for key in self.keys for n in range(1, CACHED_PREFIX_LEN + 1)}
+        for prefix in prefixes:
+            for kind in (None, *KINDS):
+                self.cache[(prefix, kind)] = self._scan(prefix, kind, MAX_SUGGESTIONS)
+
+    def _scan(self, prefix: str, kind: str | None, limit: int) -> list[Suggestion]:
+        """Parcourt la plage du préfixe et garde les `limit` entrées les plus fréquentes."""
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + "\U0010FFFF", lo=start)
+
+        # Une suggestion peut apparaître plusieurs fois (clé Buckwalter + clés arabes)
+        seen = set()
+        candidates = []
+        for suggestion in self.entries[start:end]:
+            if (kind is None or suggestion.kind == kind) and id(suggestion) not in seen:
+                seen.add(id(suggestion))
+                candidates.append(suggestion)
+
+        return heapq.nsmallest(limit, candidates, key=lambda s: (-s.count, len(s.buckwalter), s.buckwalter))
+
+    def complete(self, prefix: str, kind: str | None = None, limit: int = 10) -> list[Suggestion]:
+        """Suggestions pour un préfixe Buckwalter ou arabe (diacritiques ignorés)."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        cached = self.cache.get((prefix, kind))
+        if cached is not None or len(prefix) <= CACHED_PREFIX_LEN:
+            return (cached or [])[:limit]
+        return self._scan(prefix, kind, limit)
@@ -0,0 +1,74 @@
+import os
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.indexes.corpus import Corpus, load_corpus, load_corpus_from_artifact
+from app.indexes.bitsets import RootBitsets
+from app.indexes.cooccurrence import RootCooccurrence
+from app.indexes.positions import PositionIndex
+from app.indexes.search_engine import SearchEngine
+from app.indexes.fuzzy import FuzzyIndex
+from app.indexes.prefix import PrefixIndex
+from app.indexes.analyzer import QueryAnalyzer
+from app.indexes.graph_cost import GraphCostModel
+
+
+# ─────────────────────────────────────────────
+# REGISTRE DES INDEX EN MÉMOIRE
+# ─────────────────────────────────────────────
+
+class Indexes:
+    """Ensemble des index construits depuis un même instantané du corpus."""
+
+    def __init__(self, corpus: Corpus):
+        self.corpus = corpus
+        self.root_bitsets = RootBitsets(corpus)
+        self.root_cooccurrence = RootCooccurrence(corpus, self.root_bitsets)
+        self.positions = PositionIndex(corpus)
+        self.search_engine = SearchEngine(corpus, self.positions)
+        self.fuzzy = FuzzyIndex(self.search_engine)
+        self.prefixes = PrefixIndex(corpus, self.positions)
+        self.analyzer = QueryAnalyzer(corpus)
+        self.graph_cost = GraphCostModel(corpus, self.root_bitsets)
+
+
+# Instance du worker — construite au démarrage (lifespan), lue par les routes
+_indexes: Indexes | None = None
+
+
+def build_indexes(db: Session, use_artifact: bool = True) -> Indexes:
+    """
+    Charge le corpus et construit tous les index, sans les publier.
+    Source : fichier binaire CORPUS_ARTIFACT s'il est configuré et présent, sinon PostgreSQL.
+    """
+    if use_artifact and settings.CORPUS_ARTIFACT and os.path.exists(settings.CORPUS_ARTIFACT):
+        corpus = load_corpus_from_artifact(settings.CORPUS_ARTIFACT)
+    else:
+        corpus = load_corpus(db)
+    return Indexes(corpus)
+
+
+def set_indexes(indexes: Indexes):
+    """Publie un jeu d'index complet : les requêtes suivantes le lisent."""
+    global _indexes
+    _indexes = indexes
+
+
+def load_indexes(db: Session) -> Indexes:
+    """Construit et publie les index (démarrage)."""
+    indexes = build_indexes(db)
+    set_indexes(indexes)
+    return indexes
+
+
+def get_indexes() -> Indexes:
+    """
+    Dépendance FastAPI : Depends(get_indexes).
+    Renvoie 503 tant que les index ne sont pas construits.
+    """
+    if _indexes is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Index en mémoire non disponibles — démarrage en cours",
+        )
+    return _indexes
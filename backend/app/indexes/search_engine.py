@@ -0,0 +1,175 @@
+import heapq
+from array import array
+from math import log
+from app.indexes.corpus import Corpus
+from app.indexes.positions import PositionIndex, unpack
+from app.utils.arabic import normalize, split_words
+
+
+# ─────────────────────────────────────────────
+# MOTEUR DE RECHERCHE CLASSÉ — BM25
+# ─────────────────────────────────────────────
+# Index inversé sur les mots de text_normalized : terme → versets, fréquences
+# et positions (position = rang du mot, aligné sur word_occurrence.position - 1).
+# Construit en ~0,2 s pour tout le Coran à partir de l'instantané du corpus.
+
+K1 = 1.2     # saturation de la fréquence du terme
+B = 0.75     # normalisation par la longueur du verset
+
+# Préfixes de requête : extension par les tables root / word
+ROOT_PREFIX = "root:"
+LEMMA_PREFIX = "lemma:"
+
+
+class Clause:
+    """Une unité de requête : mot, phrase "...", root:xxx ou lemma:xxx."""
+
+    def __init__(self, kind: str, value: str, words: list[str] | None = None):
+        self.kind = kind          # 'term' | 'phrase' | 'root' | 'lemma'
+        self.value = value        # forme normalisée (ou Buckwalter pour root/lemma)
+        self.words = words or []  # mots d'une phrase
+
+
+def parse_query(query: str) -> list[Clause]:
+    """
+    'الحمد "رب العلمين" root:Elm' → [term, phrase, root].
+    Les mots et phrases sont normalisés comme à l'import.
+    """
+    clauses = []
+    parts = query.split('"')
+    for i, part in enumerate(parts):
+        # Les segments d'indice impair sont entre guillemets
+        if i % 2 == 1:
+            words = split_words(normalize(part))
+            if len(words) == 1:
+                clauses.append(Clause("term", words[0]))
+            elif words:
+                clauses.append(Clause("phrase", " ".join(words), words))
+            continue
+
+        for token in part.split():
+            if token.startswith(ROOT_PREFIX) and len(token) > len(ROOT_PREFIX):
+                clauses.append(Clause("root", token[len(ROOT_PREFIX):]))
+            elif token.startswith(LEMMA_PREFIX) and len(token) > len(LEMMA_PREFIX):
+                clauses.append(Clause("lemma", token[len(LEMMA_PREFIX):]))
+            else:
+                clauses.extend(Clause("term", w) for w in split_words(normalize(token)))
+    return clauses
+
+
+class SearchEngine:
+    """Index inversé + scoring BM25 + récupération top-k par tas."""
+
+    def __init__(self, corpus: Corpus, positions: PositionIndex):
+        self.corpus = corpus
+        self.positions = positions
+        self.doc_count = corpus.ayah_count
+
+        # 1. Index inversé : terme → (ordinaux, positions par ordinal)
+        build: dict[str, tuple[array, list[array]]] = {}
+        self.doc_lengths = array("H")
+        for ordinal, text in enumerate(corpus.ayah_text_normalized):
+            words = split_words(text)
+            self.doc_lengths.append(len(words))
+
+            local: dict[str, array] = {}
+            for position, word in enumerate(words):
+                local.setdefault(word, array("H")).append(position)
+
+            for word, word_positions in local.items():
+                ordinals, positions_list = build.setdefault(word, (array("i"), []))
+                ordinals.append(ordinal)
+                positions_list.append(word_positions)
+
+        self.postings = build
+        self.avg_length = (sum(self.doc_lengths) / self.doc_count) if self.doc_count else 0.0
+
+    # ─── Postings par type de clause ─────────────────────────
+
+    def _clause_postings(self, clause: Clause) -> dict[int, list[int]]:
+        """Clause → {ordinal: positions des mots correspondants}."""
+        if clause.kind == "term":
+            entry = self.postings.get(clause.value)
+            if entry is None:
+                return {}
+            ordinals, positions_list = entry
+            return {o: list(p) for o, p in zip(ordinals, positions_list)}
+
+        if clause.kind == "phrase":
+            return self._phrase_postings(clause.words)
+
+        # root / lemma : extension via les tables root et word (index positionnel)
+        if clause.kind == "root":
+            root_id = self.corpus.root_by_bw.get(clause.value)
+            keys = self.positions.root_occurrences(root_id) if root_id is not None else ()
+        else:
+            keys = self.positions.lemma_occurrences(clause.value) or ()
+
+        result: dict[int, list[int]] = {}
+        for key in keys:
+            ordinal, slot = unpack(key)
+            position = self.corpus.ayah_words[ordinal][slot][0] - 1
+            result.setdefault(ordinal, []).append(position)
+        return result
+
+    def _phrase_postings(self, words: list[str]) -> dict[int, list[int]]:
+        """Versets où les mots se suivent — intersection puis vérification des positions."""
+        entries = [self.postings.get(w) for w in words]
+        if any(e is None for e in entries):
+            return {}
+
+        # Intersection en partant du terme le plus rare
+        per_word = [dict(zip(ordinals, positions)) for ordinals, positions in entries]
+        rarest = min(range(len(words)), key=lambda i: len(per_word[i]))
+        candidates = [o for o in per_word[rarest] if all(o in pw for pw in per_word)]
+
+        result: dict[int, list[int]] = {}
+        for ordinal in candidates:
+            following = [set(pw[ordinal]) for pw in per_word[1:]]
+            for start in per_word[0][ordinal]:
+                if all(start + k + 1 in following[k] for k in range(len(following))):
+                    # Toutes les positions de la phrase sont à surligner
+                    result.setdefault(ordinal, []).extend(range(start, start + len(words)))
+        return result
+
+    # ─── Scoring ─────────────────────────────────────────────
+
+    def _idf(self, df: int) -> float:
+        return log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+
+    def search(
+        self,
+        clauses: list[Clause],
+        k: int,
+        match_all: bool = False,
+    ) -> tuple[int, list[tuple[int, float, list[int]]]]:
+        """
+        Évalue les clauses et retourne (nombre total de versets, top-k).
+        top-k = [(ordinal, score, positions à surligner)] trié par score décroissant.
+        match_all : un verset doit satisfaire toutes les clauses (sinon au moins une).
+        """
+        scores: dict[int, float] = {}
+        hits: dict[int, list[int]] = {}
+        matched: dict[int, int] = {}
+
+        for clause in clauses:
+            postings = self._clause_postings(clause)
+            if not postings:
+                continue
+            idf = self._idf(len(postings))
+
+            for ordinal, positions in postings.items():
+                # Une phrase compte une fois par occurrence complète
+                tf = len(positions) // len(clause.words) if clause.kind == "phrase" else len(positions)
+                norm = K1 * (1 - B + B * self.doc_lengths[ordinal] / self.avg_length)
+                scores[ordinal] = scores.get(ordinal, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+                hits.setdefault(ordinal, []).extend(positions)
+                matched[ordinal] = matched.get(ordinal, 0) + 1
+
+        if match_all:
+            needed = len(clauses)
+            scores = {o: s for o, s in scores.items() if matched[o] == needed}
+
+        # Top-k par tas — égalités départagées par l'ordre Mushaf
+        top = heapq.nsmallest(k, scores.items(), key=lambda item: (-item[1], item[0]))
+        return len(scores), [(o, s, sorted(set(hits[o]))) for o, s in top]
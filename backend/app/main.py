@@ -1,29 +1,49 @@
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.database import close_neo4j
+from app.database import close_neo4j, current_dataset
+from app.dataset import load_active_dataset, watch_dataset_pointer
+from app import metrics
 from app.api import surahs
 from app.api import ayahs
 from app.api import roots
 from app.api import search
 from app.api import network
 from app.api import analytics
+from app.api import query
+from app.api import concordance
+from app.api import autocomplete
+from app.api import analyze
 from app.models import surah  # noqa
 from app.models import ayah   # noqa
 from app.models import root          # noqa
 from app.models import word          # noqa
 from app.models import word_occurrence  # noqa
+from app.models import ayah_pair        # noqa
+from app.models import root_ayah_count  # noqa
+from app.models import snapshot_info    # noqa
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Gestion du cycle de vie de l'app :
-    - Démarrage : rien à faire (SQLAlchemy + Neo4j se connectent à la première requête)
-    - Arrêt     : fermeture propre du driver Neo4j
+    - Démarrage : lecture du pointeur de jeu de données, construction des index
+                  en mémoire depuis ce jeu (Neo4j se connecte à la première requête),
+                  puis suivi du pointeur en tâche de fond (bascule bleu/vert,
+                  sauf en mode instantané DATA_SNAPSHOT)
+    - Arrêt     : arrêt du suivi, fermeture propre des drivers Neo4j
     """
+    load_active_dataset()
+    watcher = None
+    if settings.DATASET_POLL_SECONDS > 0 and not settings.DATA_SNAPSHOT:
+        watcher = asyncio.create_task(watch_dataset_pointer())
+
     yield  # L'app tourne ici
+    if watcher:
+        watcher.cancel()
     close_neo4j()
 
 
@@ -40,8 +60,50 @@ app.add_middleware(
     allow_origins=settings.cors_origins_list,
     allow_methods=["GET"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Dataset-Version", "Server-Timing", "X-Degraded", "Retry-After"],
 )
 
+# ─── Version du jeu de données ─────────────────────────────
+# Les réponses ne changent qu'avec le code ou le jeu de données : l'ETag
+# (faible) combine les deux et change à la bascule. If-None-Match identique
+# → 304 sans exécuter la route. Réponse dégradée (X-Degraded, admission.py) :
+# pas d'ETag, pour qu'elle ne soit pas revalidée à la place de la complète.
+_UNCACHED_PATHS = {"/", "/health", "/metrics"}
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Comparaison faible (RFC 9110) : valeurs exactes de la liste, W/ ignoré, ou *."""
+    opaque = etag.removeprefix("W/")
+    for value in if_none_match.split(","):
+        value = value.strip()
+        if value == "*" or value.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+@app.middleware("http")
+async def dataset_version_headers(request: Request, call_next):
+    version = current_dataset().version
+    etag = f'W/"{settings.APP_VERSION}:{version}"'
+    cacheable = request.method == "GET" and request.url.path not in _UNCACHED_PATHS
+
+    if cacheable and _etag_matches(request.headers.get("if-none-match", ""), etag):
+        response = Response(status_code=304, headers={"ETag": etag})
+    else:
+        response = await call_next(request)
+        if cacheable and response.status_code == 200 and "X-Degraded" not in response.headers:
+            response.headers["ETag"] = etag
+    response.headers["X-Dataset-Version"] = version
+    return response
+
+
+# ─── Métriques ─────────────────────────────────────────────
+# Après les autres middlewares (mesure tout le reste), avant les routers
+# (dépendance globale qui marque la fin de chaque route).
+if settings.METRICS_ENABLED:
+    metrics.install(app)
+
+
 # ─── Routers ───────────────────────────────────────────────
 app.include_router(surahs.router)
 app.include_router(ayahs.router)
@@ -49,6 +111,10 @@ app.include_router(roots.router)
 app.include_router(search.router)
 app.include_router(network.router)
 app.include_router(analytics.router)
+app.include_router(query.router)
+app.include_router(concordance.router)
+app.include_router(autocomplete.router)
+app.include_router(analyze.router)
 
 # ─── Healthcheck ───────────────────────────────────────────
 @app.get("/health", tags=["Health"])
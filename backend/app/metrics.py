@@ -0,0 +1,353 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from fastapi import Depends, FastAPI, Request, Response
+from neo4j import EagerResult
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# ─────────────────────────────────────────────
+# MÉTRIQUES — temps par requête, Server-Timing, /metrics
+# ─────────────────────────────────────────────
+# Activé par METRICS_ENABLED (main.py → install). Chaque requête accumule
+# dans un RequestTimings (contextvar, visible depuis le threadpool des routes) :
+#   - pg        : écouteurs SQLAlchemy autour de chaque exécution de curseur
+#   - neo4j     : TimedSession, proxy de session qui lit tout le résultat
+#                 et étiquette la requête par le nom de sa constante _CYPHER_*
+#   - serialize : fin de la route → réponse prête (validation du modèle + JSON)
+# Restitution : en-tête Server-Timing sur la réponse, histogrammes au format
+# texte Prometheus sur /metrics. Désactivé : rien n'est installé.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+RECORD_BUCKETS  = (0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+COST_BUCKETS    = (1_000, 10_000, 100_000, 500_000, 1_000_000, 5_000_000, 10_000_000, 50_000_000, 100_000_000)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Compteur Prometheus (suffixe _total)."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1, **labels):
+        key = tuple(labels[n] for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Gauge:
+    """Jauge Prometheus (valeur courante)."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels):
+        key = tuple(labels[n] for n in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Histogramme Prometheus à seaux fixes (cumulés au rendu)."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (),
+                 buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}   # clé → [compte par seau..., +Inf, somme]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels[n] for n in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, "+Inf"), series):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == "+Inf" else f'le="{bound:g}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {series[-1]:.6f}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    "wikiquran_request_duration_seconds", "Durée des requêtes HTTP par route",
+    ("route", "method", "status"),
+)
+PHASE_SECONDS = Histogram(
+    "wikiquran_request_phase_seconds", "Temps par phase (pg, neo4j, serialize) et par route",
+    ("route", "phase"),
+)
+PG_STATEMENTS = Counter(
+    "wikiquran_pg_statements_total", "Requêtes SQL exécutées par route", ("route",),
+)
+CYPHER_SECONDS = Histogram(
+    "wikiquran_cypher_duration_seconds", "Durée des requêtes Cypher (exécution + lecture du résultat)",
+    ("query",),
+)
+CYPHER_RECORDS = Histogram(
+    "wikiquran_cypher_records", "Nombre d'enregistrements renvoyés par requête Cypher",
+    ("query",), RECORD_BUCKETS,
+)
+
+ADMISSION_DECISIONS = Counter(
+    "wikiquran_admission_decisions_total",
+    "Décisions d'admission des requêtes réseau (cheap, admitted, cached, reduced, rejected, timeout, fallback)",
+    ("route", "decision"),
+)
+ADMISSION_COST = Histogram(
+    "wikiquran_admission_estimated_cost", "Coût estimé (relations SHARES_ROOT) par route",
+    ("route",), COST_BUCKETS,
+)
+NEO4J_ABORTED = Counter(
+    "wikiquran_neo4j_aborted_total", "Requêtes Neo4j interrompues (timeout, disconnect)",
+    ("route", "reason"),
+)
+NEO4J_WASTED_SECONDS = Counter(
+    "wikiquran_neo4j_wasted_seconds_total",
+    "Temps Neo4j dépensé pour des réponses jamais servies (timeout, disconnect)",
+    ("route", "reason"),
+)
+NEO4J_SERVER_CPU_SECONDS = Counter(
+    "wikiquran_neo4j_terminated_cpu_seconds_total",
+    "Temps CPU serveur des transactions terminées (db.track_query_cpu_time requis)",
+    ("route",),
+)
+CIRCUIT_STATE = Gauge(
+    "wikiquran_circuit_state", "État du disjoncteur (1 = état courant)", ("breaker", "state"),
+)
+CIRCUIT_TRANSITIONS = Counter(
+    "wikiquran_circuit_transitions_total", "Changements d'état du disjoncteur", ("breaker", "state"),
+)
+
+_METRICS = [
+    REQUEST_SECONDS, PHASE_SECONDS, PG_STATEMENTS, CYPHER_SECONDS, CYPHER_RECORDS,
+    ADMISSION_DECISIONS, ADMISSION_COST,
+    NEO4J_ABORTED, NEO4J_WASTED_SECONDS, NEO4J_SERVER_CPU_SECONDS,
+    CIRCUIT_STATE, CIRCUIT_TRANSITIONS,
+]
+
+
+def render_metrics() -> str:
+    return "\n".join(line for metric in _METRICS for line in metric.render()) + "\n"
+
+
+# ─── Temps de la requête en cours ─────────────────────────
+
+class RequestTimings:
+    """Accumulateur d'une requête HTTP (secondes)."""
+
+    __slots__ = ("pg", "pg_statements", "neo4j", "cypher", "endpoint_done")
+
+    def __init__(self):
+        self.pg = 0.0
+        self.pg_statements = 0
+        self.neo4j = 0.0
+        self.cypher: list[str] = []
+        self.endpoint_done: float | None = None
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def _endpoint_timer():
+    """Dépendance globale (scope function) : sa sortie marque la fin de la route, avant la sérialisation."""
+    yield
+    timings = _current.get()
+    if timings is not None:
+        timings.endpoint_done = time.perf_counter()
+
+
+# ─── PostgreSQL — écouteurs SQLAlchemy ────────────────────
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info["metrics_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("metrics_started", None)
+    timings = _current.get()
+    if started is not None and timings is not None:
+        timings.pg += time.perf_counter() - started
+        timings.pg_statements += 1
+
+
+# ─── Neo4j — proxy de session ─────────────────────────────
+
+_cypher_labels: dict[str, str] | None = None
+
+
+def cypher_label(query: str) -> str:
+    """Texte Cypher → nom de sa constante (_CYPHER_AYAH_NETWORK → AYAH_NETWORK)."""
+    global _cypher_labels
+    if _cypher_labels is None:
+        from app.services import analytics, network
+        _cypher_labels = {
+            value: name.removeprefix("_CYPHER_")
+            for module in (network, analytics)
+            for name, value in vars(module).items()
+            if name.startswith("_CYPHER_")
+        }
+    return _cypher_labels.get(query, "other")
+
+
+class BufferedResult:
+    """Résultat Cypher déjà lu en entier — mêmes usages que neo4j.Result dans les services."""
+
+    def __init__(self, eager):
+        self.records = eager.records
+        self.summary = eager.summary
+        self._keys = eager.keys
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def single(self):
+        return self.records[0] if self.records else None
+
+    def data(self, *keys) -> list[dict]:
+        return [record.data(*keys) for record in self.records]
+
+    def keys(self) -> list[str]:
+        return self._keys
+
+    def consume(self):
+        return self.summary
+
+    def to_eager_result(self) -> EagerResult:
+        return EagerResult(self.records, self.summary, self._keys)
+
+
+class TimedSession:
+    """
+    Proxy de session Neo4j : chaque run() lit tout le résultat pour que le
+    temps mesuré couvre l'exécution et le transfert, pas seulement l'envoi.
+    """
+
+    def __init__(self, session):
+        self._session = session
+
+    def run(self, query: str, parameters: dict | None = None, **kwargs) -> BufferedResult:
+        started = time.perf_counter()
+        eager = self._session.run(query, parameters, **kwargs).to_eager_result()
+        elapsed = time.perf_counter() - started
+
+        label = cypher_label(query)
+        CYPHER_SECONDS.observe(elapsed, query=label)
+        CYPHER_RECORDS.observe(len(eager.records), query=label)
+        timings = _current.get()
+        if timings is not None:
+            timings.neo4j += elapsed
+            timings.cypher.append(label)
+        return BufferedResult(eager)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+# ─── Middleware + /metrics ────────────────────────────────
+
+def _server_timing(timings: RequestTimings, serialize: float, total: float) -> str:
+    parts = [f'pg;dur={timings.pg * 1000:.2f};desc="{timings.pg_statements} SQL"']
+    if timings.cypher:
+        parts.append(f'neo4j;dur={timings.neo4j * 1000:.2f};desc="{" ".join(timings.cypher)}"')
+    parts.append(f"serialize;dur={serialize * 1000:.2f}")
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+async def timing_middleware(request: Request, call_next):
+    if request.url.path == "/metrics":
+        return await call_next(request)
+
+    timings = RequestTimings()
+    token = _current.set(timings)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+    finished = time.perf_counter()
+
+    total = finished - started
+    serialize = finished - timings.endpoint_done if timings.endpoint_done else 0.0
+    response.headers["Server-Timing"] = _server_timing(timings, serialize, total)
+
+    # Gabarit de route (/ayah/{surah_number}/{ayah_number}) : cardinalité bornée
+    route = request.scope.get("route")
+    path = getattr(route, "path", "unmatched")
+    REQUEST_SECONDS.observe(total, route=path, method=request.method, status=str(response.status_code))
+    PHASE_SECONDS.observe(timings.pg, route=path, phase="pg")
+    PHASE_SECONDS.observe(serialize, route=path, phase="serialize")
+    if timings.cypher:
+        PHASE_SECONDS.observe(timings.neo4j, route=path, phase="neo4j")
+    if timings.pg_statements:
+        PG_STATEMENTS.inc(timings.pg_statements, route=path)
+    return response
+
+
+def metrics_endpoint():
+    """Exposition au format texte Prometheus."""
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def install(app: FastAPI):
+    """
+    Branche l'instrumentation sur l'app. À appeler après les autres
+    middlewares (il mesure donc tout le reste) et avant include_router
+    (la dépendance globale n'est ajoutée qu'aux routes enregistrées ensuite).
+    """
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    app.router.dependencies.append(Depends(_endpoint_timer, scope="function"))
+    app.middleware("http")(timing_middleware)
+    app.add_api_route("/metrics", metrics_endpoint, include_in_schema=False)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, SmallInteger, Text, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, SmallInteger, Text, LargeBinary, DateTime, ForeignKey
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.database import Base
 
@@ -9,11 +9,14 @@ class Ayah(Base):
 
     __tablename__ = "ayah"
 
-    id          = Column(Integer,      primary_key=True)
-    surah_id    = Column(Integer,      ForeignKey("surah.id"), nullable=False)
-    number      = Column(SmallInteger, nullable=False)
-    text_arabic = Column(Text,         nullable=False)
-    created_at  = Column(DateTime,     server_default=func.now())
+    id              = Column(Integer,      primary_key=True)
+    surah_id        = Column(Integer,      ForeignKey("surah.id"), nullable=False)
+    number          = Column(SmallInteger, nullable=False)
+    text_arabic     = Column(Text,         nullable=False)
+    # Calculés à l'import — chargés à la demande (undefer) par la recherche uniquement
+    text_normalized = deferred(Column(Text))          # sans diacritiques, Alef unifié
+    offset_map      = deferred(Column(LargeBinary))   # uint16[] : indice normalisé → indice original
+    created_at      = Column(DateTime,     server_default=func.now())
 
     # Relation vers le modèle Surah — JOIN automatique en une seule requête
     surah = relationship("Surah", back_populates="ayahs", lazy="joined")
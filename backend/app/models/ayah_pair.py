@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, SmallInteger, ForeignKey, Index, JSON, PrimaryKeyConstraint
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.database import Base
+
+
+class AyahPair(Base):
+    """Modèle SQLAlchemy — table `ayah_pair`.
+    SHARES_ROOT précalculé côté PostgreSQL : une ligne par paire ordonnée
+    de versets partageant au moins une racine (A→B et B→A), pour servir
+    le réseau sans Neo4j. Recalculée à chaque import_postgres.py.
+    """
+
+    __tablename__ = "ayah_pair"
+
+    ayah1_id = Column(Integer,      ForeignKey("ayah.id", ondelete="CASCADE"), nullable=False)
+    ayah2_id = Column(Integer,      ForeignKey("ayah.id", ondelete="CASCADE"), nullable=False)
+    weight   = Column(SmallInteger, nullable=False)   # racines partagées = relations SHARES_ROOT
+    # root.id triés — JSON hors PostgreSQL (base jetable SQLite des benchmarks)
+    root_ids = Column(ARRAY(Integer).with_variant(JSON, "sqlite"), nullable=False)
+
+    __table_args__ = (
+        # Liens entre versets d'une racine (ayah1 IN … AND ayah2 IN … AND weight >= …) : index seul
+        PrimaryKeyConstraint("ayah1_id", "ayah2_id", postgresql_include=["weight"]),
+        # Voisins d'un verset au seuil min_roots, déjà triés par poids, root_ids compris : index seul
+        Index("idx_ayah_pair_neighbors", ayah1_id, weight.desc(), ayah2_id, postgresql_include=["root_ids"]),
+    )
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, PrimaryKeyConstraint
+from app.database import Base
+
+
+class RootAyahCount(Base):
+    """Modèle SQLAlchemy — table `root_ayah_count`.
+    Versets distincts par racine et par période ('all' | 'meccan' | 'medinan'),
+    précalculés par export_snapshot.py. N'existe que dans l'instantané
+    (DATA_SNAPSHOT) : l'analytique y est lue sans agréger word_occurrence.
+    """
+
+    __tablename__ = "root_ayah_count"
+
+    root_id    = Column(Integer,    ForeignKey("root.id"), nullable=False)
+    period     = Column(String(10), nullable=False)
+    ayah_count = Column(Integer,    nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("period", "root_id"),
+        # Classement d'une période : parcours de l'index dans l'ordre, arrêt à `limit`
+        Index("idx_root_ayah_count_rank", period, ayah_count.desc(), root_id),
+    )
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String
+from app.database import Base
+
+
+class SnapshotInfo(Base):
+    """Modèle SQLAlchemy — table `snapshot_info`.
+    Clé → valeur décrivant l'instantané (version, schéma source, date d'export),
+    écrite par export_snapshot.py. N'existe que dans l'instantané (DATA_SNAPSHOT).
+    """
+
+    __tablename__ = "snapshot_info"
+
+    key   = Column(String(50), primary_key=True)
+    value = Column(String(200), nullable=False)
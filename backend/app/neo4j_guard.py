@@ -0,0 +1,165 @@
+import asyncio
+import time
+import uuid
+import anyio
+from fastapi import HTTPException, Request
+from neo4j import Query
+from neo4j.exceptions import DriverError, Neo4jError
+from app.config import settings
+from app.metrics import BufferedResult, NEO4J_ABORTED, NEO4J_SERVER_CPU_SECONDS, NEO4J_WASTED_SECONDS
+
+
+# ─────────────────────────────────────────────
+# DÉLAIS ET ANNULATION DES REQUÊTES NEO4J
+# ─────────────────────────────────────────────
+# Chaque requête HTTP a un budget Neo4j (NEO4J_TIMEOUT_* selon la route) :
+# chaque session.run() devient une transaction dont le timeout est le temps
+# restant — c'est le serveur qui l'interrompt. Budget épuisé → QueryTimeout,
+# que admission.run transforme en réponse dégradée (cache) ou en 504.
+# Client déconnecté → la transaction en cours est terminée côté serveur
+# (TERMINATE TRANSACTIONS, repérée par ses métadonnées) et la route s'arrête
+# avec 499. Le temps Neo4j dépensé pour rien est compté sur /metrics.
+
+_POLL_SECONDS = 0.25
+
+# Gabarit de route → réglage de son budget
+_ROUTE_TIMEOUTS = {
+    "/network/ayah/{surah_number}/{ayah_number}": "NEO4J_TIMEOUT_AYAH_NETWORK",
+    "/network/root/{buckwalter}":                 "NEO4J_TIMEOUT_ROOT_NETWORK",
+    "/analytics/top-roots":                       "NEO4J_TIMEOUT_ANALYTICS",
+    "/analytics/meccan-vs-medinan":               "NEO4J_TIMEOUT_ANALYTICS",
+}
+
+# Transactions d'une requête HTTP (nécessite le droit SHOW/TERMINATE TRANSACTION)
+_SHOW_TRANSACTIONS = """
+    SHOW TRANSACTIONS YIELD transactionId, metaData, cpuTime
+    WHERE metaData.wikiquran_request = $request_id
+    RETURN transactionId, cpuTime
+"""
+_TERMINATE_TRANSACTIONS = "TERMINATE TRANSACTIONS $ids"
+
+
+class QueryTimeout(Exception):
+    """Budget Neo4j de la requête épuisé (transaction interrompue par le serveur)."""
+
+
+def route_timeout(route: str) -> float:
+    return getattr(settings, _ROUTE_TIMEOUTS.get(route, "NEO4J_TIMEOUT_SECONDS"))
+
+
+def _route_of(request: Request) -> str:
+    return getattr(request.scope.get("route"), "path", request.url.path)
+
+
+def _client_gone() -> HTTPException:
+    # 499 : convention nginx « client closed request » — personne ne lira la réponse
+    return HTTPException(status_code=499, detail="Client déconnecté — requête Neo4j annulée")
+
+
+class CancelToken:
+    """Partagé entre la route (threadpool) et la surveillance de déconnexion (boucle asyncio)."""
+
+    def __init__(self, route: str):
+        self.route = route
+        self.request_id = uuid.uuid4().hex
+        self.cancelled = False
+
+
+# ─── Proxy de session ─────────────────────────────────────
+
+class GuardedSession:
+    """
+    Session Neo4j bornée dans le temps et annulable. Chaque run() lit tout le
+    résultat : les erreurs du serveur (timeout, terminaison) surviennent ici
+    et pas plus tard pendant l'itération dans les services.
+    """
+
+    def __init__(self, session, token: CancelToken, timeout: float):
+        self._session = session
+        self.token = token
+        self.deadline = time.monotonic() + timeout
+        self.elapsed = 0.0          # temps Neo4j cumulé de la requête (secondes)
+
+    def run(self, query: str, parameters: dict | None = None, **kwargs) -> BufferedResult:
+        if self.token.cancelled:
+            raise _client_gone()
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            NEO4J_ABORTED.inc(route=self.token.route, reason="timeout")
+            raise QueryTimeout(f"Budget Neo4j épuisé ({self.token.route})")
+
+        started = time.perf_counter()
+        try:
+            eager = self._session.run(
+                Query(query, metadata={"wikiquran_request": self.token.request_id}, timeout=remaining),
+                parameters, **kwargs,
+            ).to_eager_result()
+        except Neo4jError as exc:
+            elapsed = time.perf_counter() - started
+            self.elapsed += elapsed
+            if self.token.cancelled:
+                raise _client_gone() from exc
+            if "TransactionTimedOut" in (exc.code or ""):
+                NEO4J_ABORTED.inc(route=self.token.route, reason="timeout")
+                NEO4J_WASTED_SECONDS.inc(elapsed, route=self.token.route, reason="timeout")
+                raise QueryTimeout(f"Budget Neo4j épuisé ({self.token.route})") from exc
+            raise
+        self.elapsed += time.perf_counter() - started
+        return BufferedResult(eager)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+# ─── Surveillance de la connexion client ──────────────────
+
+def _seconds(duration) -> float:
+    """neo4j.time.Duration → secondes."""
+    return duration.days * 86400 + duration.seconds + duration.nanoseconds / 1e9
+
+
+def terminate_transactions(token: CancelToken):
+    """Termine côté serveur les transactions en cours de la requête (appel bloquant)."""
+    from app.database import open_neo4j_session
+    try:
+        with open_neo4j_session() as session:
+            records = list(session.run(_SHOW_TRANSACTIONS, request_id=token.request_id))
+            if records:
+                ids = [record["transactionId"] for record in records]
+                session.run(_TERMINATE_TRANSACTIONS, ids=ids).consume()
+    except (Neo4jError, DriverError):
+        return  # droits insuffisants ou instance injoignable : le timeout l'arrêtera
+
+    # cpuTime : null sauf si db.track_query_cpu_time est activé sur le serveur
+    cpu = sum(_seconds(record["cpuTime"]) for record in records if record["cpuTime"] is not None)
+    if cpu:
+        NEO4J_SERVER_CPU_SECONDS.inc(cpu, route=token.route)
+
+
+async def _watch(request: Request, token: CancelToken):
+    while not await request.is_disconnected():
+        await asyncio.sleep(_POLL_SECONDS)
+    token.cancelled = True
+    await anyio.to_thread.run_sync(terminate_transactions, token)
+
+
+async def watch_disconnect(request: Request):
+    """
+    Dépendance (scope function) : surveille la connexion pendant l'exécution
+    de la route seulement — une fois la réponse envoyée, le serveur ASGI
+    signale aussi http.disconnect.
+    """
+    token = CancelToken(_route_of(request))
+    watcher = asyncio.create_task(_watch(request, token))
+    try:
+        yield token
+    finally:
+        watcher.cancel()
+
+
+def close_guarded(guarded: GuardedSession):
+    """Comptabilise le temps Neo4j d'une requête abandonnée par le client."""
+    token = guarded.token
+    if token.cancelled:
+        NEO4J_ABORTED.inc(route=token.route, reason="disconnect")
+        NEO4J_WASTED_SECONDS.inc(guarded.elapsed, route=token.route, reason="disconnect")
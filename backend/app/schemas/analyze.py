@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class RootCandidate(BaseModel):
+    """Racine candidate pour un mot de la requête."""
+
+    buckwalter: str
+    arabic:     str
+    count:      int   # occurrences de la forme avec cette racine
+
+
+class LemmaCandidate(BaseModel):
+    """Lemme candidat pour un mot de la requête."""
+
+    buckwalter: str
+    arabic:     str
+    count:      int
+
+
+class TokenAnalysis(BaseModel):
+    """Analyse d'un mot : forme normalisée, méthode de résolution et candidats."""
+
+    token:   str
+    key:     str                 # forme normalisée et repliée
+    method:  str                 # 'root' | 'exact' | 'stem' | 'none'
+    stem:    Optional[str]       # radical retenu si method = 'stem'
+    roots:   list[RootCandidate]
+    lemmas:  list[LemmaCandidate]
+
+
+class AnalyzeResponse(BaseModel):
+    """Réponse de GET /analyze."""
+
+    query:  str
+    tokens: list[TokenAnalysis]
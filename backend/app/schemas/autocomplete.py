@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+
+class SuggestionItem(BaseModel):
+    """Une suggestion d'autocomplétion."""
+
+    kind:       str   # 'root' | 'lemma' | 'form'
+    buckwalter: str   # valeur à passer aux autres endpoints (/root, /concordance...)
+    arabic:     str   # affichage
+    count:      int   # nombre d'occurrences dans le Coran
+
+    model_config = {"from_attributes": True}
+
+
+class AutocompleteResponse(BaseModel):
+    """Réponse de GET /autocomplete — suggestions triées par fréquence décroissante."""
+
+    query:       str
+    suggestions: list[SuggestionItem]
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class ConcordanceLine(BaseModel):
+    """Une ligne KWIC — le mot recherché au centre de sa fenêtre de contexte."""
+
+    surah_number: int
+    ayah_number:  int
+    position:     int              # position du mot dans le verset (1-based)
+    left:         list[str]        # mots précédents (ordre de lecture)
+    keyword:      str              # mot correspondant, à mettre en surbrillance
+    right:        list[str]        # mots suivants
+    form_bw:      str              # forme du mot en Buckwalter
+    lemma_bw:     Optional[str]    # lemme du mot en Buckwalter
+
+
+class ConcordanceResponse(BaseModel):
+    """Réponse complète pour GET /concordance — pagination par curseur."""
+
+    root:        Optional[str]     # racine recherchée (Buckwalter)
+    lemma:       Optional[str]     # ou lemme recherché (Buckwalter)
+    window:      int               # nombre de mots de contexte de chaque côté
+    total:       int               # nombre total d'occurrences
+    cursor:      int               # curseur de cette page
+    next_cursor: Optional[int]     # curseur de la page suivante (None = fin)
+    lines:       list[ConcordanceLine]
@@ -75,6 +75,7 @@ class RootNetworkMeta(BaseModel):
     limit:       int           # Limite de liens appliquée
     total_nodes: int           # Nœuds effectivement retournés
     total_links: int           # Liens effectivement retournés
+    partial:     bool = False  # True : liens abandonnés, délai Neo4j dépassé
 
 
 class RootNetworkResponse(BaseModel):
@@ -83,4 +84,46 @@ class RootNetworkResponse(BaseModel):
     root:  RootInfo
     nodes: list[GraphNode]
     links: list[GraphLink]
-    meta:  RootNetworkMeta
\ No newline at end of file
+    meta:  RootNetworkMeta
+
+# ─────────────────────────────────────────────
+# RÉSEAU DE RACINES — Endpoint /network/roots
+# ─────────────────────────────────────────────
+
+class RootGraphNode(BaseModel):
+    """Nœud du graphe de racines — une racine pour react-force-graph."""
+
+    id:         str            # = buckwalter
+    buckwalter: str
+    arabic:     str
+    ayah_count: int            # Nombre de versets contenant la racine
+
+
+class RootGraphLink(BaseModel):
+    """Lien de co-occurrence entre deux racines."""
+
+    source: str                # buckwalter source
+    target: str                # buckwalter cible
+    weight: int                # Nombre de versets contenant les deux racines
+    pmi:    float              # Information mutuelle ponctuelle (log2)
+    npmi:   float              # PMI normalisée dans [-1, 1]
+
+
+class RootGraphMeta(BaseModel):
+    """Métadonnées spécifiques à /network/roots."""
+
+    mode:        str           # "top" (étoile) ou "ego" (étoile + liens entre voisins)
+    score:       str           # Tri des voisins : "weight", "pmi" ou "npmi"
+    min_weight:  int           # Seuil de co-occurrence appliqué
+    limit:       int           # Nombre max de voisins demandé
+    total_nodes: int
+    total_links: int
+
+
+class RootGraphResponse(BaseModel):
+    """Réponse complète pour GET /network/roots/{buckwalter}."""
+
+    center: RootGraphNode
+    nodes:  list[RootGraphNode]
+    links:  list[RootGraphLink]
+    meta:   RootGraphMeta
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class AyahInQuery(BaseModel):
+    """Schema d'un verset dans le contexte d'une requête booléenne sur les racines."""
+
+    surah_number:      int
+    surah_name_arabic: str
+    ayah_number:       int
+    text_arabic:       str
+
+
+class SurahCount(BaseModel):
+    """Nombre de versets correspondants dans une sourate."""
+
+    surah_number: int
+    count:        int
+
+
+class RootQueryResponse(BaseModel):
+    """Réponse complète pour GET /query/roots — résultats paginés en ordre Mushaf."""
+
+    all:          list[str]           # racines requises (ET)
+    any:          list[str]           # au moins une de ces racines (OU)
+    none:         list[str]           # racines exclues (SAUF)
+    surah:        Optional[int]       # filtre sourate appliqué
+    period:       Optional[str]       # filtre période appliqué : 'meccan' | 'medinan'
+    total:        int                 # nombre total de versets correspondants
+    page:         int                 # page courante
+    limit:        int                 # versets par page
+    total_pages:  int                 # nombre total de pages
+    surah_counts: list[SurahCount]    # répartition par sourate (sur tous les résultats)
+    results:      list[AyahInQuery]   # versets de la page courante
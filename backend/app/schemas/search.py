@@ -1,6 +1,17 @@
 from pydantic import BaseModel
 
 
+class MatchSpan(BaseModel):
+    """
+    Plage correspondant au terme dans text_arabic, en indices de caractères
+    [start, end) — diacritiques de la dernière lettre inclus.
+    Texte arabe hors plans astraux : indices identiques en JavaScript (UTF-16).
+    """
+
+    start: int
+    end:   int
+
+
 class AyahInSearch(BaseModel):
     """Schema d'un verset dans le contexte d'une recherche."""
 
@@ -8,6 +19,7 @@ class AyahInSearch(BaseModel):
     surah_name_arabic: str
     ayah_number:       int
     text_arabic:       str
+    matches:           list[MatchSpan] = []   # plages à surligner dans text_arabic
 
     model_config = {"from_attributes": True}
 
@@ -21,3 +33,33 @@ class SearchResponse(BaseModel):
     limit:       int               # résultats par page
     total_pages: int               # nombre total de pages
     results:     list[AyahInSearch]  # versets de la page courante
+
+
+class RankedAyah(AyahInSearch):
+    """Verset d'une recherche classée — score BM25 en plus."""
+
+    score: float
+
+
+class RankedSearchResponse(BaseModel):
+    """Schema de réponse pour une recherche classée (BM25, top-k paginé)."""
+
+    query:       str               # requête telle que saisie
+    match:       str               # 'any' | 'all'
+    total:       int               # nombre total de versets correspondants
+    page:        int
+    limit:       int
+    total_pages: int
+    results:     list[RankedAyah]  # versets de la page, score décroissant
+
+
+class FuzzySearchResponse(BaseModel):
+    """Schema de réponse pour une recherche approchée (similarité de trigrammes)."""
+
+    query:       str
+    threshold:   float             # similarité minimale par mot
+    total:       int
+    page:        int
+    limit:       int
+    total_pages: int
+    results:     list[RankedAyah]  # score = similarité moyenne (0 → 1)
@@ -0,0 +1,103 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.ayah import Ayah
+from app.models.root import Root
+from app.models.root_ayah_count import RootAyahCount
+from app.models.surah import Surah
+from app.models.word import Word
+from app.models.word_occurrence import WordOccurrence
+from app.schemas.analytics import (
+    TopRootsResponse,
+    RootRank,
+    TopRootsMeta,
+    MeccanMedinanResponse,
+    PeriodRoot,
+    MeccanMedinanMeta,
+)
+
+
+# ─────────────────────────────────────────────
+# ANALYTIQUE DEPUIS POSTGRESQL
+# ─────────────────────────────────────────────
+# Mêmes réponses que services/analytics.py, sans Neo4j : source unique si
+# GRAPH_BACKEND=postgres, sinon repli du disjoncteur (admission.py).
+# Instantané (DATA_SNAPSHOT) : comptes précalculés dans root_ayah_count.
+
+
+def _root_ayah_counts(db: Session, limit: int, period: str | None = None):
+    """(buckwalter, arabe, occurrences, versets distincts) triés par versets."""
+    if settings.DATA_SNAPSHOT:
+        return (
+            db.query(Root.buckwalter, Root.arabic, Root.occurrences_count, RootAyahCount.ayah_count)
+            .join(RootAyahCount, RootAyahCount.root_id == Root.id)
+            .filter(RootAyahCount.period == (period or "all"))
+            .order_by(RootAyahCount.ayah_count.desc(), Root.buckwalter)
+            .limit(limit)
+            .all()
+        )
+
+    ayah_count = func.count(func.distinct(WordOccurrence.ayah_id))
+    query = (
+        db.query(Root.buckwalter, Root.arabic, Root.occurrences_count, ayah_count)
+        .join(Word, Word.root_id == Root.id)
+        .join(WordOccurrence, WordOccurrence.word_id == Word.id)
+    )
+    if period:
+        query = (
+            query.join(Ayah, Ayah.id == WordOccurrence.ayah_id)
+            .join(Surah, Surah.id == Ayah.surah_id)
+            .filter(Surah.type == period)
+        )
+    return (
+        query.group_by(Root.id, Root.buckwalter, Root.arabic, Root.occurrences_count)
+        .order_by(ayah_count.desc(), Root.buckwalter)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_top_roots(db: Session, limit: int) -> TopRootsResponse:
+    """Équivalent PostgreSQL de analytics.get_top_roots."""
+    rows = _root_ayah_counts(db, limit)
+    return TopRootsResponse(
+        roots=[
+            RootRank(
+                rank=i + 1,
+                buckwalter=bw,
+                arabic=ar,
+                ayah_count=count,
+                occurrences_count=occurrences,
+            )
+            for i, (bw, ar, occurrences, count) in enumerate(rows)
+        ],
+        meta=TopRootsMeta(limit=limit),
+    )
+
+
+def get_meccan_vs_medinan(db: Session, limit: int) -> MeccanMedinanResponse:
+    """Équivalent PostgreSQL de analytics.get_meccan_vs_medinan."""
+    periods = {
+        period: [
+            PeriodRoot(buckwalter=bw, arabic=ar, ayah_count=count)
+            for bw, ar, _, count in _root_ayah_counts(db, limit, period)
+        ]
+        for period in ("meccan", "medinan")
+    }
+
+    counts = dict(
+        db.query(Surah.type, func.count(Ayah.id))
+        .join(Ayah, Ayah.surah_id == Surah.id)
+        .group_by(Surah.type)
+        .all()
+    )
+
+    return MeccanMedinanResponse(
+        meccan=periods["meccan"],
+        medinan=periods["medinan"],
+        meta=MeccanMedinanMeta(
+            limit=limit,
+            meccan_ayahs=counts.get("meccan", 0),
+            medinan_ayahs=counts.get("medinan", 0),
+        ),
+    )
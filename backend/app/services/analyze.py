@@ -0,0 +1,38 @@
+from app.indexes.registry import Indexes
+from app.schemas.analyze import AnalyzeResponse, TokenAnalysis, RootCandidate, LemmaCandidate
+from app.utils.buckwalter import buckwalter_to_arabic
+
+# Nombre maximal de candidats retournés par mot
+MAX_CANDIDATES = 5
+
+
+def analyze_query(indexes: Indexes, query: str) -> AnalyzeResponse:
+    """
+    Relie chaque mot saisi (forme fléchie) à ses racines et lemmes candidats.
+    Lookup dans la table construite au démarrage, radicaux légers en repli.
+    """
+    corpus = indexes.corpus
+    return AnalyzeResponse(
+        query=query,
+        tokens=[
+            TokenAnalysis(
+                token=analysis.token,
+                key=analysis.key,
+                method=analysis.method,
+                stem=analysis.stem,
+                roots=[
+                    RootCandidate(
+                        buckwalter=corpus.root_bw[root_id],
+                        arabic=corpus.root_arabic[root_id],
+                        count=count,
+                    )
+                    for root_id, count in analysis.roots[:MAX_CANDIDATES]
+                ],
+                lemmas=[
+                    LemmaCandidate(buckwalter=lemma, arabic=buckwalter_to_arabic(lemma), count=count)
+                    for lemma, count in analysis.lemmas[:MAX_CANDIDATES]
+                ],
+            )
+            for analysis in indexes.analyzer.analyze(query)
+        ],
+    )
@@ -0,0 +1,22 @@
+from app.indexes.registry import Indexes
+from app.schemas.autocomplete import AutocompleteResponse, SuggestionItem
+
+
+def autocomplete(
+    indexes: Indexes,
+    query: str,
+    kind: str | None,
+    limit: int,
+) -> AutocompleteResponse:
+    """
+    Suggestions de racines, lemmes et formes commençant par `query`.
+    Servi entièrement depuis l'index de préfixes — aucune requête SQL,
+    assez bon marché pour être appelé à chaque frappe.
+    """
+    return AutocompleteResponse(
+        query=query,
+        suggestions=[
+            SuggestionItem.model_validate(suggestion)
+            for suggestion in indexes.prefixes.complete(query, kind, limit)
+        ],
+    )
@@ -0,0 +1,107 @@
+from sqlalchemy.orm import Session
+from app.models.ayah import Ayah
+from app.indexes.registry import Indexes
+from app.indexes.positions import unpack
+from app.schemas.concordance import ConcordanceResponse, ConcordanceLine
+from app.utils.arabic import split_words
+from app.utils.buckwalter import buckwalter_to_arabic
+
+
+# ─────────────────────────────────────────────
+# UTILITAIRES
+# ─────────────────────────────────────────────
+
+def _ayah_tokens(indexes: Indexes, ordinal: int, text: str | None) -> list[str]:
+    """
+    Mots d'un verset pour l'affichage.
+    Repli sur les formes Buckwalter du corpus si le texte n'est pas aligné
+    (nombre de mots différent du nombre de positions connues).
+    """
+    words = indexes.corpus.ayah_words[ordinal]
+    tokens = split_words(text) if text else []
+    if words and len(tokens) >= words[-1][0]:
+        return tokens
+
+    # Repli : position → forme translittérée, positions manquantes vides
+    last = words[-1][0] if words else 0
+    fallback = [""] * last
+    for position, word_id in words:
+        fallback[position - 1] = buckwalter_to_arabic(indexes.corpus.word_form[word_id])
+    return fallback
+
+
+# ─────────────────────────────────────────────
+# SERVICE PRINCIPAL
+# ─────────────────────────────────────────────
+
+def get_concordance(
+    db: Session,
+    indexes: Indexes,
+    root: str | None,
+    lemma: str | None,
+    window: int,
+    cursor: int,
+    limit: int,
+) -> ConcordanceResponse | None:
+    """
+    Concordance KWIC d'une racine ou d'un lemme, servie depuis l'index positionnel.
+    Seuls les versets de la page sont lus dans PostgreSQL (≤ limit lignes),
+    même pour Alh et ses milliers d'occurrences.
+    Retourne None si la racine ou le lemme n'existe pas.
+    """
+    corpus = indexes.corpus
+    positions = indexes.positions
+
+    # 1. Postings de la racine ou du lemme
+    if root is not None:
+        root_id = corpus.root_by_bw.get(root)
+        if root_id is None:
+            return None
+        postings = positions.root_occurrences(root_id)
+    else:
+        postings = positions.lemma_occurrences(lemma)
+        if postings is None:
+            return None
+
+    # 2. Page courante — découpage direct, coût indépendant de la taille totale
+    total = len(postings)
+    page = [unpack(key) for key in postings[cursor:cursor + limit]]
+    next_cursor = cursor + limit if cursor + limit < total else None
+
+    # 3. Texte des versets de la page uniquement
+    ayah_ids = {corpus.ayah_ids[ordinal] for ordinal, _ in page}
+    texts = {}
+    if ayah_ids:
+        rows = db.query(Ayah.id, Ayah.text_arabic).filter(Ayah.id.in_(ayah_ids))
+        texts = {ayah_id: text for ayah_id, text in rows}
+
+    # 4. Lignes KWIC
+    tokens_cache: dict[int, list[str]] = {}
+    lines = []
+    for ordinal, slot in page:
+        if ordinal not in tokens_cache:
+            tokens_cache[ordinal] = _ayah_tokens(indexes, ordinal, texts.get(corpus.ayah_ids[ordinal]))
+        tokens = tokens_cache[ordinal]
+
+        position, word_id = corpus.ayah_words[ordinal][slot]
+        i = position - 1
+        lines.append(ConcordanceLine(
+            surah_number=corpus.ayah_surah[ordinal],
+            ayah_number=corpus.ayah_number[ordinal],
+            position=position,
+            left=tokens[max(0, i - window):i],
+            keyword=tokens[i],
+            right=tokens[i + 1:i + 1 + window],
+            form_bw=corpus.word_form[word_id],
+            lemma_bw=corpus.word_lemma.get(word_id),
+        ))
+
+    return ConcordanceResponse(
+        root=root,
+        lemma=lemma,
+        window=window,
+        total=total,
+        cursor=cursor,
+        next_cursor=next_cursor,
+        lines=lines,
+    )
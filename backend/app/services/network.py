@@ -1,4 +1,11 @@
+from abc import ABC, abstractmethod
+from typing import Callable
 from neo4j import Session as Neo4jSession
+from sqlalchemy.orm import Session
+from app.circuit import neo4j_breaker
+from app.config import settings
+from app.neo4j_guard import QueryTimeout
+from app.services import analytics
 from app.schemas.network import (
     NetworkResponse,
     GraphCenter,
@@ -418,12 +425,18 @@ def _build_root_response(
         )
 
     # Chercher les liens SHARES_ROOT entre ces versets
-    link_records = list(session.run(
-        _CYPHER_ROOT_LINKS,
-        pg_ids=pg_ids,
-        min_roots=min_roots,
-        limit=limit,
-    ))
+    # Délai dépassé : les nœuds sont déjà là, réponse partielle sans liens
+    try:
+        link_records = list(session.run(
+            _CYPHER_ROOT_LINKS,
+            pg_ids=pg_ids,
+            min_roots=min_roots,
+            limit=limit,
+        ))
+        partial = False
+    except QueryTimeout:
+        link_records = []
+        partial = True
 
     # Construire les liens
     links = []
@@ -454,5 +467,76 @@ def _build_root_response(
             limit=limit,
             total_nodes=len(nodes),
             total_links=len(links),
+            partial=partial,
         ),
-    )
\ No newline at end of file
+    )
+
+
+# ─────────────────────────────────────────────
+# INTERFACE COMMUNE — GRAPH_BACKEND
+# ─────────────────────────────────────────────
+# Les routes réseau et analytique ne voient qu'un GraphBackend :
+#   Neo4jGraph    : relations SHARES_ROOT (ce module, analytics.py)
+#   PostgresGraph : table ayah_pair (network_pg.py, analytics_pg.py)
+# GRAPH_BACKEND=neo4j    → Neo4j, repli PostgreSQL quand le disjoncteur s'ouvre
+# GRAPH_BACKEND=postgres → PostgreSQL seul
+# DATA_SNAPSHOT          → PostgresGraph sur l'instantané SQLite, seul
+
+class GraphBackend(ABC):
+    """Lectures du graphe, mêmes réponses quelle que soit l'implémentation."""
+
+    name: str
+    breaker = None      # disjoncteur protégeant la source (None : aucun)
+
+    @abstractmethod
+    def ayah_network(self, surah_number: int, ayah_number: int,
+                     min_roots: int, limit: int) -> NetworkResponse | None:
+        ...
+
+    @abstractmethod
+    def root_network(self, buckwalter: str, max_nodes: int, min_roots: int,
+                     limit: int, sort: str) -> RootNetworkResponse | None:
+        ...
+
+    @abstractmethod
+    def top_roots(self, limit: int):
+        ...
+
+    @abstractmethod
+    def meccan_vs_medinan(self, limit: int):
+        ...
+
+
+class Neo4jGraph(GraphBackend):
+    """Graphe lu dans Neo4j."""
+
+    name = "neo4j"
+    breaker = neo4j_breaker
+
+    def __init__(self, session: Neo4jSession):
+        self.session = session
+
+    def ayah_network(self, surah_number, ayah_number, min_roots, limit):
+        return get_ayah_network(self.session, surah_number, ayah_number, min_roots, limit)
+
+    def root_network(self, buckwalter, max_nodes, min_roots, limit, sort):
+        return get_root_network(self.session, buckwalter, max_nodes, min_roots, limit, sort)
+
+    def top_roots(self, limit):
+        return analytics.get_top_roots(self.session, limit)
+
+    def meccan_vs_medinan(self, limit):
+        return analytics.get_meccan_vs_medinan(self.session, limit)
+
+
+def graph_backends(session: Neo4jSession | None,
+                   open_db: Callable[[], Session]) -> tuple[GraphBackend, GraphBackend | None]:
+    """
+    (source principale, repli) selon GRAPH_BACKEND / DATA_SNAPSHOT.
+    `open_db` (database.LazyPgSession) n'est appelée que si PostgreSQL est lu :
+    derrière Neo4j, seulement quand la requête bascule sur le repli.
+    """
+    from app.services.network_pg import PostgresGraph
+    if not settings.neo4j_enabled:
+        return PostgresGraph(open_db()), None
+    return Neo4jGraph(session), PostgresGraph(open_db=open_db)
@@ -0,0 +1,232 @@
+from typing import Callable
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.ayah import Ayah
+from app.models.ayah_pair import AyahPair
+from app.models.root import Root
+from app.models.surah import Surah
+from app.models.word import Word
+from app.models.word_occurrence import WordOccurrence
+from app.schemas.network import (
+    NetworkResponse,
+    GraphCenter,
+    GraphNode,
+    GraphLink,
+    NetworkMeta,
+    RootNetworkResponse,
+    RootInfo,
+    RootNetworkMeta,
+)
+from app.services import analytics_pg
+from app.services.network import GraphBackend, _make_node_id
+
+
+# ─────────────────────────────────────────────
+# RÉSEAU SHARES_ROOT DEPUIS POSTGRESQL (table ayah_pair)
+# ─────────────────────────────────────────────
+# Mêmes réponses que services/network.py, sans Neo4j : source unique si
+# GRAPH_BACKEND=postgres, sinon repli du disjoncteur (admission.py) quand
+# Neo4j est indisponible. ayah_pair contient chaque paire dans les deux
+# sens, weight = nombre de relations SHARES_ROOT.
+
+
+def _ayah_refs(db: Session, ayah_ids) -> dict[int, tuple[int, int]]:
+    """ayah.id → (numéro de sourate, numéro de verset)."""
+    rows = (
+        db.query(Ayah.id, Surah.number, Ayah.number)
+        .join(Surah, Surah.id == Ayah.surah_id)
+        .filter(Ayah.id.in_(list(ayah_ids)))
+        .all()
+    )
+    return {ayah_id: (surah, number) for ayah_id, surah, number in rows}
+
+
+def _root_names(db: Session, root_ids) -> dict[int, tuple[str, str]]:
+    """root.id → (buckwalter, arabe)."""
+    rows = db.query(Root.id, Root.buckwalter, Root.arabic).filter(Root.id.in_(list(root_ids))).all()
+    return {root_id: (bw, ar) for root_id, bw, ar in rows}
+
+
+def _link(source: str, target: str, root_ids: list[int], names: dict[int, tuple[str, str]]) -> GraphLink:
+    return GraphLink(
+        source=source,
+        target=target,
+        weight=len(root_ids),
+        roots_bw=[names[r][0] for r in root_ids],
+        roots_ar=[names[r][1] for r in root_ids],
+    )
+
+
+# ─────────────────────────────────────────────
+# SOUS-GRAPHE D'UN VERSET
+# ─────────────────────────────────────────────
+
+def get_ayah_network(
+    db: Session,
+    surah_number: int,
+    ayah_number: int,
+    min_roots: int,
+    limit: int,
+) -> NetworkResponse | None:
+    """Équivalent PostgreSQL de network.get_ayah_network."""
+
+    ayah_id = (
+        db.query(Ayah.id)
+        .join(Surah, Surah.id == Ayah.surah_id)
+        .filter(Surah.number == surah_number, Ayah.number == ayah_number)
+        .scalar()
+    )
+    if ayah_id is None:
+        return None
+
+    # Voisins : plage ayah1_id de la clé primaire
+    pairs = (
+        db.query(AyahPair.ayah2_id, AyahPair.root_ids)
+        .filter(AyahPair.ayah1_id == ayah_id, AyahPair.weight >= min_roots)
+        .order_by(AyahPair.weight.desc(), AyahPair.ayah2_id)
+        .limit(limit)
+        .all()
+    )
+
+    refs = _ayah_refs(db, [ayah2_id for ayah2_id, _ in pairs])
+    names = _root_names(db, {r for _, root_ids in pairs for r in root_ids})
+
+    center_id = _make_node_id(surah_number, ayah_number)
+    nodes = [GraphNode(id=center_id, surah_number=surah_number, ayah_number=ayah_number, group=surah_number)]
+    links = []
+    for ayah2_id, root_ids in pairs:
+        s, v = refs[ayah2_id]
+        target = _make_node_id(s, v)
+        nodes.append(GraphNode(id=target, surah_number=s, ayah_number=v, group=s))
+        links.append(_link(center_id, target, root_ids, names))
+
+    return NetworkResponse(
+        center=GraphCenter(id=center_id, surah_number=surah_number, ayah_number=ayah_number),
+        nodes=nodes,
+        links=links,
+        meta=NetworkMeta(min_roots=min_roots, limit=limit, total_links=len(links)),
+    )
+
+
+# ─────────────────────────────────────────────
+# SOUS-GRAPHE D'UNE RACINE
+# ─────────────────────────────────────────────
+
+def get_root_network(
+    db: Session,
+    buckwalter: str,
+    max_nodes: int,
+    min_roots: int,
+    limit: int,
+    sort: str,
+) -> RootNetworkResponse | None:
+    """Équivalent PostgreSQL de network.get_root_network (tri mushaf ou connected)."""
+
+    root = db.query(Root).filter(Root.buckwalter == buckwalter).first()
+    if not root:
+        return None
+
+    # Versets de la racine, ordre Mushaf : (ayah.id, sourate, verset)
+    ayahs = (
+        db.query(Ayah.id, Surah.number, Ayah.number)
+        .join(Surah, Surah.id == Ayah.surah_id)
+        .join(WordOccurrence, WordOccurrence.ayah_id == Ayah.id)
+        .join(Word, Word.id == WordOccurrence.word_id)
+        .filter(Word.root_id == root.id)
+        .distinct()
+        .order_by(Surah.number, Ayah.number)
+        .all()
+    )
+    root_info = RootInfo(
+        buckwalter=root.buckwalter,
+        arabic=root.arabic,
+        occurrences_count=root.occurrences_count,
+        total_ayahs=len(ayahs),
+    )
+
+    if sort == "connected":
+        # Connectivité = relations SHARES_ROOT vers les autres versets de la racine
+        all_ids = [ayah_id for ayah_id, _, _ in ayahs]
+        refs = {ayah_id: (s, v) for ayah_id, s, v in ayahs}
+        connectivity = func.sum(AyahPair.weight)
+        scored = (
+            db.query(AyahPair.ayah1_id, connectivity)
+            .filter(AyahPair.ayah1_id.in_(all_ids), AyahPair.ayah2_id.in_(all_ids))
+            .group_by(AyahPair.ayah1_id)
+            .order_by(connectivity.desc(), AyahPair.ayah1_id)
+            .limit(max_nodes)
+            .all()
+        )
+        selected = [(ayah_id, *refs[ayah_id]) for ayah_id, _ in scored]
+    else:
+        selected = ayahs[:max_nodes]
+
+    nodes = [GraphNode(id=_make_node_id(s, v), surah_number=s, ayah_number=v, group=s) for _, s, v in selected]
+    links = []
+    if len(selected) >= 2:
+        ids = [ayah_id for ayah_id, _, _ in selected]
+        refs = {ayah_id: (s, v) for ayah_id, s, v in selected}
+        pairs = (
+            db.query(AyahPair.ayah1_id, AyahPair.ayah2_id, AyahPair.root_ids)
+            .filter(
+                AyahPair.ayah1_id.in_(ids),
+                AyahPair.ayah2_id.in_(ids),
+                AyahPair.ayah1_id < AyahPair.ayah2_id,
+                AyahPair.weight >= min_roots,
+            )
+            .order_by(AyahPair.weight.desc(), AyahPair.ayah1_id, AyahPair.ayah2_id)
+            .limit(limit)
+            .all()
+        )
+        names = _root_names(db, {r for _, _, root_ids in pairs for r in root_ids})
+        links = [
+            _link(_make_node_id(*refs[a1]), _make_node_id(*refs[a2]), root_ids, names)
+            for a1, a2, root_ids in pairs
+        ]
+
+    return RootNetworkResponse(
+        root=root_info,
+        nodes=nodes,
+        links=links,
+        meta=RootNetworkMeta(
+            sort=sort,
+            max_nodes=max_nodes,
+            min_roots=min_roots,
+            limit=limit,
+            total_nodes=len(nodes),
+            total_links=len(links),
+        ),
+    )
+
+
+# ─────────────────────────────────────────────
+# IMPLÉMENTATION DE GraphBackend
+# ─────────────────────────────────────────────
+
+class PostgresGraph(GraphBackend):
+    """Graphe lu dans PostgreSQL (table ayah_pair)."""
+
+    name = "postgres"
+
+    def __init__(self, db: Session | None = None, open_db: Callable[[], Session] | None = None):
+        """`db` : session ouverte ; sinon `open_db` l'ouvre à la première lecture (repli)."""
+        self._db = db
+        self._open_db = open_db
+
+    @property
+    def db(self) -> Session:
+        if self._db is None:
+            self._db = self._open_db()
+        return self._db
+
+    def ayah_network(self, surah_number, ayah_number, min_roots, limit):
+        return get_ayah_network(self.db, surah_number, ayah_number, min_roots, limit)
+
+    def root_network(self, buckwalter, max_nodes, min_roots, limit, sort):
+        return get_root_network(self.db, buckwalter, max_nodes, min_roots, limit, sort)
+
+    def top_roots(self, limit):
+        return analytics_pg.get_top_roots(self.db, limit)
+
+    def meccan_vs_medinan(self, limit):
+        return analytics_pg.get_meccan_vs_medinan(self.db, limit)
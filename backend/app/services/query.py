@@ -0,0 +1,110 @@
+from math import ceil
+from sqlalchemy.orm import Session
+from app.models.ayah import Ayah
+from app.indexes.registry import Indexes
+from app.schemas.query import RootQueryResponse, AyahInQuery, SurahCount
+
+
+class UnknownRootError(Exception):
+    """Racine Buckwalter absente du corpus — la route renverra 404."""
+
+    def __init__(self, buckwalter: str):
+        super().__init__(buckwalter)
+        self.buckwalter = buckwalter
+
+
+# ─────────────────────────────────────────────
+# UTILITAIRES
+# ─────────────────────────────────────────────
+
+def _root_bitsets(indexes: Indexes, roots_bw: list[str]) -> list[int]:
+    """Résout une liste de racines Buckwalter en bitsets — lève UnknownRootError."""
+    bitsets = []
+    for bw in roots_bw:
+        root_id = indexes.corpus.root_by_bw.get(bw)
+        if root_id is None:
+            raise UnknownRootError(bw)
+        bitsets.append(indexes.root_bitsets.root(root_id))
+    return bitsets
+
+
+# ─────────────────────────────────────────────
+# SERVICE PRINCIPAL
+# ─────────────────────────────────────────────
+
+def query_roots(
+    db: Session,
+    indexes: Indexes,
+    roots_all: list[str],
+    roots_any: list[str],
+    roots_none: list[str],
+    surah: int | None,
+    period: str | None,
+    page: int = 1,
+    limit: int = 20,
+) -> RootQueryResponse:
+    """
+    Évalue (ET roots_all) ∧ (OU roots_any) ∧ ¬(OU roots_none) sur les bitsets
+    en mémoire, puis ne lit dans PostgreSQL que le texte de la page demandée.
+    Au moins une des listes roots_all / roots_any doit être non vide (vérifié par la route).
+    """
+    bitsets = indexes.root_bitsets
+    corpus = indexes.corpus
+
+    # 1. Opérations booléennes — quelques microsecondes sur 6 236 bits
+    result = bitsets.universe
+    for bits in _root_bitsets(indexes, roots_all):
+        result &= bits
+
+    if roots_any:
+        union = 0
+        for bits in _root_bitsets(indexes, roots_any):
+            union |= bits
+        result &= union
+
+    for bits in _root_bitsets(indexes, roots_none):
+        result &= ~bits
+
+    # 2. Filtres sourate / période
+    if surah is not None:
+        result &= bitsets.by_surah.get(surah, 0)
+    if period is not None:
+        result &= bitsets.by_period.get(period, 0)
+
+    # 3. Pagination en ordre Mushaf
+    total = result.bit_count()
+    total_pages = ceil(total / limit) if total > 0 else 1
+    ordinals = bitsets.page(result, (page - 1) * limit, limit)
+
+    # 4. Texte des seuls versets de la page — une requête IN
+    ayah_ids = [corpus.ayah_ids[o] for o in ordinals]
+    texts = {}
+    if ayah_ids:
+        rows = db.query(Ayah.id, Ayah.text_arabic).filter(Ayah.id.in_(ayah_ids))
+        texts = {ayah_id: text for ayah_id, text in rows}
+
+    # 5. Assembler la réponse
+    return RootQueryResponse(
+        all=roots_all,
+        any=roots_any,
+        none=roots_none,
+        surah=surah,
+        period=period,
+        total=total,
+        page=page,
+        limit=limit,
+        total_pages=total_pages,
+        surah_counts=[
+            SurahCount(surah_number=s, count=c)
+            for s, c in bitsets.surah_counts(result)
+        ],
+        results=[
+            AyahInQuery(
+                surah_number=corpus.ayah_surah[o],
+                surah_name_arabic=corpus.surah_names[corpus.ayah_surah[o]],
+                ayah_number=corpus.ayah_number[o],
+                text_arabic=texts.get(corpus.ayah_ids[o], ""),
+            )
+            for o in ordinals
+        ],
+    )
@@ -0,0 +1,114 @@
+import heapq
+from app.indexes.registry import Indexes
+from app.schemas.network import (
+    RootGraphResponse,
+    RootGraphNode,
+    RootGraphLink,
+    RootGraphMeta,
+)
+
+
+# ─────────────────────────────────────────────
+# UTILITAIRES
+# ─────────────────────────────────────────────
+
+def _make_root_node(indexes: Indexes, root_id: int) -> RootGraphNode:
+    corpus = indexes.corpus
+    bw = corpus.root_bw[root_id]
+    return RootGraphNode(
+        id=bw,
+        buckwalter=bw,
+        arabic=corpus.root_arabic[root_id],
+        ayah_count=indexes.root_bitsets.ayah_count_for(root_id),
+    )
+
+
+def _make_root_link(indexes: Indexes, r1: int, r2: int, weight: int) -> RootGraphLink:
+    cooc = indexes.root_cooccurrence
+    return RootGraphLink(
+        source=indexes.corpus.root_bw[r1],
+        target=indexes.corpus.root_bw[r2],
+        weight=weight,
+        pmi=round(cooc.pmi(r1, r2, weight), 4),
+        npmi=round(cooc.npmi(r1, r2, weight), 4),
+    )
+
+
+def _top_neighbors(
+    indexes: Indexes,
+    root_id: int,
+    score: str,
+    min_weight: int,
+    limit: int,
+) -> list[tuple[int, int]]:
+    """Les `limit` meilleurs voisins selon le score — (root_id, poids)."""
+    cooc = indexes.root_cooccurrence
+    candidates = cooc.neighbors(root_id, min_weight)
+
+    # Listes déjà triées par poids : pas besoin de tas
+    if score == "weight":
+        return [pair for _, pair in zip(range(limit), candidates)]
+
+    scorer = cooc.pmi if score == "pmi" else cooc.npmi
+    return heapq.nlargest(
+        limit,
+        candidates,
+        key=lambda pair: scorer(root_id, pair[0], pair[1]),
+    )
+
+
+# ─────────────────────────────────────────────
+# SERVICE PRINCIPAL
+# ─────────────────────────────────────────────
+
+def get_root_cooccurrence(
+    indexes: Indexes,
+    buckwalter: str,
+    mode: str,
+    score: str,
+    min_weight: int,
+    limit: int,
+) -> RootGraphResponse | None:
+    """
+    Réseau de co-occurrence autour d'une racine, servi depuis la matrice en mémoire.
+    Retourne None si la racine n'existe pas.
+
+    Modes disponibles :
+    - "top" : la racine et ses meilleurs voisins (étoile)
+    - "ego" : idem + les liens entre voisins (poids ≥ min_weight)
+    """
+    root_id = indexes.corpus.root_by_bw.get(buckwalter)
+    if root_id is None:
+        return None
+
+    cooc = indexes.root_cooccurrence
+    neighbors = _top_neighbors(indexes, root_id, score, min_weight, limit)
+
+    # 1. Nœuds : centre + voisins
+    center = _make_root_node(indexes, root_id)
+    nodes = [center] + [_make_root_node(indexes, other) for other, _ in neighbors]
+
+    # 2. Liens centre → voisins
+    links = [_make_root_link(indexes, root_id, other, weight) for other, weight in neighbors]
+
+    # 3. Mode ego : liens entre voisins, en ne parcourant que leurs listes d'adjacence
+    if mode == "ego":
+        selected = {other for other, _ in neighbors}
+        for other, _ in neighbors:
+            for third, weight in cooc.neighbors(other, min_weight):
+                if third in selected and other < third:
+                    links.append(_make_root_link(indexes, other, third, weight))
+
+    return RootGraphResponse(
+        center=center,
+        nodes=nodes,
+        links=links,
+        meta=RootGraphMeta(
+            mode=mode,
+            score=score,
+            min_weight=min_weight,
+            limit=limit,
+            total_nodes=len(nodes),
+            total_links=len(links),
+        ),
+    )
@@ -1,61 +1,11 @@
-import re
 from math import ceil
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 from app.models.ayah import Ayah
 from app.models.surah import Surah
-from app.schemas.search import SearchResponse, AyahInSearch
-
-
-# ─── Normalisation arabes ───────────────────────────────────────────────────
-
-# Plage complète des diacritiques + signes coraniques Uthmani — pour Python re.sub
-DIACRITICS_PATTERN_PY = (
-    "[\u0610-\u061A"   # Arabic extended (signes coraniques)
-    "\u064B-\u065F"    # Tashkeel standard (fatha, damma, kasra...)
-    "\u0670"           # Superscript alef (ٰ)
-    "\u06D6-\u06DC"    # Signes coraniques supérieurs
-    "\u06DF-\u06ED]"   # Autres signes Uthmani
-)
-
-# Même plage pour PostgreSQL regexp_replace — raw string
-DIACRITICS_PATTERN_PG = (
-    r"[\u0610-\u061A"
-    r"\u064B-\u065F"
-    r"\u0670"
-    r"\u06D6-\u06DC"
-    r"\u06DF-\u06ED]"
-)
-
-# Variantes d'Alef dans le texte Uthmani → Alef simple ا
-ALEF_MAP = {
-    "\u0671": "\u0627",  # ٱ Alef Wasla  → ا (très fréquent en Uthmani)
-    "\u0622": "\u0627",  # آ Alef Madda  → ا
-    "\u0623": "\u0627",  # أ Alef Hamza dessus → ا
-    "\u0625": "\u0627",  # إ Alef Hamza dessous → ا
-}
-
-
-def _normalize_py(text: str) -> str:
-    """
-    Normalise un texte arabe côté Python :
-    1. Supprime tous les diacritiques et signes coraniques Uthmani
-    2. Normalise les variantes d'Alef vers Alef simple ا
-    """
-    text = re.sub(DIACRITICS_PATTERN_PY, "", text)
-    for variante, alef_simple in ALEF_MAP.items():
-        text = text.replace(variante, alef_simple)
-    return text
-
-
-def _normalize_pg(column):
-    """
-    Normalise une colonne arabe côté PostgreSQL :
-    1. Supprime les diacritiques via regexp_replace
-    2. Normalise les variantes d'Alef via translate()
-    """
-    stripped = func.regexp_replace(column, DIACRITICS_PATTERN_PG, "", "g")
-    return func.translate(stripped, "\u0671\u0622\u0623\u0625", "\u0627\u0627\u0627\u0627")
+from app.indexes.registry import Indexes
+from app.indexes.search_engine import parse_query
+from app.schemas.search import SearchResponse, AyahInSearch, MatchSpan, RankedAyah, RankedSearchResponse, FuzzySearchResponse
+from app.utils.arabic import normalize, decode_offsets, find_spans, word_spans
 
 
 # ─── Service ────────────────────────────────────────────────────────────────
@@ -68,19 +18,20 @@ def search_ayahs(
 ) -> SearchResponse:
     """
     Recherche des versets contenant le terme arabe donné.
-    - Diacritiques ignorés des deux côtés (Python + PostgreSQL)
-    - Variantes d'Alef normalisées (Alef Wasla, Madda, Hamza...)
-    - Utilise l'index trigramme GIN pour la performance
+    - Diacritiques ignorés, variantes d'Alef normalisées (Alef Wasla, Madda, Hamza...)
+    - Compare à la colonne text_normalized calculée à l'import (index trigramme GIN)
+    - Surbrillance : plages converties en offsets du texte original
+      via la table offset_map — aucune expression régulière à la requête
     """
-    # Normalisation du terme côté Python
-    query_normalized = _normalize_py(query)
+    # Normalisation du terme — mêmes règles que l'import
+    query_normalized = normalize(query)
     terme = f"%{query_normalized}%"
 
     # Requête de base — jointure Ayah → Surah
     base_query = (
         db.query(Ayah)
         .join(Surah, Surah.id == Ayah.surah_id)
-        .filter(_normalize_pg(Ayah.text_arabic).like(terme))
+        .filter(Ayah.text_normalized.like(terme))
         .order_by(Ayah.id)
     )
 
@@ -88,9 +39,10 @@ def search_ayahs(
     total = base_query.count()
     total_pages = ceil(total / limit) if total > 0 else 1
 
-    # Récupérer la page courante
+    # Récupérer la page courante (avec les colonnes différées)
     ayahs = (
         base_query
+        .options(undefer(Ayah.text_normalized), undefer(Ayah.offset_map))
         .offset((page - 1) * limit)
         .limit(limit)
         .all()
@@ -109,7 +61,125 @@ def search_ayahs(
                 surah_name_arabic=ayah.surah.name_arabic,
                 ayah_number=ayah.number,
                 text_arabic=ayah.text_arabic,
+                matches=[
+                    MatchSpan(start=start, end=end)
+                    for start, end in find_spans(
+                        ayah.text_normalized,
+                        decode_offsets(ayah.offset_map),
+                        query_normalized,
+                    )
+                ],
             )
             for ayah in ayahs
         ],
-    )
\ No newline at end of file
+    )
+
+
+# ─── Recherche classée ──────────────────────────────────────────────────────
+
+def _word_matches(ayah: Ayah, positions: list[int]) -> list[MatchSpan]:
+    """Positions de mots → plages du texte original, via text_normalized + offset_map."""
+    spans = word_spans(ayah.text_normalized or "")
+    offsets = decode_offsets(ayah.offset_map) if ayah.offset_map else None
+    if offsets is None:
+        return []
+    return [
+        MatchSpan(start=offsets[spans[p][0]], end=offsets[spans[p][1]])
+        for p in positions
+        if p < len(spans)
+    ]
+
+
+def _ranked_results(
+    db: Session,
+    indexes: Indexes,
+    top: list[tuple[int, float, list[int]]],
+) -> list[RankedAyah]:
+    """(ordinal, score, positions) de la page → versets, seuls ceux-ci lus dans PostgreSQL."""
+    corpus = indexes.corpus
+
+    # Texte des versets de la page uniquement
+    ayah_ids = [corpus.ayah_ids[ordinal] for ordinal, _, _ in top]
+    rows = {}
+    if ayah_ids:
+        rows = {
+            ayah.id: ayah
+            for ayah in (
+                db.query(Ayah)
+                .options(undefer(Ayah.text_normalized), undefer(Ayah.offset_map))
+                .filter(Ayah.id.in_(ayah_ids))
+            )
+        }
+
+    results = []
+    for ordinal, score, positions in top:
+        ayah = rows.get(corpus.ayah_ids[ordinal])
+        if ayah is None:
+            continue
+        results.append(RankedAyah(
+            surah_number=corpus.ayah_surah[ordinal],
+            surah_name_arabic=corpus.surah_names[corpus.ayah_surah[ordinal]],
+            ayah_number=corpus.ayah_number[ordinal],
+            text_arabic=ayah.text_arabic,
+            score=round(score, 4),
+            matches=_word_matches(ayah, positions),
+        ))
+    return results
+
+
+def search_ranked(
+    db: Session,
+    indexes: Indexes,
+    query: str,
+    match: str = "any",
+    page: int = 1,
+    limit: int = 20,
+) -> RankedSearchResponse:
+    """
+    Recherche multi-termes classée par BM25, servie depuis l'index inversé en mémoire.
+    - Mots séparés par des espaces, phrases entre guillemets, root:ktb / lemma:kita`b
+    - match='all' : toutes les clauses requises, 'any' : au moins une
+    - Seuls les versets de la page sont lus dans PostgreSQL
+    """
+    clauses = parse_query(query)
+
+    # Top-k jusqu'à la fin de la page demandée — le tas reste petit
+    total, top = indexes.search_engine.search(clauses, page * limit, match_all=(match == "all"))
+    total_pages = ceil(total / limit) if total > 0 else 1
+
+    return RankedSearchResponse(
+        query=query,
+        match=match,
+        total=total,
+        page=page,
+        limit=limit,
+        total_pages=total_pages,
+        results=_ranked_results(db, indexes, top[(page - 1) * limit:]),
+    )
+
+
+def search_fuzzy(
+    db: Session,
+    indexes: Indexes,
+    query: str,
+    threshold: float,
+    page: int = 1,
+    limit: int = 20,
+) -> FuzzySearchResponse:
+    """
+    Recherche tolérante aux variantes (ى/ي, ة/ه, sièges de hamza) et aux fautes de frappe.
+    - Repliement étendu FOLD_MAP puis similarité de trigrammes mot à mot
+    - Candidats élagués via les postings trigramme → vocabulaire
+    """
+    total, top = indexes.fuzzy.search(query, page * limit, threshold)
+    total_pages = ceil(total / limit) if total > 0 else 1
+
+    return FuzzySearchResponse(
+        query=query,
+        threshold=threshold,
+        total=total,
+        page=page,
+        limit=limit,
+        total_pages=total_pages,
+        results=_ranked_results(db, indexes, top[(page - 1) * limit:]),
+    )
@@ -0,0 +1,170 @@
+"""
+WikiQuran — utils/arabic.py
+Normalisation et découpage du texte arabe Uthmani.
+Copie identique dans scripts/utils/ (import) et backend/app/utils/ (API) :
+les deux côtés doivent normaliser exactement de la même façon.
+"""
+
+import sys
+from array import array
+
+# ============================================================
+# Normalisation
+# ============================================================
+
+# Plages des diacritiques + signes coraniques Uthmani (bornes incluses)
+DIACRITIC_RANGES = (
+    ("\u0610", "\u061A"),   # Arabic extended (signes coraniques)
+    ("\u064B", "\u065F"),   # Tashkeel standard (fatha, damma, kasra...)
+    ("\u0670", "\u0670"),   # Superscript alef (ٰ)
+    ("\u06D6", "\u06DC"),   # Signes coraniques supérieurs
+    ("\u06DF", "\u06ED"),   # Autres signes Uthmani
+)
+
+# Variantes d'Alef dans le texte Uthmani → Alef simple ا
+ALEF_MAP = {
+    "\u0671": "\u0627",  # ٱ Alef Wasla  → ا (très fréquent en Uthmani)
+    "\u0622": "\u0627",  # آ Alef Madda  → ا
+    "\u0623": "\u0627",  # أ Alef Hamza dessus → ا
+    "\u0625": "\u0627",  # إ Alef Hamza dessous → ا
+}
+
+
+# Repliement étendu (recherche approchée) — appliqué APRÈS normalize().
+# Table modifiable : les variantes d'orthographe courantes dans les requêtes
+# deviennent une seule forme. Une valeur vide supprime le caractère.
+FOLD_MAP = {
+    "\u0649": "\u064A",  # ى Alef Maqsura → ي
+    "\u0629": "\u0647",  # ة Ta Marbuta  → ه
+    "\u0624": "\u0648",  # ؤ Waw Hamza   → و
+    "\u0626": "\u064A",  # ئ Ya Hamza    → ي
+    "\u0621": "",         # ء Hamza isolée → supprimée (ءادم ~ ادم)
+    "\u0640": "",         # ـ Tatweel      → supprimé
+    "\u06CC": "\u064A",  # ی Ya persan    → ي
+    "\u06A9": "\u0643",  # ک Kaf persan   → ك
+}
+
+
+def is_diacritic(char: str) -> bool:
+    """Vrai si le caractère est un diacritique ou un signe coranique."""
+    return any(lo <= char <= hi for lo, hi in DIACRITIC_RANGES)
+
+
+def normalize(text: str) -> str:
+    """
+    Normalise un texte arabe :
+    1. Supprime tous les diacritiques et signes coraniques Uthmani
+    2. Normalise les variantes d'Alef vers Alef simple ا
+    """
+    return "".join(ALEF_MAP.get(c, c) for c in text if not is_diacritic(c))
+
+
+def fold(text: str, table: dict[str, str] = FOLD_MAP) -> str:
+    """
+    Repliement étendu d'un texte déjà normalisé (ى/ي, ة/ه, sièges de hamza...).
+    Réservé à la recherche approchée : text_normalized n'est pas replié.
+
+    Exemple :
+        fold('مؤمنة')  → 'مومنه'
+    """
+    return "".join(table.get(c, c) for c in text)
+
+
+def normalize_with_offsets(text: str) -> tuple[str, array]:
+    """
+    Normalise un texte et construit sa table d'offsets :
+    offsets[i] = indice dans le texte original du i-ème caractère normalisé.
+    Une sentinelle offsets[len(normalized)] = len(text) termine la table,
+    pour qu'une fin de correspondance se convertisse sans cas particulier.
+
+    Exemple :
+        normalize_with_offsets('بِسْمِ')  → ('بسم', array('H', [0, 2, 4, 6]))
+    """
+    chars = []
+    offsets = array("H")
+    for i, c in enumerate(text):
+        if is_diacritic(c):
+            continue
+        chars.append(ALEF_MAP.get(c, c))
+        offsets.append(i)
+    offsets.append(len(text))
+    return "".join(chars), offsets
+
+
+def encode_offsets(offsets: array) -> bytes:
+    """Table d'offsets → octets (uint16 little-endian) pour la colonne ayah.offset_map."""
+    if sys.byteorder == "big":
+        offsets = array("H", offsets)
+        offsets.byteswap()
+    return offsets.tobytes()
+
+
+def decode_offsets(data: bytes) -> array:
+    """Octets de la colonne ayah.offset_map → table d'offsets."""
+    offsets = array("H")
+    offsets.frombytes(data)
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    return offsets
+
+
+def find_spans(normalized: str, offsets: array, query: str) -> list[tuple[int, int]]:
+    """
+    Positions de `query` (déjà normalisé) dans le texte normalisé,
+    converties en plages [début, fin) du texte original.
+    La fin inclut les diacritiques portés par la dernière lettre.
+    """
+    spans = []
+    if not query:
+        return spans
+    start = normalized.find(query)
+    while start != -1:
+        end = start + len(query)
+        spans.append((offsets[start], offsets[end]))
+        start = normalized.find(query, end)
+    return spans
+
+
+# ============================================================
+# Découpage en mots
+# ============================================================
+
+# Lettres arabes (hamza → ya, puis alef wasla → lettres étendues)
+_LETTER_RANGES = (
+    ("\u0621", "\u064A"),
+    ("\u0671", "\u06D3"),
+)
+
+
+def _has_letter(token: str) -> bool:
+    """Vrai si le token contient au moins une lettre arabe."""
+    return any(lo <= c <= hi for c in token for lo, hi in _LETTER_RANGES)
+
+
+def word_spans(text: str) -> list[tuple[int, int]]:
+    """
+    Plages [début, fin) des mots d'un texte, mêmes règles que split_words.
+    Sert à relier une position de mot à des offsets de caractères.
+    """
+    spans = []
+    start = None
+    for i, c in enumerate(text + " "):
+        if c.isspace():
+            if start is not None and _has_letter(text[start:i]):
+                spans.append((start, i))
+            start = None
+        elif start is None:
+            start = i
+    return spans
+
+
+def split_words(text: str) -> list[str]:
+    """
+    Découpe un verset en mots, alignés sur la numérotation du Corpus Quran.
+    Les signes de pause (ۚ ۖ ۛ...) et le signe ۞, séparés par des espaces
+    dans le texte Tanzil, ne comptent pas comme des mots.
+
+    Exemple :
+        split_words('لَا رَيْبَ ۛ فِيهِ')  → ['لَا', 'رَيْبَ', 'فِيهِ']
+    """
+    return [token for token in text.split() if _has_letter(token)]
@@ -40,6 +40,9 @@ CREATE TABLE ayah (
     surah_id            INTEGER         NOT NULL REFERENCES surah(id) ON DELETE CASCADE,
     number              SMALLINT        NOT NULL,                 -- Numéro du verset dans la sourate
     text_arabic         TEXT            NOT NULL,                 -- Texte arabe complet (Uthmani)
+    text_normalized     TEXT,                                     -- Sans diacritiques, Alef unifié (calculé à l'import)
+    offset_map          BYTEA,                                    -- uint16[] : indice normalisé → indice original
+    content_hash        CHAR(32),                                 -- md5 du contenu projeté dans Neo4j (sync delta)
     -- Index composite unique : on ne peut pas avoir deux versets 2:255
     UNIQUE (surah_id, number),
 
@@ -56,6 +59,7 @@ CREATE TABLE root (
     buckwalter          VARCHAR(10)     NOT NULL UNIQUE,          -- ex: smw  (clé technique)
     arabic              VARCHAR(20)     NOT NULL,                 -- ex: سمو  (affichage)
     occurrences_count   INTEGER         DEFAULT 0,               -- Calculé à l'import
+    content_hash        CHAR(32),                                 -- md5 du contenu projeté dans Neo4j (sync delta)
 
     created_at          TIMESTAMP       DEFAULT NOW()
 );
@@ -72,6 +76,7 @@ CREATE TABLE word (
     root_id             INTEGER         REFERENCES root(id),      -- Nullable : certains mots sans racine
     lemma_buckwalter    VARCHAR(50),                              -- Forme de base (Buckwalter)
     pos                 VARCHAR(10),                              -- Partie du discours (N, V, P, ADJ...)
+    content_hash        CHAR(32),                                 -- md5 du contenu projeté dans Neo4j (sync delta)
 
     created_at          TIMESTAMP       DEFAULT NOW()
 );
@@ -95,6 +100,43 @@ CREATE TABLE word_occurrence (
 );
 
 
+-- ============================================================
+-- TABLE : ayah_pair
+-- SHARES_ROOT précalculé (même règle que import_neo4j.py) : sert le réseau
+-- sans Neo4j — repli du disjoncteur de l'API quand Neo4j est indisponible.
+-- Une ligne par paire ORDONNÉE (A→B et B→A) : voisins d'un verset = une plage de la clé primaire
+-- Recalculée entièrement par import_postgres.py, insérée dans l'ordre de la clé :
+-- les lignes d'un même verset sont contiguës sur disque (cf. CLUSTER ON ci-dessous)
+-- GRAPH_BACKEND=postgres : seule source du réseau (Neo4j facultatif)
+-- ============================================================
+CREATE TABLE ayah_pair (
+    ayah1_id            INTEGER         NOT NULL REFERENCES ayah(id) ON DELETE CASCADE,
+    ayah2_id            INTEGER         NOT NULL REFERENCES ayah(id) ON DELETE CASCADE,
+    weight              SMALLINT        NOT NULL,                 -- Racines partagées (= relations SHARES_ROOT)
+    root_ids            INTEGER[]       NOT NULL,                 -- root.id triés
+
+    PRIMARY KEY (ayah1_id, ayah2_id) INCLUDE (weight),       -- Liens/connectivité d'un groupe : index seul
+    CHECK (ayah1_id <> ayah2_id)
+);
+
+
+-- ============================================================
+-- TABLE : public.dataset_pointer
+-- Bascule bleu/vert : jeu de données lu par l'API (une seule ligne).
+-- Les imports chargent un nouveau schéma pendant que l'API sert l'ancien,
+-- scripts/database/switch_dataset.py met à jour cette ligne en une transaction.
+-- Toujours dans public (IF NOT EXISTS : ce fichier sert aussi à créer les schémas versionnés)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS public.dataset_pointer (
+    singleton           BOOLEAN         PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+    pg_schema           VARCHAR(63)     NOT NULL,                 -- Schéma PostgreSQL du jeu actif
+    neo4j_uri           VARCHAR(200),                             -- NULL = NEO4J_URI de l'API
+    neo4j_database      VARCHAR(63),                              -- NULL = base par défaut
+    version             VARCHAR(100)    NOT NULL,                 -- X-Dataset-Version / ETag
+    switched_at         TIMESTAMP       DEFAULT NOW()
+);
+
+
 -- ============================================================
 -- INDEX — Performance des requêtes analytiques
 -- ============================================================
@@ -114,12 +156,20 @@ CREATE INDEX idx_word_root_id          ON word(root_id);
 -- Full-text search sur le texte arabe
 CREATE INDEX idx_ayah_text_trgm        ON ayah USING GIN (text_arabic gin_trgm_ops);
 
+-- Recherche sur le texte normalisé (LIKE '%terme%' sans regexp_replace)
+CREATE INDEX idx_ayah_text_norm_trgm   ON ayah USING GIN (text_normalized gin_trgm_ops);
+
 -- Recherche par type de sourate (meccan/medinan)
 CREATE INDEX idx_surah_type            ON surah(type);
 
 -- Recherche par ordre de révélation
 CREATE INDEX idx_surah_revelation      ON surah(revelation_order);
 
+-- Voisins d'un verset au seuil min_roots, triés par poids (réseau PostgreSQL),
+-- root_ids inclus : les N premiers voisins sont lus dans l'index seul
+CREATE INDEX idx_ayah_pair_neighbors   ON ayah_pair(ayah1_id, weight DESC, ayah2_id) INCLUDE (root_ids);
+ALTER TABLE ayah_pair CLUSTER ON ayah_pair_pkey;
+
 
 -- ============================================================
 -- VUE ANALYTIQUE — Fréquence des racines par type de sourate
@@ -0,0 +1,77 @@
+"""
+WikiQuran — scripts/benchmarks/bench_artifact.py
+Compare le chargement du corpus : wikiquran_final.json (json.load)
+contre wikiquran_final.wqc (mmap colonnaire) — temps et pic mémoire Python.
+
+Usage : python scripts/benchmarks/bench_artifact.py
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dotenv import load_dotenv
+
+# Import du code de l'API (backend/app) — même chargement qu'au démarrage
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(ROOT_DIR, "backend"))
+
+load_dotenv()
+
+from app.indexes.corpus import load_corpus_from_artifact, load_corpus_from_final
+from app.utils.corpus_artifact import CorpusArtifact
+
+DATA_FINAL    = "data/quran_enriched/wikiquran_final.json"
+DATA_ARTIFACT = "data/quran_enriched/wikiquran_final.wqc"
+
+
+def separator(title: str):
+    print(f"\n{'=' * 60}")
+    print(f"  {title}")
+    print(f"{'=' * 60}\n")
+
+
+def measure(label: str, fn):
+    """Exécute fn une fois : durée (ms) et pic d'allocation Python (Mo)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<34} {elapsed:>9.1f} ms {peak / (1024 * 1024):>9.1f} Mo")
+    return result
+
+
+def load_json() -> dict:
+    with open(DATA_FINAL, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def open_artifact_stats() -> dict:
+    with CorpusArtifact(DATA_ARTIFACT) as artifact:
+        return artifact.meta["stats"]
+
+
+def main():
+    for path in (DATA_FINAL, DATA_ARTIFACT):
+        if not os.path.exists(path):
+            print(f"  ❌ Fichier introuvable : {path}")
+            print("     → Lance d'abord scripts/extraction/normalize.py")
+            sys.exit(1)
+
+    separator("TAILLE SUR DISQUE")
+    for path in (DATA_FINAL, DATA_ARTIFACT):
+        print(f"  {os.path.basename(path):<34} {os.path.getsize(path) / (1024 * 1024):>9.1f} Mo")
+
+    separator("CHARGEMENT")
+    print(f"  {'':<34} {'durée':>12} {'pic':>12}")
+    measure("JSON : json.load", load_json)
+    measure("WQC  : ouverture + meta", open_artifact_stats)
+    measure("JSON : json.load + Corpus", lambda: load_corpus_from_final(load_json()))
+    measure("WQC  : Corpus (colonnes)", lambda: load_corpus_from_artifact(DATA_ARTIFACT))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,536 @@
+"""
+WikiQuran — scripts/benchmarks/bench_endpoints.py
+Benchmark de bout en bout des endpoints de l'API : latence (p50/p90/p99/max)
+et débit par endpoint et par famille de paramètres (verset « hub » ou rare,
+racine fréquente ou rare, sort=mushaf ou connected…).
+
+Deux modes :
+  - local (défaut) : l'application FastAPI tourne dans le processus, sur une
+    tranche du corpus (--surahs 1-20) chargée dans une base jetable — SQLite
+    (fichier temporaire) ou --database-url vers un PostgreSQL local (conteneur).
+    Requêtes via fastapi.testclient (httpx, dans backend/requirements.txt).
+    Les endpoints /network/ayah, /network/root et /analytics lisent le graphe
+    selon GRAPH_BACKEND : avec postgres, depuis la table ayah_pair de la base
+    jetable ; avec neo4j (pas d'équivalent embarqué), seulement avec --neo4j
+    (instance NEO4J_URI chargée avec la même tranche via import_neo4j.py).
+  - --url : API déjà démarrée (docker compose), requêtes HTTP keep-alive.
+
+Chaque exécution est ajoutée à data/benchmarks/endpoints_history.json
+(horodatage, commit, mode, tranche, GRAPH_BACKEND) et comparée à la dernière
+exécution comparable (même mode, même tranche, même source du graphe).
+
+Usage : python scripts/benchmarks/bench_endpoints.py [--surahs 1-20] [--requests 200]
+            [--concurrency 8] [--database-url URL] [--neo4j] [--only network]
+        python scripts/benchmarks/bench_endpoints.py --url http://localhost:8000
+"""
+
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from urllib.parse import quote, urlsplit
+from dotenv import load_dotenv
+
+# Import du code de l'API (backend/app) — mêmes routes qu'en production
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(ROOT_DIR, "backend"))
+
+load_dotenv()
+
+from app.utils.arabic import normalize, normalize_with_offsets, encode_offsets
+
+DATA_FINAL   = "data/quran_enriched/wikiquran_final.json"
+HISTORY_FILE = "data/benchmarks/endpoints_history.json"
+
+# Seuil d'alerte dans la comparaison avec l'exécution précédente
+REGRESSION_PCT = 20.0
+
+
+def separator(title: str):
+    print(f"\n{'=' * 60}")
+    print(f"  {title}")
+    print(f"{'=' * 60}\n")
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+# ============================================================
+# Tranche du corpus
+# ============================================================
+def parse_surahs(spec: str) -> set[int]:
+    """'1-20' → {1..20} ; '1,2,112-114' → {1, 2, 112, 113, 114}."""
+    numbers = set()
+    for part in spec.split(","):
+        start, _, end = part.partition("-")
+        numbers.update(range(int(start), int(end or start) + 1))
+    return numbers
+
+
+def slice_corpus(final: dict, surahs: set[int]) -> dict:
+    """Sous-ensemble cohérent du document final : sourates choisies et leurs dépendances."""
+    kept_surahs = [s for s in final['surahs'] if s['number'] in surahs]
+    surah_ids = {s['id'] for s in kept_surahs}
+    ayahs = [a for a in final['ayahs'] if a['surah_id'] in surah_ids]
+    ayah_ids = {a['id'] for a in ayahs}
+    occurrences = [o for o in final['occurrences'] if o['ayah_id'] in ayah_ids]
+    word_ids = {o['word_id'] for o in occurrences}
+    words = [w for w in final['words'] if w['id'] in word_ids]
+    root_ids = {w['root_id'] for w in words if w['root_id'] is not None}
+    roots = [r for r in final['roots'] if r['id'] in root_ids]
+    return {
+        "surahs": kept_surahs, "ayahs": ayahs, "roots": roots,
+        "words": words, "occurrences": occurrences,
+    }
+
+
+def pick_targets(corpus: dict) -> dict:
+    """
+    Paramètres représentatifs tirés de la tranche.
+    Connectivité d'un verset (proxy de son degré SHARES_ROOT, sans Neo4j) :
+    somme, sur ses racines distinctes, du nombre de versets qui les contiennent.
+    """
+    surah_number = {s['id']: s['number'] for s in corpus['surahs']}
+    word_root = {w['id']: w['root_id'] for w in corpus['words']}
+    root_bw = {r['id']: r['buckwalter'] for r in corpus['roots']}
+
+    ayah_roots = defaultdict(set)
+    for o in corpus['occurrences']:
+        root_id = word_root.get(o['word_id'])
+        if root_id is not None:
+            ayah_roots[o['ayah_id']].add(root_id)
+    root_ayahs = Counter(r for roots in ayah_roots.values() for r in roots)
+
+    connectivity = {
+        ayah_id: sum(root_ayahs[r] for r in roots)
+        for ayah_id, roots in ayah_roots.items()
+    }
+    ranked_ayahs = sorted(connectivity, key=lambda a: (-connectivity[a], a))
+    ayah_ref = {a['id']: (surah_number[a['surah_id']], a['number']) for a in corpus['ayahs']}
+
+    ranked_roots = [r for r, _ in root_ayahs.most_common()]
+    rare_roots = [r for r in ranked_roots if root_ayahs[r] >= 2] or ranked_roots
+
+    # Termes de recherche : formes normalisées (≥ 3 lettres) par fréquence documentaire
+    term_df = Counter()
+    for a in corpus['ayahs']:
+        term_df.update({t for t in normalize(a['text_arabic']).split() if len(t) >= 3})
+    ranked_terms = [t for t, _ in term_df.most_common()]
+
+    common_root, rare_root = root_bw[ranked_roots[0]], root_bw[rare_roots[-1]]
+    return {
+        "hub_ayah"   : ayah_ref[ranked_ayahs[0]],
+        "rare_ayah"  : ayah_ref[ranked_ayahs[-1]],
+        "common_root": common_root,
+        "rare_root"  : rare_root,
+        "second_root": root_bw[ranked_roots[1]] if len(ranked_roots) > 1 else common_root,
+        "common_term": ranked_terms[0],
+        "rare_term"  : ranked_terms[-1],
+        "pair_terms" : f"{ranked_terms[0]} {ranked_terms[1] if len(ranked_terms) > 1 else ranked_terms[0]}",
+        "first_surah": min(s['number'] for s in corpus['surahs']),
+        "period"     : corpus['surahs'][0]['type'],
+    }
+
+
+# ============================================================
+# Scénarios
+# ============================================================
+@dataclass
+class Scenario:
+    endpoint: str          # route FastAPI (clé de regroupement)
+    mix: str               # famille de paramètres
+    path: str              # URL effectivement demandée
+    neo4j: bool = False    # dépend de Neo4j
+
+
+def build_scenarios(t: dict) -> list[Scenario]:
+    hub_s, hub_a = t["hub_ayah"]
+    rare_s, rare_a = t["rare_ayah"]
+    q = lambda s: quote(s, safe="")
+    return [
+        Scenario("/surahs", "all", "/surahs"),
+        Scenario("/surahs/{n}", "first", f"/surahs/{t['first_surah']}"),
+        Scenario("/ayah/{s}/{a}", "hub", f"/ayah/{hub_s}/{hub_a}"),
+        Scenario("/ayah/{s}/{a}", "rare", f"/ayah/{rare_s}/{rare_a}"),
+        Scenario("/root/{bw}", "common", f"/root/{q(t['common_root'])}"),
+        Scenario("/root/{bw}", "rare", f"/root/{q(t['rare_root'])}"),
+        Scenario("/search", "common", f"/search?q={q(t['common_term'])}"),
+        Scenario("/search", "rare", f"/search?q={q(t['rare_term'])}"),
+        Scenario("/search/ranked", "any", f"/search/ranked?q={q(t['pair_terms'])}"),
+        Scenario("/search/ranked", "all", f"/search/ranked?q={q(t['pair_terms'])}&match=all"),
+        Scenario("/search/ranked", "root", f"/search/ranked?q={q('root:' + t['common_root'])}"),
+        Scenario("/search/fuzzy", "common", f"/search/fuzzy?q={q(t['common_term'])}"),
+        Scenario("/autocomplete", "short", f"/autocomplete?q={q(t['common_root'][:1])}"),
+        Scenario("/autocomplete", "long", f"/autocomplete?q={q(t['common_root'][:2])}"),
+        Scenario("/analyze", "common", f"/analyze?q={q(t['common_term'])}"),
+        Scenario("/query/roots", "all", f"/query/roots?all={q(t['common_root'] + ',' + t['second_root'])}"),
+        Scenario("/query/roots", "any+period",
+                 f"/query/roots?any={q(t['common_root'] + ',' + t['rare_root'])}&period={t['period']}"),
+        Scenario("/concordance", "common", f"/concordance?root={q(t['common_root'])}"),
+        Scenario("/concordance", "rare", f"/concordance?root={q(t['rare_root'])}"),
+        Scenario("/network/roots/{bw}", "top", f"/network/roots/{q(t['common_root'])}"),
+        Scenario("/network/roots/{bw}", "ego+npmi", f"/network/roots/{q(t['common_root'])}?mode=ego&score=npmi"),
+        Scenario("/network/ayah/{s}/{a}", "hub", f"/network/ayah/{hub_s}/{hub_a}", neo4j=True),
+        Scenario("/network/ayah/{s}/{a}", "rare", f"/network/ayah/{rare_s}/{rare_a}", neo4j=True),
+        Scenario("/network/root/{bw}", "common+mushaf", f"/network/root/{q(t['common_root'])}?sort=mushaf", neo4j=True),
+        Scenario("/network/root/{bw}", "common+connected", f"/network/root/{q(t['common_root'])}?sort=connected", neo4j=True),
+        Scenario("/network/root/{bw}", "rare+mushaf", f"/network/root/{q(t['rare_root'])}?sort=mushaf", neo4j=True),
+        Scenario("/network/root/{bw}", "rare+connected", f"/network/root/{q(t['rare_root'])}?sort=connected", neo4j=True),
+        Scenario("/analytics/top-roots", "default", "/analytics/top-roots", neo4j=True),
+        Scenario("/analytics/meccan-vs-medinan", "default", "/analytics/meccan-vs-medinan", neo4j=True),
+    ]
+
+
+# ============================================================
+# Base jetable (mode local)
+# ============================================================
+def ayah_pair_rows(corpus: dict) -> list[dict]:
+    """
+    Lignes de ayah_pair (deux sens) — même règle que AYAH_PAIR_SQL
+    (import_postgres.py) : deux versets partagent une racine s'ils la
+    contiennent par des mots différents.
+    """
+    word_root = {w['id']: w['root_id'] for w in corpus['words'] if w['root_id']}
+    by_root: dict[int, dict[int, set]] = defaultdict(lambda: defaultdict(set))
+    for o in corpus['occurrences']:
+        root_id = word_root.get(o['word_id'])
+        if root_id:
+            by_root[root_id][o['ayah_id']].add(o['word_id'])
+
+    shared: dict[tuple[int, int], list[int]] = defaultdict(list)
+    for root_id in sorted(by_root):
+        ayahs = list(by_root[root_id].items())
+        for i, (a, words_a) in enumerate(ayahs):
+            for b, words_b in ayahs[i + 1:]:
+                if len(words_a) == 1 and words_a == words_b:
+                    continue  # un seul et même mot des deux côtés
+                shared[(a, b)].append(root_id)
+                shared[(b, a)].append(root_id)
+
+    return [
+        {"ayah1_id": a, "ayah2_id": b, "weight": len(roots), "root_ids": roots}
+        for (a, b), roots in shared.items()
+    ]
+
+
+def load_standin(corpus: dict, database_url: str):
+    """Crée le schéma (modèles SQLAlchemy) et charge la tranche ; retourne le moteur."""
+    from sqlalchemy import create_engine, insert
+    from app.database import Base
+    from app.models.surah import Surah
+    from app.models.ayah import Ayah
+    from app.models.root import Root
+    from app.models.word import Word
+    from app.models.word_occurrence import WordOccurrence
+    from app.models.ayah_pair import AyahPair
+
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    engine = create_engine(database_url, connect_args=connect_args)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    surah_columns = ("id", "number", "name_arabic", "name_en", "name_transliteration",
+                     "revelation_order", "type", "ayas_count", "rukus")
+    ayah_rows = []
+    for a in corpus['ayahs']:
+        normalized, offsets = normalize_with_offsets(a['text_arabic'])
+        ayah_rows.append({
+            "id": a['id'], "surah_id": a['surah_id'], "number": a['number'],
+            "text_arabic": a['text_arabic'], "text_normalized": normalized,
+            "offset_map": encode_offsets(offsets),
+        })
+
+    with engine.begin() as conn:
+        conn.execute(insert(Surah), [{k: s.get(k) for k in surah_columns} for s in corpus['surahs']])
+        conn.execute(insert(Root), [
+            {"id": r['id'], "buckwalter": r['buckwalter'], "arabic": r['arabic'],
+             "occurrences_count": r['occurrences_count']}
+            for r in corpus['roots']
+        ])
+        conn.execute(insert(Ayah), ayah_rows)
+        conn.execute(insert(Word), [
+            {"id": w['id'], "text_arabic": w['form_buckwalter'], "root_id": w['root_id'],
+             "lemma_buckwalter": w['lemma_bw'], "pos": w['pos']}
+            for w in corpus['words']
+        ])
+        conn.execute(insert(WordOccurrence), [
+            {"id": i, "ayah_id": o['ayah_id'], "word_id": o['word_id'], "position": o['position']}
+            for i, o in enumerate(corpus['occurrences'], 1)
+        ])
+        pairs = ayah_pair_rows(corpus)
+        if pairs:
+            conn.execute(insert(AyahPair), pairs)
+    return engine
+
+
+def start_local_app(engine):
+    """Branche l'application sur la base jetable et construit les index en mémoire."""
+    from app import database
+    from app.indexes import registry
+    from app.main import app
+
+    database.SessionLocal.configure(bind=engine)
+    db = database.open_pg_session()
+    try:
+        # Toujours depuis la base jetable : CORPUS_ARTIFACT décrit le corpus complet
+        registry.set_indexes(registry.build_indexes(db, use_artifact=False))
+    finally:
+        db.close()
+    return app
+
+
+# ============================================================
+# Clients
+# ============================================================
+class LocalClient:
+    """Application dans le processus (TestClient, sans lifespan)."""
+
+    def __init__(self, app):
+        from fastapi.testclient import TestClient
+        self.client = TestClient(app)
+
+    def get(self, path: str) -> int:
+        return self.client.get(path).status_code
+
+
+class HttpClient:
+    """Connexion HTTP keep-alive vers une API démarrée."""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.connection = cls(parts.netloc, timeout=30)
+        self.prefix = parts.path.rstrip("/")
+
+    def get(self, path: str) -> int:
+        try:
+            self.connection.request("GET", self.prefix + path)
+            response = self.connection.getresponse()
+            response.read()
+            return response.status
+        except (OSError, http.client.HTTPException):
+            self.connection.close()   # reconnexion automatique à la requête suivante
+            return 0
+
+
+# ============================================================
+# Mesures
+# ============================================================
+def measure_latency(client, path: str, requests: int, warmup: int) -> tuple[list[float], int]:
+    """Requêtes séquentielles : latences (ms) et nombre de réponses non 200."""
+    for _ in range(warmup):
+        client.get(path)
+    latencies, errors = [], 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        status = client.get(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+        errors += status != 200
+    return latencies, errors
+
+
+def measure_throughput(make_client, path: str, requests: int, concurrency: int) -> float:
+    """`concurrency` clients en parallèle, `requests` requêtes au total : requêtes/s."""
+    local = threading.local()
+
+    def call(_):
+        if not hasattr(local, "client"):
+            local.client = make_client()
+        return local.client.get(path)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, range(concurrency)))   # une connexion ouverte par thread
+        start = time.perf_counter()
+        list(pool.map(call, range(requests)))
+        elapsed = time.perf_counter() - start
+    return requests / elapsed if elapsed > 0 else 0.0
+
+
+def run_scenario(make_client, scenario: Scenario, args) -> dict:
+    latencies, errors = measure_latency(make_client(), scenario.path, args.requests, args.warmup)
+    rps = measure_throughput(make_client, scenario.path, args.requests, args.concurrency)
+    return {
+        "endpoint": scenario.endpoint,
+        "mix"     : scenario.mix,
+        "path"    : scenario.path,
+        "p50"     : round(percentile(latencies, 50), 3),
+        "p90"     : round(percentile(latencies, 90), 3),
+        "p99"     : round(percentile(latencies, 99), 3),
+        "max"     : round(max(latencies), 3),
+        "mean"    : round(sum(latencies) / len(latencies), 3),
+        "rps"     : round(rps, 1),
+        "errors"  : errors,
+    }
+
+
+# ============================================================
+# Historique
+# ============================================================
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history() -> list[dict]:
+    if not os.path.exists(HISTORY_FILE):
+        return []
+    with open(HISTORY_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_history(history: list[dict]):
+    os.makedirs(os.path.dirname(HISTORY_FILE), exist_ok=True)
+    tmp = HISTORY_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, HISTORY_FILE)
+
+
+def comparable(run: dict, other: dict) -> bool:
+    keys = ("mode", "target", "surahs", "requests", "concurrency", "graph_backend")
+    return all(run.get(k) == other.get(k) for k in keys)
+
+
+def print_comparison(run: dict, previous: dict):
+    separator(f"COMPARAISON — {previous['commit'] or '?'} ({previous['timestamp']})")
+    before = {(r["endpoint"], r["mix"]): r for r in previous["results"]}
+    print(f"  {'endpoint':<30} {'mix':<17} {'p50':>9} {'Δ p50':>8} {'Δ rps':>8}")
+    for r in run["results"]:
+        old = before.get((r["endpoint"], r["mix"]))
+        if old is None:
+            continue
+        d_p50 = (r["p50"] - old["p50"]) * 100 / old["p50"] if old["p50"] else 0.0
+        d_rps = (r["rps"] - old["rps"]) * 100 / old["rps"] if old["rps"] else 0.0
+        flag = "  ⚠️" if d_p50 > REGRESSION_PCT else ""
+        print(f"  {r['endpoint']:<30} {r['mix']:<17} {r['p50']:>7.2f}ms {d_p50:>+7.1f}% {d_rps:>+7.1f}%{flag}")
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des endpoints de l'API")
+    parser.add_argument("--url", help="API déjà démarrée (sinon : application locale sur une base jetable)")
+    parser.add_argument("--final", default=DATA_FINAL, help="Document wikiquran_final.json source")
+    parser.add_argument("--surahs", default="1-20", help="Tranche du corpus (ex: 1-20 ou 1,2,112-114)")
+    parser.add_argument("--database-url", help="Base jetable du mode local (défaut : SQLite temporaire)")
+    parser.add_argument("--neo4j", action="store_true", help="Mesurer aussi les endpoints du graphe sur Neo4j (mode local, GRAPH_BACKEND=neo4j)")
+    parser.add_argument("--only", help="Ne garder que les endpoints contenant ce texte")
+    parser.add_argument("--requests", type=int, default=200, help="Requêtes mesurées par scénario")
+    parser.add_argument("--warmup", type=int, default=20, help="Requêtes d'échauffement par scénario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Clients parallèles (débit)")
+    parser.add_argument("--no-history", action="store_true", help="Ne pas enregistrer l'exécution")
+    args = parser.parse_args()
+
+    separator("TRANCHE DU CORPUS")
+    with open(args.final, encoding="utf-8") as f:
+        corpus = slice_corpus(json.load(f), parse_surahs(args.surahs))
+    if not corpus["ayahs"]:
+        print(f"  ❌ Aucun verset pour --surahs {args.surahs}")
+        sys.exit(1)
+    targets = pick_targets(corpus)
+    print(f"  Sourates    : {args.surahs} ({len(corpus['surahs'])})")
+    print(f"  Versets     : {len(corpus['ayahs']):,} | racines : {len(corpus['roots']):,} "
+          f"| occurrences : {len(corpus['occurrences']):,}")
+    print(f"  Verset hub  : {targets['hub_ayah']} | rare : {targets['rare_ayah']}")
+    print(f"  Racines     : {targets['common_root']} (fréquente) | {targets['rare_root']} (rare)")
+
+    scenarios = build_scenarios(targets)
+    if args.only:
+        scenarios = [s for s in scenarios if args.only in s.endpoint]
+
+    tmp_dir = None
+    graph_backend = None    # source du graphe de l'API distante : inconnue
+    if args.url:
+        mode, target = "http", args.url
+        make_client = lambda: HttpClient(args.url)
+    else:
+        # Mots de passe requis (non vides) par Settings : inutiles contre la base
+        # jetable, une valeur de substitution suffit
+        for name in ("POSTGRES_PASSWORD", "NEO4J_PASSWORD"):
+            if not os.environ.get(name):
+                os.environ[name] = "standin"
+        if args.database_url:
+            database_url = args.database_url
+        else:
+            tmp_dir = tempfile.TemporaryDirectory(prefix="wq_bench_")
+            database_url = f"sqlite:///{os.path.join(tmp_dir.name, 'standin.db')}"
+        mode, target = "local", database_url.split("://")[0]
+
+        separator("BASE JETABLE")
+        t0 = time.perf_counter()
+        engine = load_standin(corpus, database_url)
+        t1 = time.perf_counter()
+        app = start_local_app(engine)
+        t2 = time.perf_counter()
+        print(f"  Chargement  : {(t1 - t0) * 1000:.0f} ms ({target})")
+        print(f"  Index       : {(t2 - t1) * 1000:.0f} ms")
+        make_client = lambda: LocalClient(app)
+
+        from app.config import settings
+        graph_backend = settings.GRAPH_BACKEND
+        print(f"  Graphe      : {graph_backend}")
+        # GRAPH_BACKEND=postgres : graphe servi par ayah_pair de la base jetable
+        if settings.neo4j_enabled and not args.neo4j:
+            skipped = sorted({s.endpoint for s in scenarios if s.neo4j})
+            scenarios = [s for s in scenarios if not s.neo4j]
+            for endpoint in skipped:
+                print(f"  ⏭️  {endpoint} ignoré (Neo4j : --neo4j, ou GRAPH_BACKEND=postgres)")
+
+    separator(f"LATENCE (ms) ET DÉBIT — {args.requests} requêtes, {args.concurrency} clients")
+    print(f"  {'endpoint':<30} {'mix':<17} {'p50':>7} {'p90':>7} {'p99':>7} {'max':>7} {'req/s':>8} {'err':>4}")
+    results = []
+    try:
+        for scenario in scenarios:
+            r = run_scenario(make_client, scenario, args)
+            results.append(r)
+            print(f"  {r['endpoint']:<30} {r['mix']:<17} {r['p50']:>7.2f} {r['p90']:>7.2f} "
+                  f"{r['p99']:>7.2f} {r['max']:>7.2f} {r['rps']:>8.1f} {r['errors']:>4}")
+    finally:
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    run = {
+        "timestamp"    : datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "commit"       : git_commit(),
+        "mode"         : mode,
+        "target"       : target,
+        "surahs"       : args.surahs,
+        "requests"     : args.requests,
+        "concurrency"  : args.concurrency,
+        "graph_backend": graph_backend,
+        "results"      : results,
+    }
+
+    history = load_history()
+    previous = next((h for h in reversed(history) if comparable(run, h)), None)
+    if previous is not None:
+        print_comparison(run, previous)
+
+    if not args.no_history:
+        history.append(run)
+        save_history(history)
+        print(f"\n  💾 Exécution ajoutée à {HISTORY_FILE} ({len(history)} au total)")
+
+    if any(r["errors"] for r in results):
+        print("\n  ⚠️  Réponses en erreur : vérifier la tranche chargée et les services")
+
+
+if __name__ == "__main__":
+    main()
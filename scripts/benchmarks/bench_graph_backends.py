@@ -0,0 +1,169 @@
+"""
+WikiQuran — scripts/benchmarks/bench_graph_backends.py
+Compare les deux sources du graphe SHARES_ROOT (GRAPH_BACKEND) sur le même
+mélange de requêtes : Neo4j (relations SHARES_ROOT) et PostgreSQL (table
+ayah_pair). Mesure au niveau des services (services.network.Neo4jGraph /
+network_pg.PostgresGraph), sans HTTP ni admission, pour isoler le coût de la
+source. Vérifie aussi que les deux sources renvoient les mêmes réponses.
+
+Prérequis : même jeu de données dans les deux bases (import_postgres.py, qui
+remplit ayah_pair, puis import_neo4j.py), cibles choisies comme
+check_query_plans.py (racine et verset les plus / les moins connectés).
+
+Usage : python scripts/benchmarks/bench_graph_backends.py [--pg-schema S] [--database D]
+            [--requests 100] [--warmup 10] [--backends neo4j,postgres]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from dotenv import load_dotenv
+
+# Import du code de l'API (backend/app) — mêmes requêtes qu'en production
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(ROOT_DIR, "backend"))
+
+load_dotenv()
+
+from bench_endpoints import percentile
+from check_query_plans import pick_targets
+
+BACKENDS = ("neo4j", "postgres")
+
+
+def separator(title: str):
+    print(f"\n{'=' * 60}")
+    print(f"  {title}")
+    print(f"{'=' * 60}\n")
+
+
+# ============================================================
+# Mélange de requêtes
+# ============================================================
+def build_mix(targets: dict) -> dict[str, callable]:
+    """Nom du scénario → requête sur un GraphBackend (paramètres par défaut des routes)."""
+    mix = {}
+    for variant in ("hub", "rare"):
+        t = targets[variant]
+        mix[f"ayah {variant} {t['surah']}:{t['verse']}"] = (
+            lambda graph, t=t: graph.ayah_network(t["surah"], t["verse"], 2, 50)
+        )
+        for sort in ("mushaf", "connected"):
+            mix[f"root {variant} {t['bw']} ({sort})"] = (
+                lambda graph, t=t, sort=sort: graph.root_network(t["bw"], 30, 2, 100, sort)
+            )
+    mix["top-roots"] = lambda graph: graph.top_roots(20)
+    mix["meccan-vs-medinan"] = lambda graph: graph.meccan_vs_medinan(20)
+    return mix
+
+
+# ============================================================
+# Comparaison des réponses
+# ============================================================
+def canonical(value):
+    """Réponse sans ordre : les ex-aequo peuvent sortir dans un ordre différent."""
+    if isinstance(value, dict):
+        return {k: canonical(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return sorted((canonical(v) for v in value), key=lambda v: json.dumps(v, sort_keys=True, ensure_ascii=False))
+    return value
+
+
+def same_response(a, b) -> bool:
+    dump = lambda r: canonical(r.model_dump()) if r is not None else None
+    return dump(a) == dump(b)
+
+
+# ============================================================
+# Mesure
+# ============================================================
+def measure(graph, query, requests: int, warmup: int) -> tuple[list[float], object]:
+    for _ in range(warmup):
+        result = query(graph)
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        result = query(graph)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Neo4j vs PostgreSQL (ayah_pair) sur le même mélange de requêtes")
+    parser.add_argument("--pg-schema", default="public", help="Schéma PostgreSQL de référence")
+    parser.add_argument("--database", default=os.getenv("NEO4J_DATABASE") or None,
+                        help="Base Neo4j de référence (défaut : base par défaut)")
+    parser.add_argument("--only", help="Ne garder que les scénarios contenant ce texte")
+    parser.add_argument("--requests", type=int, default=100, help="Requêtes mesurées par scénario et par source")
+    parser.add_argument("--warmup", type=int, default=10, help="Requêtes d'échauffement par scénario et par source")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Sources comparées (neo4j,postgres)")
+    args = parser.parse_args()
+
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    unknown = set(backends) - set(BACKENDS)
+    if unknown:
+        parser.error(f"source inconnue : {', '.join(sorted(unknown))}")
+
+    from app import database
+    from app.database import DatasetPointer, open_pg_session, use_dataset
+    from app.services.network import Neo4jGraph
+    from app.services.network_pg import PostgresGraph
+
+    print("\n🕌 WikiQuran — bench_graph_backends.py\n")
+
+    use_dataset(DatasetPointer(pg_schema=args.pg_schema, neo4j_database=args.database))
+    db = open_pg_session()
+    session = None
+    try:
+        targets = pick_targets(db)
+        graphs = {}
+        if "neo4j" in backends:
+            session = database.open_neo4j_session()
+            graphs["neo4j"] = Neo4jGraph(session)
+        if "postgres" in backends:
+            graphs["postgres"] = PostgresGraph(db)
+
+        mix = build_mix(targets)
+        if args.only:
+            mix = {name: q for name, q in mix.items() if args.only in name}
+
+        separator(f"{len(mix)} SCÉNARIOS × {args.requests} REQUÊTES — {targets['ayahs']:,} VERSETS")
+        header = "  ".join(f"{name:>8} p50   p90   p99" for name in graphs)
+        print(f"  {'scénario':<34}  {header}   ratio p50   réponses")
+        mismatches = []
+        for scenario, query in mix.items():
+            cells, p50s, results = [], {}, {}
+            for name, graph in graphs.items():
+                timings, results[name] = measure(graph, query, args.requests, args.warmup)
+                p50s[name] = percentile(timings, 50)
+                cells.append(f"{p50s[name]:>12.2f} {percentile(timings, 90):>5.1f} {percentile(timings, 99):>5.1f}")
+
+            ratio = equal = ""
+            if len(graphs) == 2:
+                ratio = f"{p50s['neo4j'] / p50s['postgres']:>8.1f}×" if p50s["postgres"] else "       —"
+                if same_response(results["neo4j"], results["postgres"]):
+                    equal = "identiques"
+                else:
+                    equal = "DIFFÉRENTES"
+                    mismatches.append(scenario)
+            print(f"  {scenario:<34}  {'  '.join(cells)}   {ratio:>9}   {equal}")
+    except Exception as e:
+        print(f"\n  ❌ {type(e).__name__} : {e}")
+        sys.exit(2)
+    finally:
+        if session is not None:
+            session.close()
+        db.close()
+        database.close_neo4j()
+
+    print("\n  Latences en ms ; ratio = p50 Neo4j / p50 PostgreSQL (> 1 : PostgreSQL plus rapide)")
+    if mismatches:
+        print(f"\n❌ Réponses différentes : {', '.join(mismatches)}\n")
+        sys.exit(1)
+    print()
+
+
+if __name__ == "__main__":
+    main()
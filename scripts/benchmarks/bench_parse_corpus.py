@@ -0,0 +1,54 @@
+"""
+WikiQuran — scripts/benchmarks/bench_parse_corpus.py
+Parsing de la morphologie : durée avec 1 processus puis avec N processus.
+Sorties identiques (1 vs N processus, références) : check_parse_corpus.py.
+
+Usage : python scripts/benchmarks/bench_parse_corpus.py [--workers 4] [--runs 3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "extraction"))
+import parse_corpus
+
+
+def separator(title: str):
+    print(f"\n{'=' * 60}")
+    print(f"  {title}")
+    print(f"{'=' * 60}\n")
+
+
+def timed_parse(workers: int) -> float:
+    # Les statistiques imprimées par le parser ne sont pas utiles ici
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        parse_corpus.parse_morphology(workers)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du parser morphologie")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--runs", type=int, default=3, help="Répétitions (meilleur temps retenu)")
+    args = parser.parse_args()
+
+    if not os.path.exists(parse_corpus.FILE_MORPHO):
+        print(f"  ❌ Fichier introuvable : {parse_corpus.FILE_MORPHO}")
+        sys.exit(1)
+
+    separator("BENCHMARK")
+    sequential = min(timed_parse(1) for _ in range(args.runs))
+    parallel = min(timed_parse(args.workers) for _ in range(args.runs))
+    print(f"  1 processus   : {sequential:>7.2f} s")
+    print(f"  {args.workers} processus   : {parallel:>7.2f} s")
+    print(f"  Gain          : × {sequential / parallel:.2f}")
+    print("\n  Sorties identiques : python scripts/benchmarks/check_parse_corpus.py\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+WikiQuran — scripts/benchmarks/bench_search.py
+Mesure le moteur de recherche classé (BM25) hors ligne, sans base de données :
+temps de construction de l'index puis latence par famille de requêtes.
+
+Usage : python scripts/benchmarks/bench_search.py [--runs 200]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from dotenv import load_dotenv
+
+# Import du code de l'API (backend/app) — mêmes index qu'en production
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(ROOT_DIR, "backend"))
+
+load_dotenv()
+
+from app.indexes.corpus import load_corpus_from_final
+from app.indexes.positions import PositionIndex
+from app.indexes.search_engine import SearchEngine, parse_query
+from app.indexes.fuzzy import FuzzyIndex
+
+DATA_FINAL = "data/quran_enriched/wikiquran_final.json"
+
+# Familles de requêtes : fréquentes, rares, multi-mots, phrases, racines
+QUERIES = {
+    "common": ["الله", "من", "الذين", "قال"],
+    "rare":   ["الصمد", "الفلق", "سجيل", "قسورة"],
+    "multi":  ["الصلوة الزكوة", "الجنة النار", "موسي فرعون", "السموت الارض"],
+    "phrase": ['"بسم الله"', '"رب العلمين"', '"ان الله علي كل شيء قدير"'],
+    "root":   ["root:ktb", "root:Elm", "root:rHm root:gfr", "lemma:kita`b"],
+}
+
+# Recherche approchée : variantes orthographiques et fautes de frappe
+FUZZY_QUERIES = ["الكتاب", "العالمين", "الصلاة", "موسى", "مؤمنة", "رحمة ربك"]
+
+
+def separator(title: str):
+    print(f"\n{'=' * 60}")
+    print(f"  {title}")
+    print(f"{'=' * 60}\n")
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du moteur BM25")
+    parser.add_argument("--runs", type=int, default=200, help="Répétitions par requête")
+    parser.add_argument("--k", type=int, default=20, help="Taille du top-k")
+    args = parser.parse_args()
+
+    separator("CHARGEMENT")
+    with open(DATA_FINAL, encoding="utf-8") as f:
+        final = json.load(f)
+
+    t0 = time.perf_counter()
+    corpus = load_corpus_from_final(final)
+    t1 = time.perf_counter()
+    engine = SearchEngine(corpus, PositionIndex(corpus))
+    t2 = time.perf_counter()
+    print(f"  Corpus      : {corpus.ayah_count} versets en {(t1 - t0) * 1000:.0f} ms")
+    fuzzy = FuzzyIndex(engine)
+    t3 = time.perf_counter()
+    print(f"  Index BM25  : {len(engine.postings)} termes en {(t2 - t1) * 1000:.0f} ms")
+    print(f"  Trigrammes  : {len(fuzzy.postings)} trigrammes, {len(fuzzy.forms)} formes en {(t3 - t2) * 1000:.0f} ms")
+
+    separator("LATENCE PAR FAMILLE (ms)")
+    print(f"  {'famille':<8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    families = {
+        family: [
+            lambda q=query, f=family: engine.search(parse_query(q), args.k, match_all=(f == "multi"))
+            for query in queries
+        ]
+        for family, queries in QUERIES.items()
+    }
+    families["fuzzy"] = [lambda q=query: fuzzy.search(q, args.k) for query in FUZZY_QUERIES]
+
+    for family, calls in families.items():
+        timings = []
+        for call in calls:
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                call()
+                timings.append((time.perf_counter() - start) * 1000)
+        print(
+            f"  {family:<8} {percentile(timings, 50):>8.3f} {percentile(timings, 95):>8.3f}"
+            f" {percentile(timings, 99):>8.3f} {max(timings):>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
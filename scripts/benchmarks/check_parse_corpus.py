@@ -0,0 +1,109 @@
+"""
+WikiQuran — scripts/benchmarks/check_parse_corpus.py
+Garde-fou du parser morphologie (parse_corpus.py) : les JSON produits doivent
+être identiques, octet pour octet,
+  - entre 1 processus et N processus (découpage aux frontières de sourates) ;
+  - aux sorties de référence versionnées.
+
+Par défaut sur l'extrait versionné fixtures/morphology_sample.txt (4 sourates,
+doublons, ligne invalide) et ses références fixtures/parse_corpus_golden/ :
+exécutable partout, sans les données brutes. --morphology/--golden-dir
+vérifient le corpus complet contre data/quran_enriched.
+
+Code de sortie 1 si une sortie diffère. --record réécrit les références
+(après un changement voulu du format de sortie).
+
+Usage : python scripts/benchmarks/check_parse_corpus.py [--workers 3] [--record]
+        python scripts/benchmarks/check_parse_corpus.py --morphology data/quran_raw/quranic-corpus-morphology-0.4.txt
+            --golden-dir data/quran_enriched
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "extraction"))
+import parse_corpus
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SAMPLE_MORPHO = os.path.join(FIXTURES_DIR, "morphology_sample.txt")
+SAMPLE_GOLDEN = os.path.join(FIXTURES_DIR, "parse_corpus_golden")
+
+OUTPUTS = ("roots.json", "words.json", "occurrences.json")
+
+
+def separator(title: str):
+    print(f"\n{'=' * 60}")
+    print(f"  {title}")
+    print(f"{'=' * 60}\n")
+
+
+def serialize(words: list, occurrences: list, roots: list) -> dict[str, bytes]:
+    """Même sérialisation que parse_corpus.export_json."""
+    return {
+        name: json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+        for name, data in zip(OUTPUTS, (roots, words, occurrences))
+    }
+
+
+def parse(path: str, workers: int) -> dict[str, bytes]:
+    # Les statistiques imprimées par le parser ne sont pas utiles ici
+    with contextlib.redirect_stdout(io.StringIO()):
+        words, occurrences, roots = parse_corpus.parse_morphology(workers, path)
+    return serialize(words, occurrences, roots)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sorties du parser morphologie identiques aux références")
+    parser.add_argument("--morphology", default=SAMPLE_MORPHO, help="Fichier morphologie à parser")
+    parser.add_argument("--golden-dir", default=SAMPLE_GOLDEN, help="Dossier des JSON de référence")
+    parser.add_argument("--workers", type=int, default=3, help="Processus du parsing parallèle comparé")
+    parser.add_argument("--record", action="store_true", help="Réécrire les références depuis le parsing séquentiel")
+    args = parser.parse_args()
+
+    print("\n🕌 WikiQuran — check_parse_corpus.py\n")
+
+    if not os.path.exists(args.morphology):
+        print(f"  ❌ Fichier introuvable : {args.morphology}")
+        sys.exit(2)
+
+    sequential = parse(args.morphology, 1)
+
+    if args.record:
+        os.makedirs(args.golden_dir, exist_ok=True)
+        for name in OUTPUTS:
+            with open(os.path.join(args.golden_dir, name), "wb") as f:
+                f.write(sequential[name])
+        print(f"  💾 {len(OUTPUTS)} références enregistrées dans {args.golden_dir}\n")
+        return
+
+    parallel = parse(args.morphology, args.workers)
+
+    separator(f"GOLDEN — {os.path.basename(args.morphology)}")
+    failures = 0
+    for name in OUTPUTS:
+        if parallel[name] != sequential[name]:
+            print(f"  ❌ {name:<18} différent entre 1 et {args.workers} processus")
+            failures += 1
+
+        golden = os.path.join(args.golden_dir, name)
+        if not os.path.exists(golden):
+            print(f"  ❌ {name:<18} pas de référence ({golden})")
+            failures += 1
+            continue
+        with open(golden, "rb") as f:
+            identical = f.read() == sequential[name]
+        print(f"  {'✅' if identical else '❌'} {name:<18} {'identique' if identical else 'DIFFÉRENT'}")
+        failures += not identical
+
+    if failures:
+        print(f"\n❌ {failures} sortie(s) différente(s)\n")
+        sys.exit(1)
+    print("\n✅ Sorties identiques\n")
+
+
+if __name__ == "__main__":
+    main()
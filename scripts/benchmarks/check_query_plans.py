@@ -0,0 +1,363 @@
+"""
+WikiQuran — scripts/benchmarks/check_query_plans.py
+Garde-fou des plans d'exécution : PROFILE pour chaque constante _CYPHER_* des
+services, EXPLAIN (ANALYZE, BUFFERS) pour chaque requête SQL émise par les
+routes PostgreSQL — y compris réseau et analytique servis par la table
+ayah_pair (GRAPH_BACKEND=postgres) —, comparés à un fichier de budgets versionné.
+
+Régression (code de sortie 1) :
+  - un opérateur de parcours complet apparaît (NodeByLabelScan, AllNodesScan,
+    Seq Scan sur une table…) alors qu'il n'était pas dans le plan enregistré ;
+  - un index utilisé dans le plan enregistré ne l'est plus (idx_ayah_ref,
+    pg_id, idx_ayah_text_norm_trgm…) ;
+  - db hits (Cypher) ou blocs lus (SQL) dépassent le budget enregistré.
+
+Les budgets dépendent des données : toujours mesurer sur la même base de
+référence (ex. import_postgres.py --schema wq_fixture --data <tranche> puis
+import_neo4j.py --pg-schema wq_fixture --database wqfixture).
+
+Usage : python scripts/benchmarks/check_query_plans.py [--pg-schema S] [--database D]
+            [--only ROOT_LINKS] [--record [--headroom 0.25]]
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from contextlib import contextmanager
+from urllib.parse import quote
+from dotenv import load_dotenv
+
+# Import du code de l'API (backend/app) — mêmes requêtes qu'en production
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(ROOT_DIR, "backend"))
+
+load_dotenv()
+
+BUDGETS_FILE = os.path.join(ROOT_DIR, "scripts", "benchmarks", "query_plan_budgets.json")
+
+# Opérateurs de parcours complet : nouveaux dans un plan → régression
+CYPHER_SCANS = ("AllNodesScan", "NodeByLabelScan", "DirectedAllRelationshipsScan",
+                "UndirectedAllRelationshipsScan", "DirectedRelationshipTypeScan",
+                "UndirectedRelationshipTypeScan")
+SQL_SCANS = ("Seq Scan",)
+
+# Accès par index : disparus d'un plan → régression
+CYPHER_INDEXES = ("NodeIndexSeek", "NodeUniqueIndexSeek", "MultiNodeIndexSeek",
+                  "NodeIndexScan", "NodeIndexContainsScan", "NodeIndexEndsWithScan")
+SQL_INDEXES = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+# Paramètres Cypher par variante (la racine/le verset le plus et le moins connecté)
+CYPHER_DEFAULTS = {"min_roots": 2, "limit": 50, "max_nodes": 30, "period": "meccan"}
+VARIANT_PARAMS = {"surah", "verse", "bw", "pg_ids"}
+
+
+def separator(title: str):
+    print(f"\n{'=' * 60}")
+    print(f"  {title}")
+    print(f"{'=' * 60}\n")
+
+
+# ============================================================
+# Cible de référence
+# ============================================================
+def pick_targets(db) -> dict:
+    """Racine et verset les plus / les moins connectés de la base de référence."""
+    from sqlalchemy import text
+    roots = db.execute(text("""
+        SELECT buckwalter FROM root WHERE occurrences_count >= 2
+        ORDER BY occurrences_count DESC, buckwalter
+    """)).scalars().all()
+    ayahs = db.execute(text("""
+        SELECT s.number AS surah, a.number AS verse, count(*) AS n
+        FROM word_occurrence o
+        JOIN word w  ON w.id = o.word_id AND w.root_id IS NOT NULL
+        JOIN ayah a  ON a.id = o.ayah_id
+        JOIN surah s ON s.id = a.surah_id
+        GROUP BY s.number, a.number
+        ORDER BY n DESC, s.number, a.number
+    """)).all()
+    return {
+        "hub" : {"bw": roots[0], "surah": ayahs[0].surah, "verse": ayahs[0].verse},
+        "rare": {"bw": roots[-1], "surah": ayahs[-1].surah, "verse": ayahs[-1].verse},
+        "ayahs": db.execute(text("SELECT count(*) FROM ayah")).scalar(),
+    }
+
+
+# ============================================================
+# Cypher — PROFILE
+# ============================================================
+def cypher_constants() -> dict[str, str]:
+    from app.services import analytics, network
+    return {
+        name.removeprefix("_CYPHER_"): value
+        for module in (network, analytics)
+        for name, value in vars(module).items()
+        if name.startswith("_CYPHER_")
+    }
+
+
+def flatten_profile(node: dict, plan: list[str]) -> int:
+    """Parcourt le profil : liste des opérateurs, total des db hits."""
+    operator = node.get("operatorType", "?").split("@")[0]
+    plan.append(operator)
+    hits = node.get("dbHits", node.get("args", {}).get("DbHits", 0)) or 0
+    return hits + sum(flatten_profile(child, plan) for child in node.get("children", []))
+
+
+def profile_cypher(session, query: str, params: dict) -> dict:
+    summary = session.run("PROFILE " + query, params).consume()
+    plan = []
+    hits = flatten_profile(summary.profile, plan)
+    return {"cost": hits, "rows": summary.profile.get("rows", 0), "plan": sorted(plan)}
+
+
+def run_cypher(session, targets: dict, only: str | None) -> dict[str, dict]:
+    results = {}
+    for name, query in sorted(cypher_constants().items()):
+        if only and only not in name:
+            continue
+        wanted = set(re.findall(r"\$(\w+)", query))
+        variants = ("hub", "rare") if wanted & VARIANT_PARAMS else ("default",)
+        for variant in variants:
+            params = {**CYPHER_DEFAULTS, **targets.get(variant, {})}
+            if "pg_ids" in wanted:
+                params["pg_ids"] = session.run(
+                    cypher_constants()["ROOT_ALL_AYAHS"], bw=params["bw"],
+                ).single()["all_pg_ids"][:params["max_nodes"]]
+            missing = wanted - params.keys()
+            if missing:
+                raise KeyError(f"{name} : paramètre(s) sans valeur de test {sorted(missing)}")
+            results[f"{name}:{variant}"] = profile_cypher(session, query, {k: params[k] for k in wanted})
+    return results
+
+
+# ============================================================
+# SQL — EXPLAIN (ANALYZE, BUFFERS)
+# ============================================================
+def sql_scenarios(targets: dict, terms: tuple[str, str]) -> dict[str, str]:
+    hub, rare = targets["hub"], targets["rare"]
+    common_term, rare_term = (quote(t, safe="") for t in terms)
+    return {
+        "surahs"         : "/surahs",
+        "surah"          : f"/surahs/{hub['surah']}",
+        "ayah"           : f"/ayah/{hub['surah']}/{hub['verse']}",
+        "root:hub"       : f"/root/{quote(hub['bw'], safe='')}",
+        "root:rare"      : f"/root/{quote(rare['bw'], safe='')}",
+        "search:common"  : f"/search?q={common_term}",
+        "search:rare"    : f"/search?q={rare_term}",
+        "ranked:common"  : f"/search/ranked?q={common_term}",
+        "fuzzy:common"   : f"/search/fuzzy?q={common_term}",
+        "concordance:hub": f"/concordance?root={quote(hub['bw'], safe='')}",
+    }
+
+
+def graph_sql_scenarios(targets: dict) -> dict[str, str]:
+    """Routes du graphe, exécutées avec GRAPH_BACKEND=postgres (table ayah_pair)."""
+    hub, rare = targets["hub"], targets["rare"]
+    return {
+        "graph:ayah:hub"      : f"/network/ayah/{hub['surah']}/{hub['verse']}",
+        "graph:ayah:rare"     : f"/network/ayah/{rare['surah']}/{rare['verse']}",
+        "graph:root:hub"      : f"/network/root/{quote(hub['bw'], safe='')}",
+        "graph:root:connected": f"/network/root/{quote(hub['bw'], safe='')}?sort=connected",
+        "graph:root:rare"     : f"/network/root/{quote(rare['bw'], safe='')}",
+        "graph:top-roots"     : "/analytics/top-roots",
+        "graph:meccan-medinan": "/analytics/meccan-vs-medinan",
+    }
+
+
+@contextmanager
+def postgres_graph():
+    """GRAPH_BACKEND=postgres le temps du bloc, sans réponse en cache (admission)."""
+    from app import admission
+    from app.config import settings
+
+    previous = settings.GRAPH_BACKEND
+    settings.GRAPH_BACKEND = "postgres"
+    admission._cache.clear()
+    try:
+        yield
+    finally:
+        settings.GRAPH_BACKEND = previous
+        admission._cache.clear()
+
+
+def capture_sql(client, path: str) -> list[tuple[str, object]]:
+    """Requêtes SQL émises par une route (écouteur SQLAlchemy le temps de l'appel)."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    captured = []
+
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(Engine, "before_cursor_execute", listener)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(Engine, "before_cursor_execute", listener)
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} → HTTP {response.status_code}")
+    return captured
+
+
+def flatten_plan(node: dict, plan: list[str]):
+    label = node["Node Type"]
+    target = node.get("Index Name") or node.get("Relation Name")
+    plan.append(f"{label}({target})" if target else label)
+    for child in node.get("Plans", []):
+        flatten_plan(child, plan)
+
+
+def explain_sql(conn, statement: str, parameters) -> dict:
+    with conn.cursor() as cur:
+        cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters)
+        root = cur.fetchone()[0][0]["Plan"]
+    plan = []
+    flatten_plan(root, plan)
+    return {
+        "cost": root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0),
+        "rows": root.get("Actual Rows", 0),
+        "plan": sorted(plan),
+    }
+
+
+def run_sql(client, raw_conn, scenarios: dict[str, str], only: str | None) -> dict[str, dict]:
+    results = {}
+    for name, path in scenarios.items():
+        if only and only not in name:
+            continue
+        for i, (statement, parameters) in enumerate(capture_sql(client, path), 1):
+            entry = explain_sql(raw_conn, statement, parameters)
+            entry["statement"] = " ".join(statement.split())[:160]
+            results[f"{name}#{i}"] = entry
+    return results
+
+
+# ============================================================
+# Comparaison aux budgets
+# ============================================================
+def regressions(key: str, entry: dict, baseline: dict | None, scans, indexes) -> list[str]:
+    if baseline is None:
+        return [f"{key} : pas de plan enregistré (--record)"]
+    problems = []
+    before, now = set(baseline["plan"]), set(entry["plan"])
+    for op in sorted(now - before):
+        if op.startswith(scans):
+            problems.append(f"{key} : nouveau parcours complet {op}")
+    for op in sorted(before - now):
+        if op.startswith(indexes):
+            problems.append(f"{key} : index abandonné {op}")
+    if entry["cost"] > baseline["budget"]:
+        problems.append(f"{key} : {entry['cost']:,} > budget {baseline['budget']:,}")
+    return problems
+
+
+def print_entries(entries: dict[str, dict], unit: str, budgets: dict):
+    print(f"  {'requête':<28} {unit:>10} {'budget':>10} {'lignes':>8}  opérateurs")
+    for key, entry in entries.items():
+        budget = budgets.get(key, {}).get("budget")
+        budget = f"{budget:,}" if budget is not None else "—"
+        ops = ", ".join(sorted(set(entry["plan"])))
+        print(f"  {key:<28} {entry['cost']:>10,} {budget:>10} {entry['rows']:>8}  {ops[:90]}")
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Contrôle des plans d'exécution Cypher et SQL")
+    parser.add_argument("--pg-schema", default="public", help="Schéma PostgreSQL de référence")
+    parser.add_argument("--database", default=os.getenv("NEO4J_DATABASE") or None,
+                        help="Base Neo4j de référence (défaut : base par défaut)")
+    parser.add_argument("--only", help="Ne garder que les requêtes contenant ce texte")
+    parser.add_argument("--skip-cypher", action="store_true", help="Ne pas profiler Neo4j")
+    parser.add_argument("--skip-sql", action="store_true", help="Ne pas analyser PostgreSQL")
+    parser.add_argument("--record", action="store_true", help="Enregistrer les plans comme nouvelle référence")
+    parser.add_argument("--headroom", type=float, default=0.25, help="Marge des budgets enregistrés (0.25 = +25 %%)")
+    parser.add_argument("--budgets", default=BUDGETS_FILE, help="Fichier des budgets")
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from app import database
+    from app.database import DatasetPointer, open_pg_session, use_dataset
+    from app.indexes import registry
+    from app.main import app
+
+    print("\n🕌 WikiQuran — check_query_plans.py\n")
+
+    use_dataset(DatasetPointer(pg_schema=args.pg_schema, neo4j_database=args.database))
+    try:
+        db = open_pg_session()
+        targets = pick_targets(db)
+    except Exception as e:
+        print(f"  ❌ PostgreSQL : {e}")
+        sys.exit(2)
+
+    budgets = {"cypher": {}, "sql": {}}
+    if os.path.exists(args.budgets):
+        with open(args.budgets, encoding="utf-8") as f:
+            budgets = json.load(f)
+    if not args.record and budgets.get("fixture", {}).get("ayahs") not in (None, targets["ayahs"]):
+        print(f"  ❌ Base de référence différente : {targets['ayahs']:,} versets, "
+              f"budgets mesurés sur {budgets['fixture']['ayahs']:,}")
+        sys.exit(1)
+
+    cypher, sql = {}, {}
+    try:
+        if not args.skip_cypher:
+            separator("CYPHER — PROFILE")
+            with database.open_neo4j_session() as session:
+                cypher = run_cypher(session, targets, args.only)
+            print_entries(cypher, "db hits", budgets["cypher"])
+
+        if not args.skip_sql:
+            separator("SQL — EXPLAIN (ANALYZE, BUFFERS)")
+            registry.set_indexes(registry.build_indexes(db, use_artifact=False))
+            engine_conn = db.connection().connection   # connexion psycopg2 (search_path posé)
+            postings = registry.get_indexes().search_engine.postings
+            ranked_terms = sorted((t for t in postings if len(t) >= 3), key=lambda t: (-len(postings[t][0]), t))
+            scenarios = sql_scenarios(targets, (ranked_terms[0], ranked_terms[-1]))
+            client = TestClient(app)
+            sql = run_sql(client, engine_conn, scenarios, args.only)
+            with postgres_graph():
+                sql.update(run_sql(client, engine_conn, graph_sql_scenarios(targets), args.only))
+            print_entries(sql, "blocs", budgets["sql"])
+    except Exception as e:
+        print(f"\n  ❌ {type(e).__name__} : {e}")
+        sys.exit(2)
+    finally:
+        db.close()
+        database.close_neo4j()
+
+    if args.record:
+        for section, entries in (("cypher", cypher), ("sql", sql)):
+            for key, entry in entries.items():
+                budgets[section][key] = {**entry, "budget": math.ceil(entry["cost"] * (1 + args.headroom))}
+        budgets["fixture"] = {"ayahs": targets["ayahs"], "pg_schema": args.pg_schema, "neo4j_database": args.database}
+        with open(args.budgets, "w", encoding="utf-8") as f:
+            json.dump(budgets, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\n  💾 {len(cypher) + len(sql)} plans enregistrés dans {os.path.relpath(args.budgets, ROOT_DIR)}")
+        return
+
+    separator("RÉGRESSIONS")
+    problems = []
+    for key, entry in cypher.items():
+        problems += regressions(key, entry, budgets["cypher"].get(key), CYPHER_SCANS, CYPHER_INDEXES)
+    for key, entry in sql.items():
+        problems += regressions(key, entry, budgets["sql"].get(key), SQL_SCANS, SQL_INDEXES)
+    for problem in problems:
+        print(f"  ❌ {problem}")
+    if problems:
+        print(f"\n❌ {len(problems)} régression(s) de plan\n")
+        sys.exit(1)
+    print("  ✅ Plans et budgets conformes\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+"""
+WikiQuran — scripts/benchmarks/scale_corpus.py
+Génère un corpus synthétique ×N (10×, 100×…) au format wikiquran_final.json,
+pour mesurer import, SHARES_ROOT, requêtes réseau et recherche à volume croissant.
+
+Calibré sur le corpus réel :
+  - longueur des versets : tirée de la distribution empirique de chaque sourate
+    (les 114 sourates gardent leurs métadonnées, avec N fois plus de versets) ;
+  - fréquence des racines : les racines réelles gardent leur fréquence relative
+    (tête de distribution), prolongée par une queue de Zipf ajustée en log-log ;
+    le vocabulaire croît selon la loi de Heaps (exposant mesuré sur le corpus) ;
+  - mots sans racine (particules) : même proportion, mêmes formes, mêmes fréquences ;
+  - formes par racine et lemmes : ajustés sur le nombre de formes des racines réelles.
+
+Le résultat se charge sans changement de format :
+    python scripts/benchmarks/scale_corpus.py --scale 10
+    python scripts/database/import_postgres.py --schema wq_x10 --data data/synthetic/x10/wikiquran_final.wqc
+    python scripts/database/import_neo4j.py --pg-schema wq_x10 --database wqx10
+    python scripts/benchmarks/bench_endpoints.py --final data/synthetic/x10/wikiquran_final.json
+
+Usage : python scripts/benchmarks/scale_corpus.py --scale 10 [--seed 42] [--format json|wqc|both]
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from array import array
+from collections import Counter, defaultdict
+
+# Import des utilitaires partagés (translittération, fichier binaire)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.arabic import normalize
+from utils.buckwalter import buckwalter_to_arabic, arabic_root_display
+from utils.corpus_artifact import CorpusArtifact, write_artifact
+
+DATA_FINAL    = "data/quran_enriched/wikiquran_final.json"
+DATA_ARTIFACT = "data/quran_enriched/wikiquran_final.wqc"
+OUT_DIR       = "data/synthetic"
+
+# Consonnes Buckwalter des racines synthétiques (hors racines réelles)
+ROOT_LETTERS = "btvjHxd*rzs$SDTZEgfqklmnhwy"
+
+# Affixes des formes fléchies : forme n°0 = racine nue, puis affixes de plus en plus longs
+PREFIXES = ["", "Al", "w", "f", "b", "l", "y", "t", "n", "m", "s", "k", "wAl", "fAl", "bAl", "ll"]
+SUFFIXES = ["", "p", "A", "w", "y", "t", "h", "k", "hm", "km", "nA", "wn", "yn", "At", "An", "hA"]
+AFFIXES  = sorted(itertools.product(PREFIXES, SUFFIXES), key=lambda ps: (len(ps[0]) + len(ps[1]), ps))
+
+
+def separator(title: str):
+    print(f"\n{'=' * 60}")
+    print(f"  {title}")
+    print(f"{'=' * 60}\n")
+
+
+def fit_power_law(xs: list[float], ys: list[float]) -> tuple[float, float]:
+    """Moindres carrés en log-log : y ≈ c · x^b → (c, b)."""
+    lx = [math.log(x) for x in xs]
+    ly = [math.log(y) for y in ys]
+    mx, my = sum(lx) / len(lx), sum(ly) / len(ly)
+    var = sum((x - mx) ** 2 for x in lx)
+    b = sum((x - mx) * (y - my) for x, y in zip(lx, ly)) / var if var else 0.0
+    return math.exp(my - b * mx), b
+
+
+# ============================================================
+# Calibration sur le corpus réel
+# ============================================================
+def load_source(path: str | None):
+    """Corpus réel : chemin donné, sinon .wqc s'il existe, sinon JSON."""
+    path = path or (DATA_ARTIFACT if os.path.exists(DATA_ARTIFACT) else DATA_FINAL)
+    if not os.path.exists(path):
+        print(f"  ❌ Fichier introuvable : {path}")
+        print("     → Lance d'abord scripts/extraction/normalize.py")
+        sys.exit(1)
+    if path.endswith(".wqc"):
+        return CorpusArtifact(path), path
+    with open(path, encoding="utf-8") as f:
+        return json.load(f), path
+
+
+def calibrate(final) -> dict:
+    """Distributions du corpus réel utilisées par le générateur."""
+    surahs = sorted((dict(s) for s in final['surahs']), key=lambda s: s['number'])
+    surah_number = {s['id']: s['number'] for s in surahs}
+    ayah_surah = {a['id']: a['surah_id'] for a in final['ayahs']}
+    ayah_order = sorted(ayah_surah, key=lambda a: (surah_number[ayah_surah[a]], a))
+    words = {w['id']: dict(w) for w in final['words']}
+    roots = {r['id']: dict(r) for r in final['roots']}
+
+    ayah_length = Counter()
+    root_freq = Counter()
+    rootless = Counter()
+    ayah_roots = defaultdict(set)
+    for o in final['occurrences']:
+        ayah_length[o['ayah_id']] += 1
+        root_id = words[o['word_id']]['root_id']
+        if root_id is None:
+            rootless[o['word_id']] += 1
+        else:
+            root_freq[root_id] += 1
+            ayah_roots[o['ayah_id']].add(root_id)
+
+    lengths = defaultdict(list)
+    for ayah_id in ayah_order:
+        if ayah_length[ayah_id]:
+            lengths[ayah_surah[ayah_id]].append(ayah_length[ayah_id])
+
+    # Loi de Heaps : racines distinctes sur la première moitié du texte vs le tout
+    seen = set()
+    half = len(ayah_order) // 2
+    for ayah_id in ayah_order[:half]:
+        seen |= ayah_roots[ayah_id]
+    heaps = math.log(len(root_freq) / len(seen)) / math.log(2) if seen else 0.0
+
+    ranked = [r for r, _ in root_freq.most_common()]
+    zipf_c, zipf_b = fit_power_law(range(1, len(ranked) + 1), [root_freq[r] for r in ranked])
+
+    forms_per_root = Counter(w['root_id'] for w in words.values() if w['root_id'] is not None)
+    lemmas_per_root = defaultdict(set)
+    for w in words.values():
+        if w['root_id'] is not None:
+            lemmas_per_root[w['root_id']].add(w['lemma_bw'])
+    forms_c, forms_b = fit_power_law([root_freq[r] for r in ranked], [forms_per_root[r] for r in ranked])
+
+    rooted_total = sum(root_freq.values())
+    return {
+        "surahs"      : surahs,
+        "lengths"     : lengths,
+        "roots"       : [roots[r] for r in ranked],
+        "root_freq"   : [root_freq[r] for r in ranked],
+        "zipf"        : (zipf_c, zipf_b),
+        "heaps"       : heaps,
+        "rooted_share": rooted_total / (rooted_total + sum(rootless.values())),
+        "rootless"    : [(words[w], n) for w, n in rootless.most_common()],
+        "forms"       : (forms_c, forms_b),
+        "lemma_ratio" : sum(len(v) for v in lemmas_per_root.values()) / max(1, sum(forms_per_root.values())),
+        "pos"         : Counter(w['pos'] for w in words.values() if w['root_id'] is not None),
+    }
+
+
+# ============================================================
+# Génération
+# ============================================================
+def synthetic_root_names(taken: set[str]):
+    """Racines trilitères puis quadrilitères, ordre pseudo-aléatoire stable."""
+    for size in (3, 4):
+        combos = ["".join(c) for c in itertools.product(ROOT_LETTERS, repeat=size)]
+        random.Random(size).shuffle(combos)
+        for name in combos:
+            if name not in taken:
+                yield name
+
+
+def zipf_cum_weights(n: int, cache: dict) -> list[float]:
+    """Poids cumulés 1/rang sur n formes (choix de la forme dans une racine)."""
+    if n not in cache:
+        cache[n] = list(itertools.accumulate(1 / rank for rank in range(1, n + 1)))
+    return cache[n]
+
+
+class Rows:
+    """
+    Séquence paresseuse de lignes (dicts) : le document ×100 ne tient pas
+    en mémoire sous forme de dicts, seulement en tableaux d'entiers.
+    """
+
+    def __init__(self, count: int, row):
+        self.count = count
+        self.row = row
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        return (self.row(i) for i in range(self.count))
+
+
+def generate(profile: dict, scale: int, seed: int) -> dict:
+    rng = random.Random(seed)
+
+    # --- 1. Plan des versets : N fois plus de versets par sourate, longueurs empiriques
+    surahs, ayah_surah, ayah_number, ayah_start = [], array("i"), array("i"), array("q", [0])
+    all_lengths = [n for lengths in profile["lengths"].values() for n in lengths]
+    for s in profile["surahs"]:
+        count = s['ayas_count'] * scale
+        surahs.append({**s, "ayas_count": count})
+        lengths = profile["lengths"].get(s['id']) or all_lengths
+        for number, length in enumerate(rng.choices(lengths, k=count), 1):
+            ayah_surah.append(s['id'])
+            ayah_number.append(number)
+            ayah_start.append(ayah_start[-1] + length)
+    slots = ayah_start[-1]
+
+    # --- 2. Vocabulaire de racines : tête réelle + queue de Zipf (Heaps)
+    head = profile["root_freq"]
+    vocabulary = max(len(head), round(len(head) * scale ** profile["heaps"]))
+    zipf_c, zipf_b = profile["zipf"]
+    weights = [float(f) for f in head] + [zipf_c * rank ** zipf_b for rank in range(len(head) + 1, vocabulary + 1)]
+    # Rang 0 = mot sans racine, dans la même proportion que le corpus réel
+    rooted_mass = sum(weights)
+    weights.insert(0, rooted_mass * (1 - profile["rooted_share"]) / profile["rooted_share"])
+    cum_weights = list(itertools.accumulate(weights))
+
+    # --- 3. Tirage de la racine de chaque mot (passe 1)
+    slot_rank = array("i")
+    for start in range(0, slots, 1_000_000):
+        slot_rank.extend(rng.choices(range(len(weights)), cum_weights=cum_weights, k=min(1_000_000, slots - start)))
+    rank_freq = Counter(slot_rank)
+
+    # --- 4. Racines effectivement tirées (les rangs jamais tirés n'existent pas)
+    roots, rank_root = [], {}
+    real_names = {r['buckwalter'] for r in profile["roots"]}
+    names = synthetic_root_names(real_names)
+    next_id = max(r['id'] for r in profile["roots"]) + 1
+    for rank in range(1, vocabulary + 1):
+        if not rank_freq[rank]:
+            continue
+        if rank <= len(head):
+            root = {**profile["roots"][rank - 1]}
+        else:
+            bw = next(names)
+            root = {"id": next_id, "buckwalter": bw, "arabic": buckwalter_to_arabic(bw),
+                    "arabic_display": arabic_root_display(bw)}
+            next_id += 1
+        root["occurrences_count"] = rank_freq[rank]
+        rank_root[rank] = len(roots)
+        roots.append(root)
+
+    # --- 5. Mots : formes fléchies par racine, particules réelles (passe 2)
+    forms_c, forms_b = profile["forms"]
+    taken = {w['form_buckwalter'] for w, _ in profile["rootless"]}
+    pos_values, pos_weights = zip(*profile["pos"].items())
+    rootless_words = [w for w, _ in profile["rootless"]]
+    rootless_cum = list(itertools.accumulate(n for _, n in profile["rootless"]))
+    root_forms = {}          # rang → formes (Buckwalter)
+    word_ids = {}            # (rang, indice de forme) ou ("p", id réel) → word_id
+    words = []
+    zipf_cache = {}
+
+    def root_word(rank: int) -> int:
+        if rank not in root_forms:
+            wanted = max(1, min(len(AFFIXES), rank_freq[rank], round(forms_c * rank_freq[rank] ** forms_b)))
+            bw = roots[rank_root[rank]]['buckwalter']
+            forms = []
+            for prefix, suffix in AFFIXES:
+                form = prefix + bw + suffix
+                if form not in taken:
+                    taken.add(form)
+                    forms.append(form)
+                    if len(forms) == wanted:
+                        break
+            root_forms[rank] = forms
+        forms = root_forms[rank]
+        index = bisect.bisect(zipf_cum_weights(len(forms), zipf_cache), rng.random() * zipf_cache[len(forms)][-1])
+        key = (rank, min(index, len(forms) - 1))
+        if key not in word_ids:
+            root = roots[rank_root[rank]]
+            lemmas = max(1, round(len(forms) * profile["lemma_ratio"]))
+            word_ids[key] = len(words) + 1
+            words.append({
+                "id": len(words) + 1, "form_buckwalter": forms[key[1]], "root_id": root['id'],
+                "root_bw": root['buckwalter'], "lemma_bw": forms[key[1] % lemmas],
+                "pos": rng.choices(pos_values, weights=pos_weights)[0],
+            })
+        return word_ids[key]
+
+    def particle_word() -> int:
+        real = rootless_words[bisect.bisect(rootless_cum, rng.random() * rootless_cum[-1])]
+        key = ("p", real['id'])
+        if key not in word_ids:
+            word_ids[key] = len(words) + 1
+            words.append({**real, "id": len(words) + 1})
+        return word_ids[key]
+
+    slot_word = array("i", (root_word(rank) if rank else particle_word() for rank in slot_rank))
+    word_arabic = [""] + [buckwalter_to_arabic(w['form_buckwalter']) for w in words]
+    surah_of = {s['id']: s['number'] for s in surahs}
+
+    # --- 6. Document final (lignes produites à la demande)
+    def ayah_row(i: int) -> dict:
+        start, end = ayah_start[i], ayah_start[i + 1]
+        return {
+            "id": i + 1, "surah_id": ayah_surah[i], "surah_number": surah_of[ayah_surah[i]],
+            "number": ayah_number[i],
+            "text_arabic": " ".join(word_arabic[w] for w in slot_word[start:end]),
+        }
+
+    slot_ayah = array("i")
+    for i in range(len(ayah_surah)):
+        slot_ayah.extend([i] * (ayah_start[i + 1] - ayah_start[i]))
+
+    def occurrence_row(j: int) -> dict:
+        i = slot_ayah[j]
+        return {
+            "ayah_id": i + 1, "word_id": slot_word[j], "position": j - ayah_start[i] + 1,
+            "surah_number": surah_of[ayah_surah[i]], "ayah_number": ayah_number[i],
+            "root_bw": words[slot_word[j] - 1]['root_bw'],
+        }
+
+    meccan = sum(1 for s in surahs if s['type'] == 'meccan')
+    return {
+        "meta": {
+            "version"  : "1.0.0",
+            "synthetic": {"scale": scale, "seed": seed, "heaps": profile["heaps"], "zipf": list(profile["zipf"])},
+            "stats": {
+                "surahs_total"     : len(surahs),
+                "surahs_meccan"    : meccan,
+                "surahs_medinan"   : len(surahs) - meccan,
+                "ayahs_total"      : len(ayah_surah),
+                "roots_total"      : len(roots),
+                "words_total"      : len(words),
+                "occurrences_total": slots,
+            },
+        },
+        "surahs"     : surahs,
+        "ayahs"      : Rows(len(ayah_surah), ayah_row),
+        "roots"      : roots,
+        "words"      : words,
+        "occurrences": Rows(slots, occurrence_row),
+    }
+
+
+# ============================================================
+# Export
+# ============================================================
+def write_json(final: dict, path: str):
+    """Même structure que wikiquran_final.json, écrite ligne à ligne (sans tout matérialiser)."""
+    tables = ["surahs", "ayahs", "roots", "words", "occurrences"]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n  "meta": ' + json.dumps(final["meta"], ensure_ascii=False))
+        for table in tables:
+            f.write(f',\n  "{table}": [')
+            for i, row in enumerate(final[table]):
+                f.write(("," if i else "") + "\n    " + json.dumps(row, ensure_ascii=False))
+            f.write("\n  ]")
+        f.write("\n}\n")
+
+
+def write_wqc(final: dict, path: str):
+    """
+    Comme normalize.export_artifact : texte normalisé précalculé dans le .wqc,
+    sinon les index de recherche et de concordance de l'API sont vides.
+    """
+    ayahs = final["ayahs"]
+
+    def ayah_row(i: int) -> dict:
+        row = ayahs.row(i)
+        return {**row, "text_normalized": normalize(row["text_arabic"])}
+
+    write_artifact({**final, "ayahs": Rows(len(ayahs), ayah_row)}, path)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="Corpus synthétique ×N calibré sur wikiquran_final")
+    parser.add_argument("--scale", type=int, default=10, help="Facteur d'échelle (nombre de versets ×N)")
+    parser.add_argument("--seed", type=int, default=42, help="Graine du générateur (sortie reproductible)")
+    parser.add_argument("--source", help="Corpus réel (défaut : wikiquran_final.wqc puis .json)")
+    parser.add_argument("--out", help=f"Dossier de sortie (défaut : {OUT_DIR}/x<scale>)")
+    parser.add_argument("--format", choices=["json", "wqc", "both"], default="both", help="Fichier(s) produit(s)")
+    args = parser.parse_args()
+
+    print("\n🕌 WikiQuran — scale_corpus.py\n")
+
+    separator("CALIBRATION")
+    source, path = load_source(args.source)
+    profile = calibrate(source)
+    zipf_c, zipf_b = profile["zipf"]
+    print(f"  Source              : {path}")
+    print(f"  Racines             : {len(profile['roots']):,} (Zipf : f ≈ {zipf_c:,.0f} · rang^{zipf_b:.2f})")
+    print(f"  Heaps (racines)     : β = {profile['heaps']:.2f}")
+    print(f"  Mots avec racine    : {profile['rooted_share'] * 100:.1f}%")
+    print(f"  Formes par racine   : ≈ {profile['forms'][0]:.2f} · fréquence^{profile['forms'][1]:.2f}")
+
+    separator(f"GÉNÉRATION ×{args.scale}")
+    t0 = time.perf_counter()
+    final = generate(profile, args.scale, args.seed)
+    stats = final["meta"]["stats"]
+    print(f"  Versets     : {stats['ayahs_total']:,}")
+    print(f"  Racines     : {stats['roots_total']:,}")
+    print(f"  Mots        : {stats['words_total']:,}")
+    print(f"  Occurrences : {stats['occurrences_total']:,}")
+    print(f"  ⏱️  {time.perf_counter() - t0:.1f} s")
+
+    separator("EXPORT")
+    out_dir = args.out or os.path.join(OUT_DIR, f"x{args.scale}")
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = []
+    if args.format in ("json", "both"):
+        outputs.append((os.path.join(out_dir, "wikiquran_final.json"), write_json))
+    if args.format in ("wqc", "both"):
+        outputs.append((os.path.join(out_dir, "wikiquran_final.wqc"), write_wqc))
+    for out_path, writer in outputs:
+        t0 = time.perf_counter()
+        writer(final, out_path)
+        size_mb = os.path.getsize(out_path) / (1024 * 1024)
+        print(f"  ✅ {out_path} ({size_mb:,.1f} Mo, {time.perf_counter() - t0:.1f} s)")
+
+    print(f"\n✅ scale_corpus.py terminé → import_postgres.py --data {outputs[-1][0]}\n")
+
+
+if __name__ == "__main__":
+    main()
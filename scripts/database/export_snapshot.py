@@ -0,0 +1,212 @@
+"""
+WikiQuran — scripts/database/export_snapshot.py
+Exporte un jeu de données PostgreSQL dans un fichier SQLite autonome, en
+lecture seule, servi par l'API en mode instantané (DATA_SNAPSHOT) : réplicas
+sans PostgreSQL ni Neo4j, à dupliquer derrière le proxy.
+
+Contenu : toutes les tables des modèles de l'API (mêmes colonnes, mêmes
+index), dont ayah_pair (poids SHARES_ROOT), plus :
+  - root_ayah_count : versets distincts par racine et période (analytique) ;
+  - snapshot_info   : version, schéma source, date d'export.
+Les index en mémoire (recherche, co-occurrence…) sont reconstruits au
+démarrage depuis ces tables, comme depuis PostgreSQL.
+
+Le fichier est écrit à côté puis renommé (jamais de fichier partiel servi),
+compacté (VACUUM) et passé en lecture seule.
+
+    1. python scripts/database/import_postgres.py --schema wq_20250301
+    2. python scripts/database/export_snapshot.py --pg-schema wq_20250301
+    3. DATA_SNAPSHOT=data/snapshots/wikiquran_wq_20250301.sqlite uvicorn app.main:app
+
+Usage : python scripts/database/export_snapshot.py [--pg-schema NOM] [--version V] [--out FICHIER]
+"""
+
+import argparse
+import os
+import stat
+import sys
+import time
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+
+# Import du code de l'API (backend/app) — mêmes modèles qu'en production
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(ROOT_DIR, "backend"))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.progress import Progress
+
+load_dotenv()
+
+# ============================================================
+# Configuration
+# ============================================================
+SNAPSHOT_DIR = "data/snapshots"
+
+BATCH_SIZE = 5000
+
+# Tables propres à l'instantané (calculées ici, absentes de PostgreSQL)
+SNAPSHOT_TABLES = {"root_ayah_count", "snapshot_info"}
+
+ROOT_AYAH_COUNT_SQL = """
+    INSERT INTO root_ayah_count (root_id, period, ayah_count)
+    SELECT w.root_id, 'all', COUNT(DISTINCT o.ayah_id)
+    FROM word_occurrence o
+    JOIN word w ON w.id = o.word_id
+    WHERE w.root_id IS NOT NULL
+    GROUP BY w.root_id
+    UNION ALL
+    SELECT w.root_id, s.type, COUNT(DISTINCT o.ayah_id)
+    FROM word_occurrence o
+    JOIN word w  ON w.id = o.word_id
+    JOIN ayah a  ON a.id = o.ayah_id
+    JOIN surah s ON s.id = a.surah_id
+    WHERE w.root_id IS NOT NULL
+    GROUP BY w.root_id, s.type
+"""
+
+
+def separator(title: str):
+    print(f"\n{'=' * 60}")
+    print(f"  {title}")
+    print(f"{'=' * 60}\n")
+
+
+# ============================================================
+# Copie des tables
+# ============================================================
+def create_target(path: str):
+    """Base SQLite vide avec le schéma des modèles (écriture sans journal : fichier jetable jusqu'au renommage)."""
+    from sqlalchemy import create_engine, event
+    from app.database import Base
+    from app.models import ayah, ayah_pair, root, root_ayah_count, snapshot_info, surah, word, word_occurrence  # noqa
+
+    engine = create_engine(f"sqlite:///{path}")
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode = OFF")
+        cursor.execute("PRAGMA synchronous = OFF")
+        cursor.close()
+
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def copy_tables(db, target) -> dict[str, int]:
+    """Copie chaque table dans l'ordre des FK, par lots, triée par clé primaire."""
+    from sqlalchemy import func, insert, select
+    from app.database import Base
+
+    counts = {}
+    for table in Base.metadata.sorted_tables:
+        if table.name in SNAPSHOT_TABLES:
+            continue
+        total = db.execute(select(func.count()).select_from(table)).scalar()
+        progress = Progress(table.name, total)
+        done = 0
+        # Ordre de la clé primaire : ayah_pair regroupée par verset, comme dans PostgreSQL
+        rows = db.execute(select(table).order_by(*table.primary_key.columns)).yield_per(BATCH_SIZE)
+        with target.begin() as conn:
+            for batch in rows.partitions():
+                conn.execute(insert(table), [row._asdict() for row in batch])
+                done += len(batch)
+                progress.update(done)
+        progress.finish()
+        counts[table.name] = done
+    return counts
+
+
+# ============================================================
+# Précalculs et métadonnées
+# ============================================================
+def precompute(target, info: dict[str, str]):
+    from sqlalchemy import insert, text
+    from app.models.snapshot_info import SnapshotInfo
+
+    with target.begin() as conn:
+        conn.execute(text(ROOT_AYAH_COUNT_SQL))
+        conn.execute(insert(SnapshotInfo), [{"key": k, "value": v} for k, v in info.items()])
+        roots = conn.execute(text("SELECT count(*) FROM root_ayah_count WHERE period = 'all'")).scalar()
+    print(f"  ✅ root_ayah_count : {roots:,} racines")
+
+
+def finalize(target, tmp_path: str, out_path: str):
+    """Statistiques du planificateur, compactage, lecture seule, renommage atomique."""
+    from sqlalchemy import text
+
+    with target.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        conn.commit()
+        conn.execute(text("VACUUM"))
+    target.dispose()
+
+    os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    os.replace(tmp_path, out_path)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export d'un jeu de données en instantané SQLite")
+    parser.add_argument("--pg-schema", help="Schéma à exporter (défaut : jeu actif de public.dataset_pointer)")
+    parser.add_argument("--version", help="Version de l'instantané (défaut : celle du pointeur, ou le schéma)")
+    parser.add_argument("--out", help=f"Fichier produit (défaut : {SNAPSHOT_DIR}/wikiquran_<version>.sqlite)")
+    args = parser.parse_args()
+
+    from app.config import settings
+    from app.database import open_pg_session, read_dataset_pointer
+
+    print("\n🕌 WikiQuran — export_snapshot.py\n")
+
+    if settings.DATA_SNAPSHOT:
+        print("  ❌ DATA_SNAPSHOT est défini : l'export lit PostgreSQL, le vider pour ce script")
+        sys.exit(1)
+
+    public = open_pg_session("public")
+    try:
+        pointer = read_dataset_pointer(public)
+    finally:
+        public.close()
+    pg_schema = args.pg_schema or pointer.pg_schema
+    version = args.version or (pointer.version if pg_schema == pointer.pg_schema else pg_schema)
+    out_path = args.out or os.path.join(SNAPSHOT_DIR, f"wikiquran_{version}.sqlite")
+    tmp_path = out_path + ".tmp"
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    started = time.perf_counter()
+    db = open_pg_session(pg_schema)
+    target = create_target(tmp_path)
+    try:
+        separator(f"Copie du schéma {pg_schema}")
+        counts = copy_tables(db, target)
+
+        separator("Précalculs")
+        precompute(target, {
+            "version"    : version,
+            "pg_schema"  : pg_schema,
+            "exported_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "app_version": settings.APP_VERSION,
+        })
+
+        separator("Finalisation")
+        finalize(target, tmp_path, out_path)
+    except Exception as e:
+        print(f"\n  ❌ Erreur durant l'export : {e}")
+        target.dispose()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        db.close()
+
+    for name, count in counts.items():
+        print(f"  {name:<20} {count:>12,}")
+    size_mb = os.path.getsize(out_path) / 2 ** 20
+    print(f"\n✅ export_snapshot.py terminé en {time.perf_counter() - started:.1f} s")
+    print(f"   → {out_path} ({size_mb:.1f} Mo, version {version})")
+    print(f"   → API en lecture seule : DATA_SNAPSHOT={out_path}\n")
@@ -6,16 +6,37 @@ Crée les nœuds, les relations, et calcule SHARES_ROOT.
 Règle fondamentale : Neo4j est reconstruit depuis PostgreSQL.
                      pg_id = pont vers la source de vérité.
 
-Usage : python scripts/database/import_neo4j.py
+Mode --delta : compare les empreintes content_hash de PostgreSQL à celles
+stockées sur les nœuds, et ne resynchronise que les racines, mots et versets
+modifiés — SHARES_ROOT n'est recalculé que pour les versets touchés.
+
+Import complet repris après interruption : chaque lot validé dans Neo4j est
+enregistré dans un fichier d'état (étape + nombre de lignes), --resume repart
+du dernier lot validé au lieu de tout recommencer.
+
+Bascule bleu/vert : --pg-schema lit un schéma importé par import_postgres.py --schema,
+--database écrit dans une base Neo4j dédiée (créée si besoin — Neo4j Enterprise ;
+en Community, viser une seconde instance via NEO4J_URI). switch_dataset.py bascule ensuite l'API.
+
+Usage : python scripts/database/import_neo4j.py [--delta | --resume]
+                                                [--pg-schema wq_20250301] [--database wq20250301]
 """
 
+import argparse
+import json
 import os
 import sys
+from datetime import datetime, timezone
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
 
+# Import des utilitaires partagés (empreintes de contenu, progression)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.content_hash import refresh_content_hashes
+from utils.progress import Progress
+
 load_dotenv()
 
 # ============================================================
@@ -33,9 +54,25 @@ NEO4J_URI      = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER     = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 
+# Cibles de l'import — surchargées par --pg-schema / --database
+PG_SCHEMA      = "public"
+NEO4J_DATABASE = os.getenv("NEO4J_DATABASE") or None   # None = base par défaut
+
 # Batch size pour les imports Neo4j
 BATCH_SIZE = 500
 
+# Versets par transaction lors de la suppression de leurs SHARES_ROOT
+# (un verset porte en moyenne ~2 000 relations)
+DELTA_DELETE_BATCH = 50
+
+DELTA_REPORT = "data/quran_enriched/neo4j_delta_report.json"
+
+# Points de reprise de l'import complet
+STATE_FILE = "data/quran_enriched/.neo4j_import_state.json"
+
+# Labels synchronisés par empreinte → table PostgreSQL
+HASHED_LABELS = {"Root": "root", "Word": "word", "Ayah": "ayah"}
+
 
 def separator(title: str):
     print(f"\n{'=' * 60}")
@@ -49,8 +86,9 @@ def separator(title: str):
 def get_pg_connection():
     """Connexion PostgreSQL."""
     try:
-        conn = psycopg2.connect(**PG_CONFIG, cursor_factory=RealDictCursor)
-        print(f"  ✅ PostgreSQL connecté — {PG_CONFIG['dbname']}")
+        conn = psycopg2.connect(**PG_CONFIG, cursor_factory=RealDictCursor,
+                                options=f"-c search_path={PG_SCHEMA},public")
+        print(f"  ✅ PostgreSQL connecté — {PG_CONFIG['dbname']} (schéma {PG_SCHEMA})")
         return conn
     except psycopg2.OperationalError as e:
         print(f"  ❌ PostgreSQL : {e}")
@@ -65,13 +103,191 @@ def get_neo4j_driver():
             auth=(NEO4J_USER, NEO4J_PASSWORD)
         )
         driver.verify_connectivity()
-        print(f"  ✅ Neo4j connecté — {NEO4J_URI}")
+        print(f"  ✅ Neo4j connecté — {NEO4J_URI} (base {NEO4J_DATABASE or 'par défaut'})")
         return driver
     except Exception as e:
         print(f"  ❌ Neo4j : {e}")
         sys.exit(1)
 
 
+def open_session(driver):
+    """Session sur la base Neo4j cible de l'import."""
+    return driver.session(database=NEO4J_DATABASE)
+
+
+def ensure_database(driver):
+    """Crée la base cible si elle n'existe pas (commande d'administration, Enterprise)."""
+    if NEO4J_DATABASE is None:
+        return
+    try:
+        with driver.session(database="system") as session:
+            session.run("CREATE DATABASE $name IF NOT EXISTS WAIT", name=NEO4J_DATABASE).consume()
+        print(f"  ✅ Base Neo4j {NEO4J_DATABASE} prête")
+    except Exception as e:
+        print(f"  ❌ Création de la base {NEO4J_DATABASE} impossible : {e}")
+        print("     → Neo4j Community n'a qu'une base : importer dans une seconde instance")
+        print("       (NEO4J_URI=bolt://<instance-inactive>:7687) sans --database")
+        sys.exit(1)
+
+
+def import_target() -> str:
+    """Identifie la cible (le point de reprise ne vaut que pour elle)."""
+    return f"{PG_SCHEMA} → {NEO4J_URI}/{NEO4J_DATABASE or 'default'}"
+
+
+# ============================================================
+# Points de reprise
+# ============================================================
+class Checkpoint:
+    """
+    État de l'import complet, par étape : lignes validées dans Neo4j, total, terminé.
+    Réécrit après chaque lot (fichier temporaire + os.replace : jamais à moitié écrit).
+    Les lectures PostgreSQL sont triées (ORDER BY) : un même décalage désigne
+    les mêmes lignes d'une exécution à l'autre, et MERGE rend un lot rejoué sans effet.
+    """
+
+    def __init__(self, path: str, resume: bool, target: str):
+        self.path = path
+        self.state = {"started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                      "target": target, "stages": {}}
+        saved = None
+        if resume and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+        if saved and saved.get("target") == target:
+            self.state = saved
+            print(f"  ♻️  Reprise de l'import commencé le {self.state['started_at']}")
+        elif saved:
+            print(f"  ⚠️  Point de reprise pour une autre cible ({saved.get('target')}) — import complet")
+        elif resume:
+            print(f"  ⚠️  Aucun point de reprise ({path}) — import complet")
+        self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def is_done(self, stage: str) -> bool:
+        return self.state["stages"].get(stage, {}).get("done", False)
+
+    def start(self, stage: str, total: int) -> int:
+        """Décalage de reprise d'une étape (0 si nouvelle ou si les données ont changé)."""
+        entry = self.state["stages"].get(stage)
+        offset = 0
+        if entry and entry["total"] == total:
+            offset = entry["offset"]
+        elif entry:
+            print(f"  ⚠️  {stage} : {entry['total']:,} lignes au dernier passage, "
+                  f"{total:,} maintenant — étape reprise depuis le début")
+        if offset:
+            print(f"  ♻️  {stage} : reprise à la ligne {offset:,}/{total:,}")
+        self.state["stages"][stage] = {"offset": offset, "total": total, "done": False}
+        self._save()
+        return offset
+
+    def advance(self, stage: str, offset: int):
+        self.state["stages"][stage]["offset"] = offset
+        self._save()
+
+    def finish(self, stage: str):
+        self.state["stages"].setdefault(stage, {"offset": 0, "total": 0})["done"] = True
+        self._save()
+
+    def skip(self, stage: str) -> bool:
+        """Vrai (et message) si l'étape est déjà terminée."""
+        if self.is_done(stage):
+            print(f"  ♻️  {stage} déjà importé — étape sautée")
+            return True
+        return False
+
+
+def run_batches(driver, checkpoint: Checkpoint, stage: str, label: str,
+                rows: list, queries: list[str]):
+    """
+    Envoie les lignes par lots (toutes les requêtes pour chaque lot), à partir du
+    dernier lot validé. consume() attend la validation de la transaction avant
+    d'avancer le point de reprise.
+    """
+    total = len(rows)
+    offset = checkpoint.start(stage, total)
+    progress = Progress(label, total, start=offset)
+
+    with open_session(driver) as session:
+        for i in range(offset, total, BATCH_SIZE):
+            batch = rows[i:i + BATCH_SIZE]
+            for query in queries:
+                session.run(query, batch=batch).consume()
+            done = min(i + BATCH_SIZE, total)
+            checkpoint.advance(stage, done)
+            progress.update(done)
+
+    progress.finish()
+    checkpoint.finish(stage)
+
+
+# ============================================================
+# Empreintes de contenu (PostgreSQL → nœuds)
+# ============================================================
+def refresh_pg_hashes(pg_conn):
+    """
+    Recalcule content_hash côté PostgreSQL avant de lire les données :
+    les corrections faites directement en SQL sont ainsi prises en compte.
+    """
+    separator("Empreintes PostgreSQL")
+
+    with pg_conn.cursor() as cur:
+        changed = refresh_content_hashes(cur)
+    pg_conn.commit()
+
+    for table, count in changed.items():
+        print(f"  ✅ {table:<6} : {count:>6} empreintes mises à jour")
+
+
+def pg_hashes(pg_conn, label: str) -> dict[int, str]:
+    """pg_id → content_hash pour les lignes projetées dans Neo4j sous ce label."""
+    table = HASHED_LABELS[label]
+    where = ""
+    if label == "Word":
+        # Seuls les mots ayant au moins une occurrence deviennent des nœuds Word
+        where = "WHERE EXISTS (SELECT 1 FROM word_occurrence wo WHERE wo.word_id = t.id)"
+    with pg_conn.cursor() as cur:
+        cur.execute(f"SELECT t.id, t.content_hash FROM {table} t {where}")
+        return {row['id']: row['content_hash'] for row in cur.fetchall()}
+
+
+def mark_synced(driver, label: str, hashes: dict[int, str]):
+    """
+    Recopie les empreintes PostgreSQL sur les nœuds.
+    Appelé en dernier : une synchronisation interrompue laisse les anciennes
+    empreintes, et le prochain --delta reprend les mêmes lignes.
+    """
+    rows = [{"id": pg_id, "hash": h} for pg_id, h in hashes.items()]
+    query = f"""
+        UNWIND $batch AS x
+        MATCH (n:{label} {{pg_id: x.id}})
+        SET n.content_hash = x.hash
+    """
+    with open_session(driver) as session:
+        for i in range(0, len(rows), BATCH_SIZE):
+            session.run(query, batch=rows[i:i + BATCH_SIZE])
+
+
+def mark_all_synced(driver, pg_conn, checkpoint: Checkpoint):
+    """Fin d'import complet : toutes les lignes sont à jour dans le graphe."""
+    separator("Empreintes Neo4j")
+    if checkpoint.skip("hashes"):
+        return
+
+    for label in HASHED_LABELS:
+        hashes = pg_hashes(pg_conn, label)
+        mark_synced(driver, label, hashes)
+        print(f"  ✅ {label:<5} : {len(hashes):>6} empreintes enregistrées")
+    checkpoint.finish("hashes")
+
+
 # ============================================================
 # ÉTAPE 1 — Contraintes et index
 # ============================================================
@@ -92,7 +308,7 @@ def create_constraints(driver):
         "CREATE INDEX idx_surah_type   IF NOT EXISTS FOR (s:Surah) ON (s.type)",
     ]
 
-    with driver.session() as session:
+    with open_session(driver) as session:
         for q in queries:
             session.run(q)
             label = q.split("FOR")[1].split("REQUIRE")[0].strip()
@@ -104,9 +320,11 @@ def create_constraints(driver):
 # ============================================================
 # ÉTAPE 2 — Nœuds Surah
 # ============================================================
-def import_surah_nodes(driver, pg_conn):
+def import_surah_nodes(driver, pg_conn, checkpoint: Checkpoint | None = None):
     """Importe les nœuds Surah depuis PostgreSQL."""
     separator("ÉTAPE 2 — Nœuds Surah")
+    if checkpoint and checkpoint.skip("surah"):
+        return
 
     with pg_conn.cursor() as cur:
         cur.execute("SELECT id, number, name_arabic, revelation_order, type, ayas_count FROM surah ORDER BY number")
@@ -122,34 +340,37 @@ def import_surah_nodes(driver, pg_conn):
             n.ayas_count       = s.ayas_count
     """
 
-    with driver.session() as session:
-        session.run(query, batch=rows)
+    with open_session(driver) as session:
+        session.run(query, batch=rows).consume()
 
+    if checkpoint:
+        checkpoint.finish("surah")
     print(f"  ✅ {len(rows)} nœuds Surah importés")
 
 
 # ============================================================
 # ÉTAPE 3 — Nœuds Root
 # ============================================================
-def import_root_nodes(driver, pg_conn):
+ROOT_QUERY = """
+    UNWIND $batch AS r
+    MERGE (n:Root {buckwalter: r.buckwalter})
+    SET n.pg_id             = r.id,
+        n.arabic            = r.arabic,
+        n.occurrences_count = r.occurrences_count
+"""
+
+
+def import_root_nodes(driver, pg_conn, checkpoint: Checkpoint):
     """Importe les nœuds Root depuis PostgreSQL."""
     separator("ÉTAPE 3 — Nœuds Root")
+    if checkpoint.skip("root"):
+        return
 
     with pg_conn.cursor() as cur:
         cur.execute("SELECT id, buckwalter, arabic, occurrences_count FROM root ORDER BY id")
         rows = [dict(r) for r in cur.fetchall()]
 
-    query = """
-        UNWIND $batch AS r
-        MERGE (n:Root {buckwalter: r.buckwalter})
-        SET n.pg_id             = r.id,
-            n.arabic            = r.arabic,
-            n.occurrences_count = r.occurrences_count
-    """
-
-    with driver.session() as session:
-        for i in range(0, len(rows), BATCH_SIZE):
-            session.run(query, batch=rows[i:i + BATCH_SIZE])
+    run_batches(driver, checkpoint, "root", "Root", rows, [ROOT_QUERY])
 
     print(f"  ✅ {len(rows)} nœuds Root importés")
 
@@ -157,99 +378,129 @@ def import_root_nodes(driver, pg_conn):
 # ============================================================
 # ÉTAPE 4 — Nœuds Ayah + relation HAS_AYAH
 # ============================================================
-def import_ayah_nodes(driver, pg_conn):
+AYAH_SQL = """
+    SELECT a.id, a.surah_id, a.number AS ayah_number,
+           s.number AS surah_number
+    FROM ayah a
+    JOIN surah s ON s.id = a.surah_id
+    {where}
+    ORDER BY a.id
+"""
+
+AYAH_QUERY = """
+    UNWIND $batch AS a
+    MERGE (n:Ayah {pg_id: a.id})
+    SET n.surah_number = a.surah_number,
+        n.ayah_number  = a.ayah_number
+
+    WITH n, a
+    MATCH (s:Surah {pg_id: a.surah_id})
+    MERGE (s)-[:HAS_AYAH]->(n)
+"""
+
+
+def import_ayah_nodes(driver, pg_conn, checkpoint: Checkpoint):
     """Importe les nœuds Ayah et crée HAS_AYAH depuis Surah."""
     separator("ÉTAPE 4 — Nœuds Ayah + HAS_AYAH")
+    if checkpoint.skip("ayah"):
+        return
 
     with pg_conn.cursor() as cur:
-        cur.execute("""
-            SELECT a.id, a.surah_id, a.number AS ayah_number,
-                   s.number AS surah_number
-            FROM ayah a
-            JOIN surah s ON s.id = a.surah_id
-            ORDER BY a.id
-        """)
+        cur.execute(AYAH_SQL.format(where=""))
         rows = [dict(r) for r in cur.fetchall()]
 
-    query = """
-        UNWIND $batch AS a
-        MERGE (n:Ayah {pg_id: a.id})
-        SET n.surah_number = a.surah_number,
-            n.ayah_number  = a.ayah_number
-
-        WITH n, a
-        MATCH (s:Surah {pg_id: a.surah_id})
-        MERGE (s)-[:HAS_AYAH]->(n)
-    """
-
-    total = len(rows)
-    with driver.session() as session:
-        for i in range(0, total, BATCH_SIZE):
-            session.run(query, batch=rows[i:i + BATCH_SIZE])
-            done = min(i + BATCH_SIZE, total)
-            if done % 2000 == 0 or done == total:
-                print(f"  ⏳ {done}/{total} ({done*100//total}%)")
+    run_batches(driver, checkpoint, "ayah", "Ayah", rows, [AYAH_QUERY])
 
-    print(f"  ✅ {total} nœuds Ayah + relations HAS_AYAH importés")
+    print(f"  ✅ {len(rows)} nœuds Ayah + relations HAS_AYAH importés")
 
 
 # ============================================================
 # ÉTAPE 5 — Nœuds Word + relations CONTAINS + DERIVED_FROM
 # ============================================================
-def import_word_nodes(driver, pg_conn):
+OCCURRENCE_SQL = """
+    SELECT w.id, w.text_arabic, w.pos,
+           r.buckwalter AS root_bw,
+           wo.ayah_id, wo.position
+    FROM word w
+    JOIN word_occurrence wo ON wo.word_id = w.id
+    LEFT JOIN root r ON r.id = w.root_id
+    {where}
+    ORDER BY wo.ayah_id, wo.position
+"""
+
+# Nœuds Word (uniques)
+WORD_QUERY = """
+    UNWIND $batch AS w
+    MERGE (n:Word {pg_id: w.id})
+    SET n.text_arabic = w.text_arabic,
+        n.pos         = w.pos
+"""
+
+# Relations CONTAINS + DERIVED_FROM
+RELATIONS_QUERY = """
+    UNWIND $batch AS w
+    MATCH (a:Ayah    {pg_id: w.ayah_id})
+    MATCH (wn:Word   {pg_id: w.id})
+    MERGE (a)-[:CONTAINS {position: w.position}]->(wn)
+
+    WITH wn, w
+    WHERE w.root_bw IS NOT NULL
+    MATCH (r:Root {buckwalter: w.root_bw})
+    MERGE (wn)-[:DERIVED_FROM]->(r)
+"""
+
+
+def import_word_nodes(driver, pg_conn, checkpoint: Checkpoint):
     """Importe Word et crée CONTAINS (Ayah→Word) et DERIVED_FROM (Word→Root)."""
     separator("ÉTAPE 5 — Nœuds Word + CONTAINS + DERIVED_FROM")
+    if checkpoint.skip("word"):
+        return
 
     with pg_conn.cursor() as cur:
-        cur.execute("""
-            SELECT w.id, w.text_arabic, w.pos,
-                   r.buckwalter AS root_bw,
-                   wo.ayah_id, wo.position
-            FROM word w
-            JOIN word_occurrence wo ON wo.word_id = w.id
-            LEFT JOIN root r ON r.id = w.root_id
-            ORDER BY wo.ayah_id, wo.position
-        """)
+        cur.execute(OCCURRENCE_SQL.format(where=""))
         rows = [dict(r) for r in cur.fetchall()]
 
-    # Nœuds Word (uniques)
-    query_words = """
-        UNWIND $batch AS w
-        MERGE (n:Word {pg_id: w.id})
-        SET n.text_arabic = w.text_arabic,
-            n.pos         = w.pos
-    """
+    run_batches(driver, checkpoint, "word", "Word", rows, [WORD_QUERY, RELATIONS_QUERY])
 
-    # Relations CONTAINS + DERIVED_FROM
-    query_relations = """
-        UNWIND $batch AS w
-        MATCH (a:Ayah    {pg_id: w.ayah_id})
-        MATCH (wn:Word   {pg_id: w.id})
-        MERGE (a)-[:CONTAINS {position: w.position}]->(wn)
-
-        WITH wn, w
-        WHERE w.root_bw IS NOT NULL
-        MATCH (r:Root {buckwalter: w.root_bw})
-        MERGE (wn)-[:DERIVED_FROM]->(r)
-    """
-
-    total = len(rows)
-    with driver.session() as session:
-        for i in range(0, total, BATCH_SIZE):
-            batch = rows[i:i + BATCH_SIZE]
-            session.run(query_words, batch=batch)
-            session.run(query_relations, batch=batch)
-            done = min(i + BATCH_SIZE, total)
-            if done % 10000 == 0 or done == total:
-                print(f"  ⏳ {done}/{total} ({done*100//total}%)")
-
-    print(f"  ✅ {total} Word + CONTAINS + DERIVED_FROM importés")
+    print(f"  ✅ {len(rows)} Word + CONTAINS + DERIVED_FROM importés")
 
 
 # ============================================================
 # ÉTAPE 6 — Calcul SHARES_ROOT (la relation analytique clé)
 # ============================================================
-def compute_shares_root(driver, pg_conn):
+# On calcule les paires de versets partageant une racine directement en SQL
+# C'est beaucoup plus rapide que de le faire dans Neo4j
+# {filter} : restriction optionnelle aux paires touchant certains versets (mode delta)
+SHARES_ROOT_SQL = """
+    SELECT
+        wo1.ayah_id   AS ayah1_id,
+        wo2.ayah_id   AS ayah2_id,
+        r.buckwalter  AS root_bw,
+        r.arabic      AS root_arabic,
+        COUNT(*)      AS shared_count
+    FROM word_occurrence wo1
+    JOIN word w1 ON w1.id = wo1.word_id AND w1.root_id IS NOT NULL
+    JOIN word_occurrence wo2 ON wo2.word_id != wo1.word_id
+    JOIN word w2 ON w2.id = wo2.word_id AND w2.root_id = w1.root_id
+    JOIN root r ON r.id = w1.root_id
+    WHERE wo1.ayah_id < wo2.ayah_id  -- éviter les doublons A→B et B→A
+    {filter}
+    GROUP BY wo1.ayah_id, wo2.ayah_id, r.buckwalter, r.arabic
+    HAVING COUNT(*) >= 1
+    ORDER BY wo1.ayah_id, wo2.ayah_id, r.buckwalter  -- ordre total : décalage de reprise stable
+"""
+
+SHARES_ROOT_QUERY = """
+    UNWIND $batch AS sr
+    MATCH (a1:Ayah {pg_id: sr.ayah1_id})
+    MATCH (a2:Ayah {pg_id: sr.ayah2_id})
+    MERGE (a1)-[r:SHARES_ROOT {root_bw: sr.root_bw}]->(a2)
+    SET r.root_arabic = sr.root_arabic,
+        r.count       = sr.shared_count
+"""
+
+
+def compute_shares_root(driver, pg_conn, checkpoint: Checkpoint):
     """
     Calcule et crée la relation SHARES_ROOT entre versets.
     Deux versets sont connectés s'ils partagent au moins une racine.
@@ -258,56 +509,247 @@ def compute_shares_root(driver, pg_conn):
     C'est la relation différenciante de WikiQuran.
     """
     separator("ÉTAPE 6 — Calcul SHARES_ROOT")
+    if checkpoint.skip("shares_root"):
+        return
 
     print("  ⏳ Calcul des racines partagées depuis PostgreSQL...")
 
-    # On calcule les paires de versets partageant une racine directement en SQL
-    # C'est beaucoup plus rapide que de le faire dans Neo4j
     with pg_conn.cursor() as cur:
-        cur.execute("""
-            SELECT
-                wo1.ayah_id   AS ayah1_id,
-                wo2.ayah_id   AS ayah2_id,
-                r.buckwalter  AS root_bw,
-                r.arabic      AS root_arabic,
-                COUNT(*)      AS shared_count
-            FROM word_occurrence wo1
-            JOIN word w1 ON w1.id = wo1.word_id AND w1.root_id IS NOT NULL
-            JOIN word_occurrence wo2 ON wo2.word_id != wo1.word_id
-            JOIN word w2 ON w2.id = wo2.word_id AND w2.root_id = w1.root_id
-            JOIN root r ON r.id = w1.root_id
-            WHERE wo1.ayah_id < wo2.ayah_id  -- éviter les doublons A→B et B→A
-            GROUP BY wo1.ayah_id, wo2.ayah_id, r.buckwalter, r.arabic
-            HAVING COUNT(*) >= 1
-            ORDER BY wo1.ayah_id, wo2.ayah_id
-        """)
+        cur.execute(SHARES_ROOT_SQL.format(filter=""))
         rows = [dict(r) for r in cur.fetchall()]
 
     print(f"  ✅ {len(rows):,} paires de versets avec racines communes calculées")
 
     # Import dans Neo4j par batch
-    query = """
-        UNWIND $batch AS sr
-        MATCH (a1:Ayah {pg_id: sr.ayah1_id})
-        MATCH (a2:Ayah {pg_id: sr.ayah2_id})
-        MERGE (a1)-[r:SHARES_ROOT {root_bw: sr.root_bw}]->(a2)
-        SET r.root_arabic = sr.root_arabic,
-            r.count       = sr.shared_count
-    """
-
     total = len(rows)
     print(f"  ⏳ Import SHARES_ROOT dans Neo4j...")
 
-    with driver.session() as session:
-        for i in range(0, total, BATCH_SIZE):
-            session.run(query, batch=rows[i:i + BATCH_SIZE])
-            done = min(i + BATCH_SIZE, total)
-            if done % 50000 == 0 or done == total:
-                print(f"  ⏳ {done:>7}/{total:,} ({done*100//total}%)")
+    run_batches(driver, checkpoint, "shares_root", "SHARES_ROOT", rows, [SHARES_ROOT_QUERY])
 
     print(f"  ✅ {total:,} relations SHARES_ROOT créées")
 
 
+# ============================================================
+# MODE DELTA — ne resynchroniser que ce qui a changé
+# ============================================================
+def neo4j_hashes(driver, label: str) -> dict[int, str | None]:
+    """pg_id → content_hash des nœuds existants."""
+    with open_session(driver) as session:
+        result = session.run(f"MATCH (n:{label}) RETURN n.pg_id AS id, n.content_hash AS hash")
+        return {record['id']: record['hash'] for record in result}
+
+
+def diff_label(driver, pg_conn, label: str) -> tuple[dict[int, str], list[int]]:
+    """
+    Compare les empreintes : (lignes nouvelles ou modifiées → empreinte, pg_id supprimés).
+    Un nœud sans empreinte (import antérieur au suivi) compte comme modifié.
+    """
+    source = pg_hashes(pg_conn, label)
+    graph = neo4j_hashes(driver, label)
+    changed = {pg_id: h for pg_id, h in source.items() if graph.get(pg_id) != h}
+    deleted = sorted(pg_id for pg_id in graph if pg_id not in source)
+    return changed, deleted
+
+
+def delete_nodes(session, label: str, ids: list[int]):
+    """DETACH DELETE des nœuds supprimés côté PostgreSQL (et de leurs relations)."""
+    for i in range(0, len(ids), DELTA_DELETE_BATCH):
+        session.run(
+            f"UNWIND $ids AS id MATCH (n:{label} {{pg_id: id}}) DETACH DELETE n",
+            ids=ids[i:i + DELTA_DELETE_BATCH],
+        )
+
+
+def delta_roots(session, pg_conn, ids: list[int]) -> int:
+    """
+    Racines modifiées : propriétés du nœud, et root_arabic recopié sur leurs SHARES_ROOT.
+    Un changement de buckwalter recrée le nœud (clé d'unicité) ; les versets concernés
+    changent alors d'empreinte et leurs relations sont reconstruites plus loin.
+    """
+    with pg_conn.cursor() as cur:
+        cur.execute(
+            "SELECT id, buckwalter, arabic, occurrences_count FROM root WHERE id = ANY(%s) ORDER BY id",
+            (ids,),
+        )
+        rows = [dict(r) for r in cur.fetchall()]
+
+    for i in range(0, len(rows), BATCH_SIZE):
+        batch = rows[i:i + BATCH_SIZE]
+        session.run("""
+            UNWIND $batch AS r
+            MATCH (n:Root {pg_id: r.id})
+            WHERE n.buckwalter <> r.buckwalter
+            DETACH DELETE n
+        """, batch=batch)
+        session.run(ROOT_QUERY, batch=batch)
+
+    # Les SHARES_ROOT d'une racine partent des versets qui la contiennent :
+    # on les atteint par le graphe, sans parcourir les 6 M de relations
+    edges = 0
+    for r in rows:
+        result = session.run("""
+            MATCH (:Root {buckwalter: $bw})<-[:DERIVED_FROM]-(:Word)<-[:CONTAINS]-(a:Ayah)
+            WITH DISTINCT a
+            MATCH (a)-[e:SHARES_ROOT {root_bw: $bw}]->()
+            SET e.root_arabic = $arabic
+            RETURN count(e) AS c
+        """, bw=r['buckwalter'], arabic=r['arabic'])
+        edges += result.single()['c']
+    return edges
+
+
+def delta_words(session, pg_conn, ids: list[int]):
+    """Mots modifiés : propriétés du nœud et DERIVED_FROM reconstruite."""
+    with pg_conn.cursor() as cur:
+        cur.execute("""
+            SELECT w.id, w.text_arabic, w.pos, r.buckwalter AS root_bw
+            FROM word w
+            LEFT JOIN root r ON r.id = w.root_id
+            WHERE w.id = ANY(%s)
+            ORDER BY w.id
+        """, (ids,))
+        rows = [dict(r) for r in cur.fetchall()]
+
+    query = """
+        UNWIND $batch AS w
+        MERGE (n:Word {pg_id: w.id})
+        SET n.text_arabic = w.text_arabic,
+            n.pos         = w.pos
+
+        WITH n, w
+        OPTIONAL MATCH (n)-[d:DERIVED_FROM]->()
+        DELETE d
+
+        WITH DISTINCT n, w
+        WHERE w.root_bw IS NOT NULL
+        MATCH (r:Root {buckwalter: w.root_bw})
+        MERGE (n)-[:DERIVED_FROM]->(r)
+    """
+    for i in range(0, len(rows), BATCH_SIZE):
+        session.run(query, batch=rows[i:i + BATCH_SIZE])
+
+
+def delta_ayahs(session, pg_conn, ids: list[int]) -> tuple[int, int, int]:
+    """
+    Versets modifiés : nœud, HAS_AYAH et CONTAINS reconstruits, puis SHARES_ROOT
+    supprimées et recalculées pour les seules paires qui touchent ces versets.
+    Les paires entre deux versets inchangés ont les mêmes racines : rien à faire.
+    Retourne (CONTAINS recréées, SHARES_ROOT supprimées, SHARES_ROOT créées).
+    """
+    where = "WHERE a.id = ANY(%(ids)s)"
+    params = {"ids": ids}
+
+    with pg_conn.cursor() as cur:
+        cur.execute(AYAH_SQL.format(where=where), params)
+        ayahs = [dict(r) for r in cur.fetchall()]
+        cur.execute(OCCURRENCE_SQL.format(where="WHERE wo.ayah_id = ANY(%(ids)s)"), params)
+        occurrences = [dict(r) for r in cur.fetchall()]
+        cur.execute(
+            SHARES_ROOT_SQL.format(filter="AND (wo1.ayah_id = ANY(%(ids)s) OR wo2.ayah_id = ANY(%(ids)s))"),
+            params,
+        )
+        pairs = [dict(r) for r in cur.fetchall()]
+
+    # 1. Anciens liens supprimés (une relation entre deux versets du lot n'est comptée qu'une fois)
+    deleted_edges = 0
+    for i in range(0, len(ids), DELTA_DELETE_BATCH):
+        batch = ids[i:i + DELTA_DELETE_BATCH]
+        result = session.run("""
+            UNWIND $ids AS id
+            MATCH (:Ayah {pg_id: id})-[sr:SHARES_ROOT]-()
+            WITH DISTINCT sr
+            DELETE sr
+            RETURN count(*) AS c
+        """, ids=batch)
+        deleted_edges += result.single()['c']
+        session.run("""
+            UNWIND $ids AS id
+            MATCH (a:Ayah {pg_id: id})
+            OPTIONAL MATCH (a)-[c:CONTAINS]->()
+            DELETE c
+            WITH DISTINCT a
+            OPTIONAL MATCH (:Surah)-[h:HAS_AYAH]->(a)
+            DELETE h
+        """, ids=batch)
+
+    # 2. Nœuds, HAS_AYAH et CONTAINS recréés depuis PostgreSQL
+
+    for i in range(0, len(ayahs), BATCH_SIZE):
+        session.run(AYAH_QUERY, batch=ayahs[i:i + BATCH_SIZE])
+    for i in range(0, len(occurrences), BATCH_SIZE):
+        batch = occurrences[i:i + BATCH_SIZE]
+        session.run(WORD_QUERY, batch=batch)
+        session.run(RELATIONS_QUERY, batch=batch)
+
+    # 3. SHARES_ROOT des paires touchées
+    for i in range(0, len(pairs), BATCH_SIZE):
+        session.run(SHARES_ROOT_QUERY, batch=pairs[i:i + BATCH_SIZE])
+
+    return len(occurrences), deleted_edges, len(pairs)
+
+
+def delta_sync(driver, pg_conn) -> dict:
+    """
+    Synchronisation incrémentale PostgreSQL → Neo4j.
+    Ordre : racines, mots, versets (les relations d'un verset pointent vers des
+    mots et racines déjà à jour), puis empreintes recopiées sur les nœuds.
+    """
+    separator("MODE DELTA — Comparaison des empreintes")
+
+    diffs = {label: diff_label(driver, pg_conn, label) for label in HASHED_LABELS}
+    for label, (changed, deleted) in diffs.items():
+        print(f"  🔎 {label:<5} : {len(changed):>6} modifiés/nouveaux, {len(deleted):>6} supprimés")
+
+    report = {
+        label.lower(): {"changed": len(changed), "deleted": len(deleted)}
+        for label, (changed, deleted) in diffs.items()
+    }
+    if not any(changed or deleted for changed, deleted in diffs.values()):
+        print("\n  ✅ Graphe déjà à jour — rien à synchroniser")
+        report["shares_root"] = {"deleted": 0, "created": 0}
+        return report
+
+    separator("MODE DELTA — Application")
+    with open_session(driver) as session:
+        # Suppressions d'abord : les versets disparus emportent leurs relations
+        for label in ("Ayah", "Word", "Root"):
+            delete_nodes(session, label, diffs[label][1])
+
+        roots_changed = sorted(diffs["Root"][0])
+        report["root"]["shares_root_relabelled"] = delta_roots(session, pg_conn, roots_changed)
+        print(f"  ✅ {len(roots_changed)} racines synchronisées")
+
+        words_changed = sorted(diffs["Word"][0])
+        delta_words(session, pg_conn, words_changed)
+        print(f"  ✅ {len(words_changed)} mots synchronisés")
+
+        ayahs_changed = sorted(diffs["Ayah"][0])
+        contains, deleted_edges, created_edges = delta_ayahs(session, pg_conn, ayahs_changed)
+        report["ayah"]["contains_rebuilt"] = contains
+        report["shares_root"] = {"deleted": deleted_edges, "created": created_edges}
+        print(f"  ✅ {len(ayahs_changed)} versets synchronisés")
+        print(f"  ✅ SHARES_ROOT : {deleted_edges:,} supprimées, {created_edges:,} recréées")
+
+    for label, (changed, _) in diffs.items():
+        mark_synced(driver, label, changed)
+
+    return report
+
+
+def print_delta_report(report: dict):
+    """Résumé des entités touchées, aussi écrit en JSON."""
+    separator("Rapport delta")
+
+    for entity, counts in report.items():
+        details = ", ".join(f"{key}={value:,}" for key, value in counts.items())
+        print(f"  • {entity:<12} {details}")
+
+    os.makedirs(os.path.dirname(DELTA_REPORT), exist_ok=True)
+    with open(DELTA_REPORT, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n  💾 {DELTA_REPORT}")
+
+
 # ============================================================
 # ÉTAPE 7 — Validation
 # ============================================================
@@ -323,7 +765,7 @@ def validate(driver, pg_conn):
             counts_pg[table] = cur.fetchone()['count']
 
     # Counts Neo4j
-    with driver.session() as session:
+    with open_session(driver) as session:
         counts_neo4j = {}
         for label in ['Surah', 'Ayah', 'Root', 'Word']:
             result = session.run(f"MATCH (n:{label}) RETURN count(n) AS c")
@@ -352,6 +794,20 @@ def validate(driver, pg_conn):
 # MAIN
 # ============================================================
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Synchronisation PostgreSQL → Neo4j")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--delta", action="store_true",
+                      help="Ne resynchroniser que les lignes dont l'empreinte a changé")
+    mode.add_argument("--resume", action="store_true",
+                      help=f"Reprendre l'import complet au dernier lot validé ({STATE_FILE})")
+    parser.add_argument("--pg-schema", default=PG_SCHEMA,
+                        help="Schéma PostgreSQL source (import_postgres.py --schema)")
+    parser.add_argument("--database", default=NEO4J_DATABASE,
+                        help="Base Neo4j cible (créée si absente — Enterprise)")
+    args = parser.parse_args()
+    PG_SCHEMA = args.pg_schema
+    NEO4J_DATABASE = args.database
+
     print("\n🕌 WikiQuran — import_neo4j.py\n")
 
     separator("Connexions")
@@ -359,12 +815,22 @@ if __name__ == '__main__':
     driver  = get_neo4j_driver()
 
     try:
+        ensure_database(driver)
         create_constraints(driver)
-        import_surah_nodes(driver, pg_conn)
-        import_root_nodes(driver, pg_conn)
-        import_ayah_nodes(driver, pg_conn)
-        import_word_nodes(driver, pg_conn)
-        compute_shares_root(driver, pg_conn)
+        refresh_pg_hashes(pg_conn)
+
+        if args.delta:
+            # Sourates : 114 nœuds, toujours resynchronisés
+            import_surah_nodes(driver, pg_conn)
+            print_delta_report(delta_sync(driver, pg_conn))
+        else:
+            checkpoint = Checkpoint(STATE_FILE, resume=args.resume, target=import_target())
+            import_surah_nodes(driver, pg_conn, checkpoint)
+            import_root_nodes(driver, pg_conn, checkpoint)
+            import_ayah_nodes(driver, pg_conn, checkpoint)
+            import_word_nodes(driver, pg_conn, checkpoint)
+            compute_shares_root(driver, pg_conn, checkpoint)
+            mark_all_synced(driver, pg_conn, checkpoint)
         validate(driver, pg_conn)
 
     except Exception as e:
@@ -3,16 +3,30 @@ WikiQuran — scripts/database/import_postgres.py
 Importe wikiquran_final.json dans PostgreSQL.
 Idempotent : relançable sans créer de doublons (UPSERT).
 
-Usage : python scripts/database/import_postgres.py
+--schema NOM : import dans un schéma neuf (créé depuis schema_postgresql.sql)
+au lieu des tables servies par l'API — bascule bleu/vert, voir switch_dataset.py.
+--data FICHIER : autre corpus au même format (.json ou .wqc), par exemple un
+corpus synthétique produit par scripts/benchmarks/scale_corpus.py.
+
+Usage : python scripts/database/import_postgres.py [--schema wq_20250301] [--data FICHIER]
 """
 
+import argparse
 import json
 import os
+import re
 import sys
 import psycopg2
 from psycopg2.extras import execute_batch
 from dotenv import load_dotenv
 
+# Import des utilitaires partagés (normalisation arabe)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.arabic import normalize_with_offsets, encode_offsets
+from utils.corpus_artifact import CorpusArtifact
+from utils.content_hash import SCHEMA_STATEMENTS, refresh_content_hashes
+from utils.progress import Progress
+
 load_dotenv()
 
 # ============================================================
@@ -26,11 +40,59 @@ DB_CONFIG = {
     "password": os.getenv("POSTGRES_PASSWORD"),
 }
 
-DATA_FINAL = "data/quran_enriched/wikiquran_final.json"
+SCHEMA_FILE   = "schema_postgresql.sql"
+SCHEMA_NAME   = re.compile(r"^[a-z_][a-z0-9_]{0,62}$")
+
+DATA_FINAL    = "data/quran_enriched/wikiquran_final.json"
+DATA_ARTIFACT = "data/quran_enriched/wikiquran_final.wqc"   # prioritaire s'il existe
 
 # Batch size pour les inserts (performance)
 BATCH_SIZE = 500
 
+# Table ayah_pair (bases créées avant son ajout à schema_postgresql.sql)
+AYAH_PAIR_DDL = """
+    CREATE TABLE IF NOT EXISTS ayah_pair (
+        ayah1_id  INTEGER   NOT NULL REFERENCES ayah(id) ON DELETE CASCADE,
+        ayah2_id  INTEGER   NOT NULL REFERENCES ayah(id) ON DELETE CASCADE,
+        weight    SMALLINT  NOT NULL,
+        root_ids  INTEGER[] NOT NULL,
+        PRIMARY KEY (ayah1_id, ayah2_id) INCLUDE (weight),
+        CHECK (ayah1_id <> ayah2_id)
+    )
+"""
+AYAH_PAIR_INDEXES = [
+    # Index des voisins créé sans INCLUDE (root_ids) par une version précédente : recréé
+    """
+    DO $$ BEGIN
+        IF EXISTS (SELECT 1 FROM pg_indexes
+                   WHERE schemaname = current_schema() AND indexname = 'idx_ayah_pair_neighbors'
+                     AND indexdef NOT LIKE '%INCLUDE%') THEN
+            DROP INDEX idx_ayah_pair_neighbors;
+        END IF;
+    END $$
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_ayah_pair_neighbors ON ayah_pair(ayah1_id, weight DESC, ayah2_id) INCLUDE (root_ids)",
+    "ALTER TABLE ayah_pair CLUSTER ON ayah_pair_pkey",
+]
+
+# Paires de versets partageant une racine — même règle que SHARES_ROOT_SQL
+# (import_neo4j.py, mots différents de même racine) pour que le repli
+# PostgreSQL de l'API renvoie le même réseau que Neo4j.
+# Les deux sens sont produits : wo1.ayah_id <> wo2.ayah_id
+AYAH_PAIR_SQL = """
+    INSERT INTO ayah_pair (ayah1_id, ayah2_id, weight, root_ids)
+    SELECT ayah1_id, ayah2_id, COUNT(*), array_agg(root_id ORDER BY root_id)
+    FROM (
+        SELECT DISTINCT wo1.ayah_id AS ayah1_id, wo2.ayah_id AS ayah2_id, w1.root_id
+        FROM word_occurrence wo1
+        JOIN word w1 ON w1.id = wo1.word_id AND w1.root_id IS NOT NULL
+        JOIN word_occurrence wo2 ON wo2.word_id != wo1.word_id AND wo2.ayah_id <> wo1.ayah_id
+        JOIN word w2 ON w2.id = wo2.word_id AND w2.root_id = w1.root_id
+    ) shared
+    GROUP BY ayah1_id, ayah2_id
+    ORDER BY ayah1_id, ayah2_id
+"""
+
 
 def separator(title: str):
     print(f"\n{'=' * 60}")
@@ -54,22 +116,111 @@ def get_connection():
 
 
 # ============================================================
-# Chargement du JSON final
+# Schéma neuf (bascule bleu/vert)
+# ============================================================
+def active_schema(conn) -> str | None:
+    """Schéma servi par l'API (public.dataset_pointer), None sans pointeur."""
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('public.dataset_pointer') IS NOT NULL")
+        if not cur.fetchone()[0]:
+            return None
+        cur.execute("SELECT pg_schema FROM public.dataset_pointer")
+        row = cur.fetchone()
+    return row[0] if row else None
+
+
+def create_fresh_schema(conn, schema: str):
+    """
+    (Re)crée le schéma et ses tables depuis schema_postgresql.sql, puis y place
+    la connexion (search_path) : les imports qui suivent écrivent dans ce schéma,
+    l'API continue de lire le jeu actif sans attendre aucun verrou.
+    """
+    separator(f"Schéma neuf — {schema}")
+
+    if not SCHEMA_NAME.match(schema) or schema == "public":
+        print(f"  ❌ Nom de schéma invalide : {schema!r} (minuscules, chiffres, _ ; pas public)")
+        sys.exit(1)
+    if schema == active_schema(conn):
+        print(f"  ❌ {schema} est le jeu de données servi par l'API — choisis un autre nom")
+        sys.exit(1)
+
+    with open(SCHEMA_FILE, encoding="utf-8") as f:
+        ddl = f.read()
+
+    with conn.cursor() as cur:
+        cur.execute(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE')
+        cur.execute(f'CREATE SCHEMA "{schema}"')
+        cur.execute(f'SET search_path TO "{schema}", public')
+        cur.execute(ddl)
+
+    conn.commit()
+    print(f"  ✅ Schéma {schema} créé — tables vides, search_path positionné")
+
+
+# ============================================================
+# Mise à niveau du schéma (bases créées avant l'ajout des colonnes)
+# ============================================================
+def ensure_schema(conn):
+    """
+    Ajoute les colonnes et index apparus après le schéma initial.
+    Idempotent (IF NOT EXISTS) — sans effet sur une base créée
+    depuis la version courante de schema_postgresql.sql.
+    """
+    separator("Mise à niveau du schéma")
+
+    statements = [
+        "ALTER TABLE ayah ADD COLUMN IF NOT EXISTS text_normalized TEXT",
+        "ALTER TABLE ayah ADD COLUMN IF NOT EXISTS offset_map BYTEA",
+        "CREATE INDEX IF NOT EXISTS idx_ayah_text_norm_trgm "
+        "ON ayah USING GIN (text_normalized gin_trgm_ops)",
+        *SCHEMA_STATEMENTS,
+        AYAH_PAIR_DDL,
+        *AYAH_PAIR_INDEXES,
+    ]
+
+    with conn.cursor() as cur:
+        for sql in statements:
+            cur.execute(sql)
+
+    conn.commit()
+    print(f"  ✅ {len(statements)} instructions appliquées")
+
+
 # ============================================================
-def load_data() -> dict:
-    """Charge wikiquran_final.json."""
+# Chargement du corpus final
+# ============================================================
+def load_data(path: str | None = None):
+    """
+    Charge le corpus final : fichier binaire .wqc (lu en mmap, à la demande)
+    s'il existe, sinon wikiquran_final.json — ou le fichier `path` s'il est donné.
+    Les deux s'utilisent de la même façon : data['ayahs'], data['meta']...
+    """
     separator("Chargement des données")
 
-    if not os.path.exists(DATA_FINAL):
-        print(f"  ❌ Fichier introuvable : {DATA_FINAL}")
+    if path:
+        if not os.path.exists(path):
+            print(f"  ❌ Fichier introuvable : {path}")
+            sys.exit(1)
+        if path.endswith(".wqc"):
+            data = CorpusArtifact(path)
+        else:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        source = os.path.basename(path)
+    elif os.path.exists(DATA_ARTIFACT):
+        data = CorpusArtifact(DATA_ARTIFACT)
+        source = os.path.basename(DATA_ARTIFACT)
+    elif os.path.exists(DATA_FINAL):
+        with open(DATA_FINAL, encoding='utf-8') as f:
+            data = json.load(f)
+        source = os.path.basename(DATA_FINAL)
+    else:
+        print(f"  ❌ Fichier introuvable : {DATA_ARTIFACT} ni {DATA_FINAL}")
         print("     → Lance d'abord scripts/extraction/normalize.py")
         sys.exit(1)
 
-    with open(DATA_FINAL, encoding='utf-8') as f:
-        data = json.load(f)
-
     stats = data['meta']['stats']
-    print(f"  ✅ wikiquran_final.json chargé")
+    print(f"  ✅ {source} chargé")
     print(f"     Sourates    : {stats['surahs_total']}")
     print(f"     Versets     : {stats['ayahs_total']}")
     print(f"     Racines     : {stats['roots_total']}")
@@ -143,21 +294,37 @@ def import_roots(conn, roots: list):
 # Import Ayah
 # ============================================================
 def import_ayahs(conn, ayahs: list):
-    """Importe les versets."""
+    """
+    Importe les versets.
+    Calcule au passage le texte normalisé et sa table d'offsets
+    (indice normalisé → indice original) pour la surbrillance côté API.
+    """
     separator("Import — ayah")
 
     sql = """
         INSERT INTO ayah (
-            id, surah_id, number, text_arabic
+            id, surah_id, number, text_arabic, text_normalized, offset_map
         ) VALUES (
-            %(id)s, %(surah_id)s, %(number)s, %(text_arabic)s
+            %(id)s, %(surah_id)s, %(number)s, %(text_arabic)s,
+            %(text_normalized)s, %(offset_map)s
         )
         ON CONFLICT (id) DO UPDATE SET
-            text_arabic = EXCLUDED.text_arabic;
+            text_arabic     = EXCLUDED.text_arabic,
+            text_normalized = EXCLUDED.text_normalized,
+            offset_map      = EXCLUDED.offset_map;
     """
 
+    rows = []
+    for a in ayahs:
+        normalized, offsets = normalize_with_offsets(a['text_arabic'])
+        rows.append({
+            **a,
+            "text_normalized": normalized,
+            "offset_map"     : psycopg2.Binary(encode_offsets(offsets)),
+        })
+
     with conn.cursor() as cur:
-        execute_batch(cur, sql, ayahs, page_size=BATCH_SIZE)
+        execute_batch(cur, sql, rows, page_size=BATCH_SIZE)
         cur.execute("SELECT setval('ayah_id_seq', (SELECT MAX(id) FROM ayah))")
 
     conn.commit()
@@ -212,23 +379,68 @@ def import_occurrences(conn, occurrences: list):
     """
 
     total = len(occurrences)
-    imported = 0
+    progress = Progress("word_occurrence", total)
 
     with conn.cursor() as cur:
         # On traite par batch avec affichage de progression
         for i in range(0, total, BATCH_SIZE):
             batch = occurrences[i:i + BATCH_SIZE]
             execute_batch(cur, sql, batch, page_size=BATCH_SIZE)
-            imported += len(batch)
-            # Progression toutes les 10 000 lignes
-            if imported % 10000 == 0 or imported == total:
-                pct = (imported / total) * 100
-                print(f"  ⏳ {imported:>6}/{total} ({pct:.0f}%)")
+            progress.update(min(i + BATCH_SIZE, total))
 
     conn.commit()
+    progress.finish()
     print(f"  ✅ {total} occurrences importées")
 
 
+# ============================================================
+# Paires de versets (SHARES_ROOT côté PostgreSQL)
+# ============================================================
+def compute_ayah_pairs(conn):
+    """
+    Recalcule ayah_pair depuis les occurrences, en une transaction :
+    les lecteurs voient l'ancienne table jusqu'au commit.
+    Insertion dans l'ordre de la clé (regroupement physique par verset, comme
+    CLUSTER mais sans verrou exclusif), puis VACUUM : carte de visibilité à
+    jour, sans quoi les parcours « index seul » relisent la table.
+    """
+    separator("Paires de versets — ayah_pair")
+
+    with conn.cursor() as cur:
+        cur.execute("DELETE FROM ayah_pair")
+        cur.execute(AYAH_PAIR_SQL)
+        total = cur.rowcount
+    conn.commit()
+
+    # VACUUM interdit dans une transaction
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute("VACUUM ANALYZE ayah_pair")
+    finally:
+        conn.autocommit = False
+    print(f"  ✅ {total:,} paires ordonnées (A→B et B→A) calculées")
+
+
+# ============================================================
+# Empreintes de contenu (suivi des modifications pour Neo4j)
+# ============================================================
+def update_content_hashes(conn):
+    """
+    Met à jour content_hash sur root, word et ayah.
+    import_neo4j.py --delta compare ces empreintes à celles du graphe
+    pour ne resynchroniser que les lignes modifiées.
+    """
+    separator("Empreintes de contenu")
+
+    with conn.cursor() as cur:
+        changed = refresh_content_hashes(cur)
+
+    conn.commit()
+    for table, count in changed.items():
+        print(f"  ✅ {table:<6} : {count:>6} empreintes modifiées")
+
+
 # ============================================================
 # Validation finale
 # ============================================================
@@ -268,10 +480,15 @@ def validate(conn, expected: dict):
 # MAIN
 # ============================================================
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Import du corpus final dans PostgreSQL")
+    parser.add_argument("--schema", help="Importer dans ce schéma neuf (bascule bleu/vert)")
+    parser.add_argument("--data", help="Corpus à importer (.json ou .wqc, défaut : data/quran_enriched)")
+    args = parser.parse_args()
+
     print("\n🕌 WikiQuran — import_postgres.py\n")
 
     # 1. Charger les données
-    data = load_data()
+    data = load_data(args.data)
     stats = data['meta']['stats']
 
     # 2. Connexion
@@ -279,6 +496,10 @@ if __name__ == '__main__':
     conn = get_connection()
 
     try:
+        if args.schema:
+            create_fresh_schema(conn, args.schema)
+        ensure_schema(conn)
+
         # 3. Import dans l'ordre des FK
         # surah et root d'abord (pas de dépendances)
         # puis ayah (dépend de surah)
@@ -289,6 +510,8 @@ if __name__ == '__main__':
         import_ayahs(conn, data['ayahs'])
         import_words(conn, data['words'])
         import_occurrences(conn, data['occurrences'])
+        compute_ayah_pairs(conn)
+        update_content_hashes(conn)
 
         # 4. Validation
         validate(conn, stats)
@@ -302,4 +525,8 @@ if __name__ == '__main__':
         print("\n  🔌 Connexion fermée")
 
     print("\n✅ import_postgres.py terminé avec succès !")
-    print("   → PostgreSQL prêt pour la synchronisation Neo4j !\n")
+    if args.schema:
+        print(f"   → Schéma {args.schema} prêt : import_neo4j.py --pg-schema {args.schema}, "
+              f"puis switch_dataset.py\n")
+    else:
+        print("   → PostgreSQL prêt pour la synchronisation Neo4j !\n")
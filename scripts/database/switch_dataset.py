@@ -0,0 +1,207 @@
+"""
+WikiQuran — scripts/database/switch_dataset.py
+Bascule bleu/vert : fait pointer l'API vers un jeu de données importé à côté.
+
+    1. python scripts/database/import_postgres.py --schema wq_20250301
+    2. python scripts/database/import_neo4j.py --pg-schema wq_20250301 --database wq20250301
+    3. python scripts/database/switch_dataset.py --pg-schema wq_20250301 --neo4j-database wq20250301
+
+public.dataset_pointer est mis à jour en une transaction : l'API (qui le relit
+toutes les DATASET_POLL_SECONDS) construit les index du nouveau jeu en
+arrière-plan, puis bascule sessions, index, ETag et X-Dataset-Version ensemble.
+L'ancien schéma reste en place : retour arrière = nouvelle bascule. Le supprimer
+(DROP SCHEMA ... CASCADE) seulement une fois que les API ont basculé.
+
+Usage : python scripts/database/switch_dataset.py --pg-schema NOM [--neo4j-uri URI]
+            [--neo4j-database NOM] [--version V] [--force]
+        python scripts/database/switch_dataset.py --show
+"""
+
+import argparse
+import os
+import re
+import sys
+from datetime import datetime, timezone
+import psycopg2
+from psycopg2.extras import RealDictCursor
+from neo4j import GraphDatabase
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ============================================================
+# Configuration
+# ============================================================
+PG_CONFIG = {
+    "host"    : os.getenv("POSTGRES_HOST", "localhost"),
+    "port"    : os.getenv("POSTGRES_PORT", "5432"),
+    "dbname"  : os.getenv("POSTGRES_DB", "wikiquran"),
+    "user"    : os.getenv("POSTGRES_USER", "postgres"),
+    "password": os.getenv("POSTGRES_PASSWORD"),
+}
+
+NEO4J_URI      = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_USER     = os.getenv("NEO4J_USER", "neo4j")
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
+
+SCHEMA_NAME = re.compile(r"^[a-z_][a-z0-9_]{0,62}$")
+
+# Tables qui doivent être non vides avant de basculer
+REQUIRED_TABLES = ["surah", "ayah", "root", "word", "word_occurrence"]
+
+
+def separator(title: str):
+    print(f"\n{'=' * 60}")
+    print(f"  {title}")
+    print(f"{'=' * 60}\n")
+
+
+# ============================================================
+# Pointeur
+# ============================================================
+POINTER_DDL = """
+    CREATE TABLE IF NOT EXISTS public.dataset_pointer (
+        singleton       BOOLEAN         PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+        pg_schema       VARCHAR(63)     NOT NULL,
+        neo4j_uri       VARCHAR(200),
+        neo4j_database  VARCHAR(63),
+        version         VARCHAR(100)    NOT NULL,
+        switched_at     TIMESTAMP       DEFAULT NOW()
+    )
+"""
+
+
+def read_pointer(conn) -> dict | None:
+    with conn.cursor() as cur:
+        cur.execute(POINTER_DDL)
+        cur.execute("SELECT * FROM public.dataset_pointer")
+        row = cur.fetchone()
+    conn.commit()
+    return dict(row) if row else None
+
+
+def show_pointer(pointer: dict | None):
+    if pointer is None:
+        print("  ℹ️  Aucun pointeur — l'API lit le schéma public et la base Neo4j par défaut")
+        return
+    for key in ("version", "pg_schema", "neo4j_uri", "neo4j_database", "switched_at"):
+        print(f"  • {key:<15} : {pointer[key]}")
+
+
+# ============================================================
+# Vérifications avant bascule
+# ============================================================
+def check_pg_schema(conn, schema: str) -> bool:
+    """Le schéma existe et ses tables sont remplies."""
+    ok = True
+    with conn.cursor() as cur:
+        for table in REQUIRED_TABLES:
+            cur.execute("SELECT to_regclass(%s) IS NOT NULL AS present", (f'"{schema}".{table}',))
+            if not cur.fetchone()["present"]:
+                print(f"  ❌ {schema}.{table} absente")
+                ok = False
+                continue
+            cur.execute(f'SELECT COUNT(*) AS n FROM "{schema}".{table}')
+            count = cur.fetchone()["n"]
+            status = "✅" if count else "❌"
+            print(f"  {status} {schema}.{table:<16} : {count:>7,} lignes")
+            ok = ok and count > 0
+    conn.commit()
+    return ok
+
+
+def check_neo4j(uri: str, database: str | None, expected_ayahs: int) -> bool:
+    """La base Neo4j cible contient le même nombre de versets que le schéma."""
+    try:
+        with GraphDatabase.driver(uri, auth=(NEO4J_USER, NEO4J_PASSWORD)) as driver:
+            with driver.session(database=database) as session:
+                ayahs = session.run("MATCH (a:Ayah) RETURN count(a) AS c").single()["c"]
+                shares = session.run("MATCH ()-[r:SHARES_ROOT]->() RETURN count(r) AS c").single()["c"]
+    except Exception as e:
+        print(f"  ❌ Neo4j {uri}/{database or 'default'} : {e}")
+        return False
+
+    ok = ayahs == expected_ayahs and shares > 0
+    status = "✅" if ok else "❌"
+    print(f"  {status} Neo4j {database or 'default'} : {ayahs:,} Ayah (attendu {expected_ayahs:,}), "
+          f"{shares:,} SHARES_ROOT")
+    return ok
+
+
+# ============================================================
+# Bascule
+# ============================================================
+def switch(conn, schema: str, neo4j_uri: str | None, neo4j_database: str | None, version: str):
+    """Remplace le pointeur en une transaction (verrou de ligne : pas de bascule concurrente)."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO public.dataset_pointer (singleton, pg_schema, neo4j_uri, neo4j_database, version, switched_at)
+            VALUES (TRUE, %s, %s, %s, %s, NOW())
+            ON CONFLICT (singleton) DO UPDATE SET
+                pg_schema      = EXCLUDED.pg_schema,
+                neo4j_uri      = EXCLUDED.neo4j_uri,
+                neo4j_database = EXCLUDED.neo4j_database,
+                version        = EXCLUDED.version,
+                switched_at    = EXCLUDED.switched_at
+        """, (schema, neo4j_uri, neo4j_database, version))
+    conn.commit()
+
+
+# ============================================================
+# MAIN
+# ============================================================
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Bascule bleu/vert du jeu de données servi par l'API")
+    parser.add_argument("--show", action="store_true", help="Afficher le pointeur actuel et quitter")
+    parser.add_argument("--pg-schema", help="Schéma PostgreSQL à servir")
+    parser.add_argument("--neo4j-uri", help="Instance Neo4j à servir (défaut : NEO4J_URI de l'API)")
+    parser.add_argument("--neo4j-database", help="Base Neo4j à servir (défaut : base par défaut)")
+    parser.add_argument("--version", help="Version annoncée (défaut : schéma@horodatage UTC)")
+    parser.add_argument("--force", action="store_true", help="Basculer malgré des vérifications en échec")
+    args = parser.parse_args()
+
+    print("\n🕌 WikiQuran — switch_dataset.py\n")
+
+    try:
+        conn = psycopg2.connect(**PG_CONFIG, cursor_factory=RealDictCursor)
+    except psycopg2.OperationalError as e:
+        print(f"  ❌ PostgreSQL : {e}")
+        sys.exit(1)
+
+    try:
+        separator("Jeu de données actif")
+        previous = read_pointer(conn)
+        show_pointer(previous)
+        if args.show:
+            sys.exit(0)
+
+        if not args.pg_schema or not SCHEMA_NAME.match(args.pg_schema):
+            print("\n  ❌ --pg-schema requis (minuscules, chiffres, _)")
+            sys.exit(1)
+
+        separator(f"Vérifications — {args.pg_schema}")
+        ok = check_pg_schema(conn, args.pg_schema)
+        if ok:
+            with conn.cursor() as cur:
+                cur.execute(f'SELECT COUNT(*) AS n FROM "{args.pg_schema}".ayah')
+                ayahs = cur.fetchone()["n"]
+            conn.commit()
+            ok = check_neo4j(args.neo4j_uri or NEO4J_URI, args.neo4j_database, ayahs)
+        if not ok and not args.force:
+            print("\n❌ Bascule annulée — jeu de données incomplet (--force pour passer outre)\n")
+            sys.exit(1)
+
+        version = args.version or (
+            f"{args.pg_schema}@{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+        )
+        separator("Bascule")
+        switch(conn, args.pg_schema, args.neo4j_uri, args.neo4j_database, version)
+        print(f"  ✅ API → {args.pg_schema} / {args.neo4j_database or 'default'} — version {version}")
+
+        old_schema = previous["pg_schema"] if previous else "public"
+        if old_schema != args.pg_schema:
+            print(f"  ℹ️  Ancien schéma {old_schema} conservé (retour arrière possible)")
+    finally:
+        conn.close()
+
+    print("\n✅ switch_dataset.py terminé — l'API bascule au prochain relevé du pointeur\n")
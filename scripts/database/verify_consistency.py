@@ -0,0 +1,323 @@
+"""
+WikiQuran — scripts/database/verify_consistency.py
+Vérifie que Neo4j reflète exactement PostgreSQL, nœud par nœud et relation par relation.
+
+Pour chaque label et type de relation, les deux côtés sont lus en flux (curseur
+serveur PostgreSQL, résultat Neo4j itéré) et résumés par une empreinte
+indépendante de l'ordre : nombre de lignes + somme modulo 2^64 des hachages
+(blake2b 64 bits) de chaque ligne. Mémoire constante quel que soit le volume.
+
+Empreintes différentes → bissection sur les plages d'identifiants (pg_id du nœud
+de départ) jusqu'à des plages de quelques lignes, comparées ligne à ligne :
+le rapport liste les lignes manquantes d'un côté ou de l'autre.
+
+Code de sortie : 0 si tout concorde, 1 sinon (utilisable en contrôle planifié).
+
+Usage : python scripts/database/verify_consistency.py [--only Ayah SHARES_ROOT]
+            [--pg-schema wq_20250301] [--database wq20250301] [--json rapport.json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+import psycopg2
+from neo4j import GraphDatabase
+from dotenv import load_dotenv
+
+# SHARES_ROOT : même SQL que l'import, pour comparer à ce que l'import aurait produit
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from database.import_neo4j import SHARES_ROOT_SQL
+
+load_dotenv()
+
+# ============================================================
+# Configuration
+# ============================================================
+PG_CONFIG = {
+    "host"    : os.getenv("POSTGRES_HOST", "localhost"),
+    "port"    : os.getenv("POSTGRES_PORT", "5432"),
+    "dbname"  : os.getenv("POSTGRES_DB", "wikiquran"),
+    "user"    : os.getenv("POSTGRES_USER", "postgres"),
+    "password": os.getenv("POSTGRES_PASSWORD"),
+}
+
+NEO4J_URI      = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+NEO4J_USER     = os.getenv("NEO4J_USER", "neo4j")
+NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
+
+FETCH_SIZE  = 10_000   # lignes par aller-retour du curseur serveur PostgreSQL
+LEAF_IDS    = 8        # plage ≤ 8 identifiants : comparaison ligne à ligne
+MAX_REPORT  = 20       # lignes divergentes affichées par type
+MASK        = (1 << 64) - 1
+
+
+def separator(title: str):
+    print(f"\n{'=' * 60}")
+    print(f"  {title}")
+    print(f"{'=' * 60}\n")
+
+
+# ============================================================
+# Ce qui est comparé
+# ============================================================
+class Check:
+    """
+    Un label ou type de relation : la même projection des deux côtés.
+    Première colonne = clé de bissection (pg_id du nœud de départ).
+    {range} reçoit le filtre de plage (vide pour la passe complète).
+    """
+
+    def __init__(self, name: str, key_label: str, pg_sql: str, pg_key: str, cypher: str):
+        self.name = name
+        self.key_label = key_label   # label du nœud `n` dont pg_id sert de clé
+        self.pg_sql = pg_sql
+        self.pg_key = pg_key
+        self.cypher = cypher
+
+
+# Label de la clé → table PostgreSQL (bornes de la bissection)
+KEY_TABLES = {"Surah": "surah", "Root": "root", "Ayah": "ayah", "Word": "word"}
+
+
+_HAS_OCCURRENCE = "EXISTS (SELECT 1 FROM word_occurrence wo WHERE wo.word_id = w.id)"
+
+CHECKS = [
+    Check("Surah", "Surah",
+          "SELECT id, number, name_arabic, revelation_order, type, ayas_count FROM surah WHERE TRUE {range}",
+          "id",
+          "MATCH (n:Surah) WHERE true {range} "
+          "RETURN n.pg_id, n.number, n.name_arabic, n.revelation_order, n.type, n.ayas_count"),
+    Check("Root", "Root",
+          "SELECT id, buckwalter, arabic, occurrences_count FROM root WHERE TRUE {range}",
+          "id",
+          "MATCH (n:Root) WHERE true {range} "
+          "RETURN n.pg_id, n.buckwalter, n.arabic, n.occurrences_count"),
+    Check("Ayah", "Ayah",
+          "SELECT a.id, s.number, a.number FROM ayah a JOIN surah s ON s.id = a.surah_id WHERE TRUE {range}",
+          "a.id",
+          "MATCH (n:Ayah) WHERE true {range} RETURN n.pg_id, n.surah_number, n.ayah_number"),
+    Check("Word", "Word",
+          f"SELECT w.id, w.text_arabic, w.pos FROM word w WHERE {_HAS_OCCURRENCE} {{range}}",
+          "w.id",
+          "MATCH (n:Word) WHERE true {range} RETURN n.pg_id, n.text_arabic, n.pos"),
+    Check("HAS_AYAH", "Ayah",
+          "SELECT a.id, a.surah_id FROM ayah a WHERE TRUE {range}",
+          "a.id",
+          "MATCH (s:Surah)-[:HAS_AYAH]->(n:Ayah) WHERE true {range} RETURN n.pg_id, s.pg_id"),
+    Check("CONTAINS", "Ayah",
+          "SELECT wo.ayah_id, wo.word_id, wo.position FROM word_occurrence wo WHERE TRUE {range}",
+          "wo.ayah_id",
+          "MATCH (n:Ayah)-[c:CONTAINS]->(w:Word) WHERE true {range} RETURN n.pg_id, w.pg_id, c.position"),
+    Check("DERIVED_FROM", "Word",
+          f"SELECT w.id, r.buckwalter FROM word w JOIN root r ON r.id = w.root_id "
+          f"WHERE {_HAS_OCCURRENCE} {{range}}",
+          "w.id",
+          "MATCH (n:Word)-[:DERIVED_FROM]->(r:Root) WHERE true {range} RETURN n.pg_id, r.buckwalter"),
+    Check("SHARES_ROOT", "Ayah",
+          "SELECT ayah1_id, ayah2_id, root_bw, root_arabic, shared_count FROM ("
+          + SHARES_ROOT_SQL.format(filter="{range}") + ") sr",
+          "wo1.ayah_id",
+          "MATCH (n:Ayah)-[r:SHARES_ROOT]->(b:Ayah) WHERE true {range} "
+          "RETURN n.pg_id, b.pg_id, r.root_bw, r.root_arabic, r.count"),
+]
+
+
+# ============================================================
+# Empreintes
+# ============================================================
+def row_hash(row: tuple) -> int:
+    """Hachage 64 bits d'une ligne (repr : types et NULL distingués)."""
+    return int.from_bytes(hashlib.blake2b(repr(row).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class Digest:
+    """Résumé d'un multiensemble de lignes, indépendant de l'ordre de lecture."""
+
+    __slots__ = ("count", "total")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+
+    def add(self, row: tuple):
+        self.count += 1
+        self.total = (self.total + row_hash(row)) & MASK
+
+    def __eq__(self, other) -> bool:
+        return self.count == other.count and self.total == other.total
+
+    def __str__(self) -> str:
+        return f"{self.count:,} lignes / {self.total:016x}"
+
+
+class Sides:
+    """Lecture en flux d'une même projection côté PostgreSQL et côté Neo4j."""
+
+    def __init__(self, pg_conn, driver, database: str | None):
+        self.pg_conn = pg_conn
+        self.driver = driver
+        self.database = database
+        self._cursors = 0
+
+    def pg_rows(self, check: Check, lo: int | None = None, hi: int | None = None):
+        rng = "" if lo is None else f"AND {check.pg_key} >= %(lo)s AND {check.pg_key} < %(hi)s"
+        self._cursors += 1
+        with self.pg_conn.cursor(name=f"verify_{self._cursors}") as cur:
+            cur.itersize = FETCH_SIZE
+            cur.execute(check.pg_sql.format(range=rng), {"lo": lo, "hi": hi})
+            for row in cur:
+                yield tuple(row)
+        self.pg_conn.commit()
+
+    def neo4j_rows(self, check: Check, lo: int | None = None, hi: int | None = None):
+        rng = "" if lo is None else "AND n.pg_id >= $lo AND n.pg_id < $hi"
+        with self.driver.session(database=self.database) as session:
+            for record in session.run(check.cypher.format(range=rng), lo=lo, hi=hi):
+                yield tuple(record.values())
+
+    def digests(self, check: Check, lo: int | None = None, hi: int | None = None) -> tuple[Digest, Digest]:
+        pg, neo = Digest(), Digest()
+        for row in self.pg_rows(check, lo, hi):
+            pg.add(row)
+        for row in self.neo4j_rows(check, lo, hi):
+            neo.add(row)
+        return pg, neo
+
+    def key_bounds(self, check: Check) -> tuple[int, int]:
+        """Plage [min, max + 1) des clés, sur l'union des deux côtés (nœuds en trop inclus)."""
+        keys = []
+        with self.pg_conn.cursor() as cur:
+            cur.execute(f"SELECT min(id), max(id) FROM {KEY_TABLES[check.key_label]}")
+            keys.extend(k for k in cur.fetchone() if k is not None)
+        self.pg_conn.commit()
+        with self.driver.session(database=self.database) as session:
+            record = session.run(
+                f"MATCH (n:{check.key_label}) RETURN min(n.pg_id) AS lo, max(n.pg_id) AS hi"
+            ).single()
+            keys.extend(k for k in (record["lo"], record["hi"]) if k is not None)
+        return (min(keys), max(keys) + 1) if keys else (0, 0)
+
+
+# ============================================================
+# Bissection
+# ============================================================
+def row_diff(sides: Sides, check: Check, lo: int, hi: int) -> list[dict]:
+    """Comparaison ligne à ligne d'une petite plage (multiensembles)."""
+    pg = Counter(sides.pg_rows(check, lo, hi))
+    neo = Counter(sides.neo4j_rows(check, lo, hi))
+    diffs = [{"side": "postgres_only", "row": list(row)} for row in (pg - neo).elements()]
+    diffs += [{"side": "neo4j_only", "row": list(row)} for row in (neo - pg).elements()]
+    return diffs
+
+
+def bisect(sides: Sides, check: Check, lo: int, hi: int, found: list[dict], stats: dict):
+    """
+    Descend dans les moitiés dont les empreintes diffèrent.
+    S'arrête dès que MAX_REPORT lignes divergentes sont trouvées.
+    """
+    if len(found) >= MAX_REPORT or lo >= hi:
+        return
+    stats["queries"] += 1
+    pg, neo = sides.digests(check, lo, hi)
+    if pg == neo:
+        return
+    if hi - lo <= LEAF_IDS:
+        for diff in row_diff(sides, check, lo, hi):
+            if len(found) < MAX_REPORT:
+                found.append({"range": [lo, hi], **diff})
+        return
+    mid = (lo + hi) // 2
+    bisect(sides, check, lo, mid, found, stats)
+    bisect(sides, check, mid, hi, found, stats)
+
+
+# ============================================================
+# Vérification
+# ============================================================
+def verify(sides: Sides, check: Check) -> dict:
+    """Passe complète ; bissection seulement si les empreintes divergent."""
+    start = time.perf_counter()
+    pg, neo = sides.digests(check)
+    result = {
+        "name"    : check.name,
+        "ok"      : pg == neo,
+        "postgres": {"count": pg.count, "digest": f"{pg.total:016x}"},
+        "neo4j"   : {"count": neo.count, "digest": f"{neo.total:016x}"},
+    }
+    status = "✅" if result["ok"] else "❌"
+    print(f"  {status} {check.name:<13} PG {pg}  |  Neo4j {neo}")
+
+    if not result["ok"]:
+        lo, hi = sides.key_bounds(check)
+        found: list[dict] = []
+        stats = {"queries": 0}
+        bisect(sides, check, lo, hi, found, stats)
+        result["divergent_rows"] = found
+        result["bisect_queries"] = stats["queries"]
+        print(f"     🔎 bissection [{lo}, {hi}) : {stats['queries']} plages comparées")
+        for diff in found:
+            side = "PG seul   " if diff["side"] == "postgres_only" else "Neo4j seul"
+            print(f"     • {side} {tuple(diff['row'])}")
+        if len(found) >= MAX_REPORT:
+            print(f"     … arrêt à {MAX_REPORT} lignes divergentes")
+
+    result["wall_s"] = round(time.perf_counter() - start, 2)
+    return result
+
+
+# ============================================================
+# MAIN
+# ============================================================
+if __name__ == '__main__':
+    names = [check.name for check in CHECKS]
+    parser = argparse.ArgumentParser(description="Vérification de cohérence PostgreSQL ↔ Neo4j")
+    parser.add_argument("--only", nargs="+", choices=names, default=names,
+                        help="Labels / relations à vérifier (SHARES_ROOT est le plus long)")
+    parser.add_argument("--pg-schema", default="public", help="Schéma PostgreSQL (bascule bleu/vert)")
+    parser.add_argument("--database", default=os.getenv("NEO4J_DATABASE") or None,
+                        help="Base Neo4j (défaut : base par défaut)")
+    parser.add_argument("--json", help="Écrire le rapport dans ce fichier JSON")
+    args = parser.parse_args()
+
+    print("\n🕌 WikiQuran — verify_consistency.py\n")
+
+    separator("Connexions")
+    try:
+        pg_conn = psycopg2.connect(**PG_CONFIG, options=f"-c search_path={args.pg_schema},public")
+        driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+        driver.verify_connectivity()
+    except Exception as e:
+        print(f"  ❌ Connexion impossible : {e}")
+        sys.exit(2)
+    print(f"  ✅ PostgreSQL {PG_CONFIG['dbname']} (schéma {args.pg_schema}) | "
+          f"Neo4j {NEO4J_URI} (base {args.database or 'par défaut'})")
+
+    separator("Empreintes")
+    start = time.perf_counter()
+    try:
+        sides = Sides(pg_conn, driver, args.database)
+        results = [verify(sides, check) for check in CHECKS if check.name in args.only]
+    finally:
+        pg_conn.close()
+        driver.close()
+
+    report = {
+        "ok"     : all(r["ok"] for r in results),
+        "wall_s" : round(time.perf_counter() - start, 2),
+        "checks" : results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n  💾 {args.json}")
+
+    if not report["ok"]:
+        failed = ", ".join(r["name"] for r in results if not r["ok"])
+        print(f"\n❌ Incohérences : {failed} ({report['wall_s']} s)\n")
+        sys.exit(1)
+
+    print(f"\n✅ PostgreSQL et Neo4j cohérents ({report['wall_s']} s)\n")
@@ -10,16 +10,23 @@ Entrées :
   - data/quran_enriched/words.json
   - data/quran_enriched/occurrences.json
 
-Sortie :
+Sorties :
   - data/quran_enriched/wikiquran_final.json
+  - data/quran_enriched/wikiquran_final.wqc  (format binaire colonnaire, lu en mmap)
 
 Usage : python scripts/extraction/normalize.py
 """
 
 import json
 import os
+import sys
 from collections import defaultdict
 
+# Import des utilitaires partagés (normalisation arabe, format binaire)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.arabic import normalize
+from utils.corpus_artifact import write_artifact
+
 # ============================================================
 # Chemins
 # ============================================================
@@ -30,6 +37,7 @@ IN_ROOTS        = os.path.join(DATA_ENRICHED, "roots.json")
 IN_WORDS        = os.path.join(DATA_ENRICHED, "words.json")
 IN_OCCURRENCES  = os.path.join(DATA_ENRICHED, "occurrences.json")
 OUT_FINAL       = os.path.join(DATA_ENRICHED, "wikiquran_final.json")
+OUT_ARTIFACT    = os.path.join(DATA_ENRICHED, "wikiquran_final.wqc")
 
 
 def separator(title: str):
@@ -190,6 +198,8 @@ def build_final(surah_index, ayah_index, root_index,
             "surah_number" : a['surah_number'],
             "number"       : a['number'],
             "text_arabic"  : a['text_arabic'],
+            # Couches de texte supplémentaires (parse_tanzil.py --layer text_xxx=...)
+            **{k: v for k, v in a.items() if k.startswith('text_') and k != 'text_arabic'},
         })
 
     roots_clean = []
@@ -302,6 +312,23 @@ def export_final(final: dict):
     print(f"     Occurrences : {stats['occurrences_total']}")
 
 
+# ============================================================
+# ÉTAPE 6 — Export binaire
+# ============================================================
+def export_artifact(final: dict):
+    """
+    Exporte le même contenu au format binaire colonnaire (utils/corpus_artifact.py).
+    Le texte normalisé y est précalculé : l'API n'a plus à le recalculer au démarrage.
+    """
+    separator("ÉTAPE 6 — Export binaire")
+
+    ayahs = [{**a, "text_normalized": normalize(a['text_arabic'])} for a in final['ayahs']]
+    write_artifact({**final, "ayahs": ayahs}, OUT_ARTIFACT)
+
+    size_mb = os.path.getsize(OUT_ARTIFACT) / (1024 * 1024)
+    print(f"  💾 {OUT_ARTIFACT} ({size_mb:.1f} Mo)")
+
+
 # ============================================================
 # MAIN
 # ============================================================
@@ -321,6 +348,7 @@ if __name__ == '__main__':
 
     validate_final(final)
     export_final(final)
+    export_artifact(final)
 
     print("\n✅ normalize.py terminé avec succès !")
-    print("   → data/quran_enriched/wikiquran_final.json prêt pour l'import Phase 2 !\n")
\ No newline at end of file
+    print("   → data/quran_enriched/wikiquran_final.json (+ .wqc) prêt pour l'import Phase 2 !\n")
\ No newline at end of file
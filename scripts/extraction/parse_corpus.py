@@ -5,12 +5,20 @@ Parse le fichier de morphologie du Corpus Quran :
 Produit :
   - data/quran_enriched/words.json   → mots uniques + racine + POS + lemme
   - data/quran_enriched/occurrences.json → chaque apparition d'un mot dans un verset
-Usage : python scripts/extraction/parse_corpus.py
+Usage : python scripts/extraction/parse_corpus.py [--workers 4]
+
+Le fichier est découpé aux frontières de sourates et les morceaux sont parsés
+en parallèle ; la fusion rejoue l'ordre du fichier, le résultat est identique
+octet pour octet à un parsing séquentiel.
 """
 
+import argparse
+import io
 import json
 import os
+import re
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 # ============================================================
 # Chemins
@@ -51,6 +59,14 @@ def parse_location(location: str) -> tuple:
     return tuple(int(p) for p in parts)
 
 
+# Tokenizer précompilé des features : un tag = texte entre deux '|' (ou bords).
+# Seuls les tags utiles sont capturés ; en cas de répétition, le dernier l'emporte.
+_FEATURE_TOKENS = re.compile(
+    r"(?<![^|])(?:(STEM|PREFIX|SUFFIX)|POS:([^|]*)|LEM:([^|]*)|ROOT:([^|]*))(?![^|])"
+)
+_FEATURE_KEYS = (None, "segment_type", "pos", "lemma_bw", "root_bw")
+
+
 def parse_features(features: str) -> dict:
     """
     Parse la colonne FEATURES du fichier morphologie.
@@ -78,82 +94,123 @@ def parse_features(features: str) -> dict:
         "root_bw"      : None,   # Racine en Buckwalter
     }
 
-    tags = features.strip().split('|')
-
-    for tag in tags:
-        if tag in ('STEM', 'PREFIX', 'SUFFIX'):
-            result['segment_type'] = tag
-        elif tag.startswith('POS:'):
-            result['pos'] = tag.replace('POS:', '')
-        elif tag.startswith('LEM:'):
-            result['lemma_bw'] = tag.replace('LEM:', '')
-        elif tag.startswith('ROOT:'):
-            result['root_bw'] = tag.replace('ROOT:', '')
+    # Le numéro du groupe capturé désigne la clé (valeur vide conservée)
+    for match in _FEATURE_TOKENS.finditer(features.strip()):
+        result[_FEATURE_KEYS[match.lastindex]] = match.group(match.lastindex)
 
     return result
 
 
 # ============================================================
-# ÉTAPE 2 — Parser le fichier complet
+# ÉTAPE 2 — Parser le fichier complet (par morceaux, en parallèle)
 # ============================================================
-def parse_morphology() -> tuple[list, list, list]:
+def split_chunks(path: str, n_chunks: int) -> list[tuple[int, int]]:
     """
-    Parse le fichier morphologie complet.
-    Ne garde que les segments STEM (le mot racine, pas les préfixes/suffixes).
-
-    Retourne :
-        words       : liste de mots uniques
-        occurrences : liste d'occurrences (word -> ayah + position)
-        roots       : liste de racines uniques
+    Découpe le fichier en n_chunks plages d'octets [début, fin) de tailles proches,
+    coupées uniquement là où le numéro de sourate change.
+    """
+    boundaries = [0]       # débuts de sourate (en octets)
+    offset = 0
+    current = None
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.startswith(b'('):
+                surah = line[1:line.find(b':')]
+                if surah != current:
+                    if current is not None:
+                        boundaries.append(offset)
+                    current = surah
+            offset += len(line)
+
+    # Regrouper les sourates consécutives jusqu'à ~taille / n_chunks octets
+    target = offset / max(1, n_chunks)
+    chunks = []
+    start = 0
+    for boundary in boundaries[1:]:
+        if boundary - start >= target:
+            chunks.append((start, boundary))
+            start = boundary
+    chunks.append((start, offset))
+    return chunks
+
+
+def parse_chunk(args: tuple[str, int, int]) -> dict:
     """
-    print("📖 Parsing quranic-corpus-morphology-0.4.txt ...")
+    Parse une plage du fichier. Retourne les segments STEM dans l'ordre du fichier :
+    (surah, ayah, word_pos, form, root_bw, lemma_bw, pos), plus les compteurs.
+    Exécuté dans un processus du pool — pas d'état partagé.
+    """
+    path, start, end = args
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
 
-    # Dictionnaires pour dédupliquer
-    words_dict = {}   # text_arabic → word dict
-    roots_dict = {}   # root_bw     → root dict
+    stems = []
+    lines_parsed = 0
+    skipped = 0
 
-    occurrences      = []
-    seen_occurrences = set()  # dédupliquer par (surah, ayah, position)
-    lines_parsed     = 0
-    stems_found      = 0
-    skipped          = 0
-    dupes_ignored    = 0
+    # Même découpage en lignes qu'un fichier ouvert en mode texte
+    for line in io.TextIOWrapper(io.BytesIO(data), encoding='utf-8'):
+        line = line.rstrip()
 
-    with open(FILE_MORPHO, encoding='utf-8') as f:
-        for line in f:
-            line = line.rstrip()
+        # Ignorer commentaires et ligne d'en-tête
+        if line.startswith('#') or line.startswith('LOCATION'):
+            continue
+
+        # Parser la ligne
+        parts = line.split('\t')
+        if len(parts) < 4:
+            skipped += 1
+            continue
 
-            # Ignorer commentaires et ligne d'en-tête
-            if line.startswith('#') or line.startswith('LOCATION'):
-                continue
+        location_str, form, tag, features = parts[0], parts[1], parts[2], parts[3]
+        lines_parsed += 1
 
-            # Parser la ligne
-            parts = line.split('\t')
-            if len(parts) < 4:
-                skipped += 1
-                continue
+        # Parser la location
+        try:
+            surah, ayah_num, word_pos, segment = parse_location(location_str)
+        except Exception:
+            skipped += 1
+            continue
 
-            location_str, form, tag, features = parts[0], parts[1], parts[2], parts[3]
-            lines_parsed += 1
+        # Parser les features — inutile si aucun tag STEM n'est possible
+        if 'STEM' not in features:
+            continue
+        feat = parse_features(features)
 
-            # Parser la location
-            try:
-                surah, ayah_num, word_pos, segment = parse_location(location_str)
-            except Exception:
-                skipped += 1
-                continue
+        # On ne garde que les STEM (pas les préfixes bi+, al+, etc.)
+        if feat['segment_type'] != 'STEM':
+            continue
 
-            # Parser les features
-            feat = parse_features(features)
+        stems.append((surah, ayah_num, word_pos, form, feat['root_bw'], feat['lemma_bw'], feat['pos']))
 
-            # On ne garde que les STEM (pas les préfixes bi+, al+, etc.)
-            if feat['segment_type'] != 'STEM':
-                continue
+    return {"stems": stems, "lines_parsed": lines_parsed, "skipped": skipped}
 
-            stems_found += 1
+
+def merge_chunks(chunks: list[dict]) -> tuple[list, list, list, dict]:
+    """
+    Fusionne les morceaux dans l'ordre du fichier : mêmes dédoublonnages
+    et même ordre de première apparition qu'un parsing séquentiel,
+    donc mêmes IDs dans normalize.assign_ids.
+    """
+    # Dictionnaires pour dédupliquer
+    words_dict = {}   # text_arabic → word dict
+    roots_dict = {}   # root_bw     → root dict
+
+    occurrences      = []
+    seen_occurrences = set()  # dédupliquer par (surah, ayah, position)
+    stats = {
+        "lines_parsed" : sum(c['lines_parsed'] for c in chunks),
+        "skipped"      : sum(c['skipped'] for c in chunks),
+        "stems_found"  : 0,
+        "dupes_ignored": 0,
+    }
+
+    for chunk in chunks:
+        for surah, ayah_num, word_pos, form, root_bw, lemma_bw, pos in chunk['stems']:
+            stats['stems_found'] += 1
 
             # --- Traitement de la racine ---
-            root_bw = feat['root_bw']
             if root_bw and root_bw not in roots_dict:
                 roots_dict[root_bw] = {
                     "buckwalter"  : root_bw,
@@ -163,18 +220,14 @@ def parse_morphology() -> tuple[list, list, list]:
                 }
 
             # --- Traitement du mot ---
-            text_arabic = form  # forme Buckwalter du mot (on convertit)
-            # La forme arabe vient du fichier uthmani — ici on a le form en Buckwalter
-            # On utilise le form tel quel comme clé unique
-            word_key = form
-
-            if word_key not in words_dict:
-                words_dict[word_key] = {
+            # La forme Buckwalter sert de clé unique
+            if form not in words_dict:
+                words_dict[form] = {
                     "form_buckwalter" : form,
                     "root_bw"         : root_bw,
                     "root_arabic"     : buckwalter_to_arabic(root_bw) if root_bw else None,
-                    "lemma_bw"        : feat['lemma_bw'],
-                    "pos"             : feat['pos'],
+                    "lemma_bw"        : lemma_bw,
+                    "pos"             : pos,
                 }
 
             # --- Occurrence — dédupliquée par (surah, ayah, position) ---
@@ -192,19 +245,44 @@ def parse_morphology() -> tuple[list, list, list]:
                 if root_bw:
                     roots_dict[root_bw]['occurrences_count'] += 1
             else:
-                dupes_ignored += 1
+                stats['dupes_ignored'] += 1
+
+    return list(words_dict.values()), occurrences, list(roots_dict.values()), stats
+
+
+def parse_morphology(workers: int | None = None, path: str = FILE_MORPHO) -> tuple[list, list, list]:
+    """
+    Parse le fichier morphologie complet.
+    Ne garde que les segments STEM (le mot racine, pas les préfixes/suffixes).
+
+    Args:
+        workers: nombre de processus (défaut : nombre de CPU, 1 = séquentiel)
+        path   : fichier morphologie (défaut : FILE_MORPHO)
+
+    Retourne :
+        words       : liste de mots uniques
+        occurrences : liste d'occurrences (word -> ayah + position)
+        roots       : liste de racines uniques
+    """
+    workers = workers or os.cpu_count() or 1
+    print(f"📖 Parsing {os.path.basename(path)} ({workers} processus) ...")
+
+    if workers == 1:
+        chunks = [parse_chunk((path, 0, os.path.getsize(path)))]
+    else:
+        ranges = [(path, start, end) for start, end in split_chunks(path, workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(parse_chunk, ranges))   # map conserve l'ordre
 
-    # Conversion en listes
-    words = list(words_dict.values())
-    roots = list(roots_dict.values())
+    words, occurrences, roots, stats = merge_chunks(chunks)
 
-    print(f"  ✅ Lignes parsées       : {lines_parsed:>7}")
-    print(f"  ✅ Segments STEM gardés : {stems_found:>7}")
+    print(f"  ✅ Lignes parsées       : {stats['lines_parsed']:>7}")
+    print(f"  ✅ Segments STEM gardés : {stats['stems_found']:>7}")
     print(f"  ✅ Mots uniques         : {len(words):>7}")
     print(f"  ✅ Racines uniques      : {len(roots):>7}")
     print(f"  ✅ Occurrences uniques  : {len(occurrences):>7}")
-    print(f"  ⚠️  Doublons ignorés     : {dupes_ignored:>7}")
-    print(f"  ⚠️  Lignes ignorées      : {skipped:>7}")
+    print(f"  ⚠️  Doublons ignorés     : {stats['dupes_ignored']:>7}")
+    print(f"  ⚠️  Lignes ignorées      : {stats['skipped']:>7}")
 
     return words, occurrences, roots
 
@@ -296,6 +374,11 @@ def print_preview(words: list, occurrences: list, roots: list):
 # MAIN
 # ============================================================
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Parse le fichier de morphologie du Corpus Quran")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Nombre de processus (défaut : nombre de CPU, 1 = séquentiel)")
+    args = parser.parse_args()
+
     print("\n🕌 WikiQuran — parse_corpus.py\n")
 
     if not os.path.exists(FILE_MORPHO):
@@ -303,7 +386,7 @@ if __name__ == '__main__':
         exit(1)
 
     # Pipeline
-    words, occurrences, roots = parse_morphology()
+    words, occurrences, roots = parse_morphology(args.workers)
     validate(words, occurrences, roots)
 
     print("\n💾 Export JSON ...")
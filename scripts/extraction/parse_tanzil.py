@@ -4,11 +4,22 @@ Parse les deux fichiers Tanzil :
   - quran-uthmani.xml  → texte arabe des versets
   - quran-data.xml     → métadonnées des sourates
 Produit : data/quran_enriched/surahs.json + ayahs.json
-Usage : python scripts/extraction/parse_tanzil.py
+Usage : python scripts/extraction/parse_tanzil.py [--layer text_simple=data/quran_raw/quran-simple.xml ...]
+
+Lecture et écriture en flux : iterparse libère chaque élément dès qu'il est
+traité, et chaque verset (texte Uthmani + une couche par --layer) est écrit
+dans ayahs.json sitôt construit. Seuls les 114 sourates et l'aperçu restent
+en mémoire : ni la taille des fichiers ni le nombre de couches ne la font
+grandir. Une couche supplémentaire (écriture simple, autre riwaya, traduction
+Tanzil) a la même forme <sura index><aya index text/></sura> et s'ajoute aux
+versets sous le nom de champ donné.
 """
 
+import argparse
 import json
 import os
+import textwrap
+from typing import Iterator
 from lxml import etree
 
 # ============================================================
@@ -21,6 +32,52 @@ FILE_METADATA = os.path.join(DATA_RAW, "quran-data.xml")
 OUT_SURAHS    = os.path.join(DATA_ENRICHED, "surahs.json")
 OUT_AYAHS     = os.path.join(DATA_ENRICHED, "ayahs.json")
 
+PREVIEW_AYAHS = 5
+
+
+# ============================================================
+# Lecture en flux
+# ============================================================
+def _release(elem):
+    """Libère un élément traité et ses frères précédents déjà lus."""
+    elem.clear()
+    while elem.getprevious() is not None:
+        del elem.getparent()[0]
+
+
+def iter_suras_metadata(path: str) -> Iterator[dict]:
+    """Attributs de chaque <sura> de quran-data.xml, un par un."""
+    for _, sura in etree.iterparse(path, events=('end',), tag='sura'):
+        yield dict(sura.attrib)
+        _release(sura)
+
+
+def iter_text_layer(path: str) -> Iterator[dict]:
+    """
+    Versets d'un fichier texte Tanzil (<quran><sura><aya/></sura></quran>), un par un.
+    Chaque record porte aussi le numéro et le nom de sa sourate.
+
+    Exemple de record :
+        {"surah_number": 1, "surah_name": "الفاتحة", "number": 1, "text": "بِسْمِ ..."}
+    """
+    surah_number = None
+    surah_name   = None
+    for event, elem in etree.iterparse(path, events=('start', 'end'), tag=('sura', 'aya')):
+        if elem.tag == 'sura':
+            if event == 'start':
+                surah_number = int(elem.attrib['index'])
+                surah_name   = elem.attrib.get('name', '')
+            else:
+                _release(elem)
+        elif event == 'end':
+            yield {
+                "surah_number": surah_number,
+                "surah_name"  : surah_name,
+                "number"      : int(elem.attrib['index']),
+                "text"        : elem.attrib['text'],
+            }
+            _release(elem)
+
 
 # ============================================================
 # ÉTAPE 1 — Parser quran-data.xml (métadonnées sourates)
@@ -44,26 +101,22 @@ def parse_metadata() -> dict:
         }
     """
     print("📖 Parsing quran-data.xml ...")
-    tree = etree.parse(FILE_METADATA)
-    root = tree.getroot()
 
     metadata = {}
-    suras = root.find('suras')
-
-    for sura in suras:
-        index = sura.attrib['index']
+    for sura in iter_suras_metadata(FILE_METADATA):
+        index = sura['index']
         metadata[index] = {
             # Ordre de révélation chronologique (clé analytique)
-            "revelation_order"     : int(sura.attrib['order']),
+            "revelation_order"     : int(sura['order']),
             # Type mecquois/médinois → on normalise en minuscules
-            "type"                 : sura.attrib['type'].lower(),  # 'meccan' | 'medinan'
+            "type"                 : sura['type'].lower(),  # 'meccan' | 'medinan'
             # Nombre de versets
-            "ayas_count"           : int(sura.attrib['ayas']),
+            "ayas_count"           : int(sura['ayas']),
             # Sections de récitation
-            "rukus"                : int(sura.attrib['rukus']),
+            "rukus"                : int(sura['rukus']),
             # Noms alternatifs (pour future recherche)
-            "name_en"              : sura.attrib.get('ename', ''),
-            "name_transliteration" : sura.attrib.get('tname', ''),
+            "name_en"              : sura.get('ename', ''),
+            "name_transliteration" : sura.get('tname', ''),
         }
 
     print(f"  ✅ {len(metadata)} sourates parsées")
@@ -73,63 +126,118 @@ def parse_metadata() -> dict:
 # ============================================================
 # ÉTAPE 2 — Parser quran-uthmani.xml (texte + fusion métadonnées)
 # ============================================================
-def parse_uthmani(metadata: dict) -> tuple[list, list]:
+def parse_uthmani(metadata: dict, layers: dict[str, str] | None = None) -> Iterator[tuple[str, dict]]:
     """
-    Parse quran-uthmani.xml et fusionne avec les métadonnées.
-    Produit deux listes : surahs et ayahs.
+    Parse quran-uthmani.xml et fusionne avec les métadonnées, en flux.
+    Produit, dans l'ordre du fichier, ("surah", sourate) puis un
+    ("ayah", verset) pour chacun de ses versets.
 
     Args:
         metadata: dictionnaire retourné par parse_metadata()
-
-    Retourne :
-        surahs : liste de dicts sourates enrichies
-        ayahs  : liste de dicts versets
+        layers  : couches de texte supplémentaires {champ: chemin XML},
+                  lues en parallèle du texte Uthmani, verset par verset
     """
     print("📖 Parsing quran-uthmani.xml ...")
-    tree = etree.parse(FILE_UTHMANI)
-    root = tree.getroot()
-
-    surahs = []
-    ayahs  = []
-
-    for sura in root:
-        surah_number = int(sura.attrib['index'])
-        surah_index  = str(surah_number)
-
-        # Récupération des métadonnées depuis quran-data.xml
-        meta = metadata.get(surah_index, {})
-
-        # Construction du nœud Surah
-        surah = {
-            "number"              : surah_number,
-            "name_arabic"         : sura.attrib['name'],
-            "name_en"             : meta.get('name_en', ''),
-            "name_transliteration": meta.get('name_transliteration', ''),
-            "revelation_order"    : meta.get('revelation_order'),
-            "type"                : meta.get('type'),          # 'meccan' | 'medinan'
-            "ayas_count"          : meta.get('ayas_count'),
-            "rukus"               : meta.get('rukus'),
-        }
-        surahs.append(surah)
-
-        # Construction des nœuds Ayah
-        for aya in sura:
-            ayah = {
-                "surah_number" : surah_number,
-                "number"       : int(aya.attrib['index']),
-                "text_arabic"  : aya.attrib['text'],
+    layers = layers or {}
+
+    # Un flux par couche, avancés ensemble : un seul verset de chaque en mémoire
+    extra = {name: iter_text_layer(path) for name, path in layers.items()}
+
+    surah_number = None
+    for record in iter_text_layer(FILE_UTHMANI):
+        # Nouvelle sourate → construction du nœud Surah
+        if record['surah_number'] != surah_number:
+            surah_number = record['surah_number']
+            # Récupération des métadonnées depuis quran-data.xml
+            meta = metadata.get(str(surah_number), {})
+            yield "surah", {
+                "number"              : surah_number,
+                "name_arabic"         : record['surah_name'],
+                "name_en"             : meta.get('name_en', ''),
+                "name_transliteration": meta.get('name_transliteration', ''),
+                "revelation_order"    : meta.get('revelation_order'),
+                "type"                : meta.get('type'),          # 'meccan' | 'medinan'
+                "ayas_count"          : meta.get('ayas_count'),
+                "rukus"               : meta.get('rukus'),
             }
-            ayahs.append(ayah)
 
-    print(f"  ✅ {len(surahs)} sourates construites")
-    print(f"  ✅ {len(ayahs)} versets construits")
-    return surahs, ayahs
+        # Construction du nœud Ayah
+        ayah = {
+            "surah_number" : surah_number,
+            "number"       : record['number'],
+            "text_arabic"  : record['text'],
+        }
+
+        # Couches supplémentaires — même verset attendu dans chaque fichier
+        for name, stream in extra.items():
+            other = next(stream, None)
+            if other is None or (other['surah_number'], other['number']) != (surah_number, record['number']):
+                raise ValueError(
+                    f"❌ Couche '{name}' désalignée au verset {surah_number}:{record['number']}"
+                )
+            ayah[name] = other['text']
+
+        yield "ayah", ayah
+
+    for name, stream in extra.items():
+        if next(stream, None) is not None:
+            raise ValueError(f"❌ Couche '{name}' plus longue que le texte Uthmani")
 
 
 # ============================================================
-# ÉTAPE 3 — Validation des données
+# ÉTAPE 3 — Export JSON (en flux)
 # ============================================================
-def validate(surahs: list, ayahs: list):
+def _json_item(item: dict) -> str:
+    """Un élément de liste tel que l'écrit json.dump(..., indent=2)."""
+    return textwrap.indent(json.dumps(item, ensure_ascii=False, indent=2), "  ")
+
+
+def export_json(records: Iterator[tuple[str, dict]]) -> dict:
+    """
+    Écrit les versets dans ayahs.json au fil de `records` (parse_uthmani),
+    puis les sourates dans surahs.json. Même contenu que json.dump(..., indent=2).
+    Fichiers écrits à côté (.tmp), publiés par publish_json() après validation.
+
+    Retourne :
+        {"surahs": [...], "ayah_count": int, "without_text": int, "preview": [5 premiers versets]}
+    """
+    os.makedirs(DATA_ENRICHED, exist_ok=True)
+
+    stats = {"surahs": [], "ayah_count": 0, "without_text": 0, "preview": []}
+    with open(OUT_AYAHS + ".tmp", 'w', encoding='utf-8') as f:
+        f.write("[")
+        for kind, item in records:
+            if kind == "surah":
+                stats["surahs"].append(item)
+                continue
+            f.write(",\n" if stats["ayah_count"] else "\n")
+            f.write(_json_item(item))
+            stats["ayah_count"] += 1
+            stats["without_text"] += not item['text_arabic']
+            if len(stats["preview"]) < PREVIEW_AYAHS:
+                stats["preview"].append(item)
+        f.write("\n]" if stats["ayah_count"] else "]")
+
+    with open(OUT_SURAHS + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(stats["surahs"], f, ensure_ascii=False, indent=2)
+
+    print(f"  ✅ {len(stats['surahs'])} sourates construites")
+    print(f"  ✅ {stats['ayah_count']} versets construits")
+    return stats
+
+
+def publish_json():
+    """Remplace les JSON publiés par ceux d'export_json() (jamais de fichier partiel)."""
+    for path in (OUT_SURAHS, OUT_AYAHS):
+        os.replace(path + ".tmp", path)
+        size = os.path.getsize(path) / 1024
+        print(f"  💾 {path} ({size:.1f} Ko)")
+
+
+# ============================================================
+# ÉTAPE 4 — Validation des données
+# ============================================================
+def validate(surahs: list, ayah_count: int, without_text: int):
     """
     Vérifie la cohérence des données parsées.
     Lève une exception si une anomalie est détectée.
@@ -140,7 +248,7 @@ def validate(surahs: list, ayahs: list):
     assert len(surahs) == 114, f"❌ Attendu 114 sourates, obtenu {len(surahs)}"
 
     # Nombre de versets
-    assert len(ayahs) == 6236, f"❌ Attendu 6236 versets, obtenu {len(ayahs)}"
+    assert ayah_count == 6236, f"❌ Attendu 6236 versets, obtenu {ayah_count}"
 
     # Vérification que tous les types sont valides
     types_invalides = [s for s in surahs if s['type'] not in ('meccan', 'medinan')]
@@ -152,34 +260,11 @@ def validate(surahs: list, ayahs: list):
         assert 1 <= rev <= 114, f"❌ Ordre révélation invalide : {rev} pour sourate {s['number']}"
 
     # Vérification que chaque verset a du texte arabe
-    sans_texte = [a for a in ayahs if not a['text_arabic']]
-    assert not sans_texte, f"❌ Versets sans texte : {len(sans_texte)}"
+    assert not without_text, f"❌ Versets sans texte : {without_text}"
 
     print("  ✅ Toutes les validations passées")
 
 
-# ============================================================
-# ÉTAPE 4 — Export JSON
-# ============================================================
-def export_json(surahs: list, ayahs: list):
-    """
-    Exporte les données parsées en JSON dans data/quran_enriched/.
-    """
-    os.makedirs(DATA_ENRICHED, exist_ok=True)
-
-    # Export surahs.json
-    with open(OUT_SURAHS, 'w', encoding='utf-8') as f:
-        json.dump(surahs, f, ensure_ascii=False, indent=2)
-    size = os.path.getsize(OUT_SURAHS) / 1024
-    print(f"  💾 {OUT_SURAHS} ({size:.1f} Ko)")
-
-    # Export ayahs.json
-    with open(OUT_AYAHS, 'w', encoding='utf-8') as f:
-        json.dump(ayahs, f, ensure_ascii=False, indent=2)
-    size = os.path.getsize(OUT_AYAHS) / 1024
-    print(f"  💾 {OUT_AYAHS} ({size:.1f} Ko)")
-
-
 # ============================================================
 # APERÇU — Affiche quelques exemples pour vérification visuelle
 # ============================================================
@@ -192,8 +277,8 @@ def print_preview(surahs: list, ayahs: list):
               f"type={s['type']:<8} | révélation={s['revelation_order']:>3} | "
               f"versets={s['ayas_count']:>3}")
 
-    print("\n--- Aperçu : 5 premiers versets ---")
-    for a in ayahs[:5]:
+    print(f"\n--- Aperçu : {len(ayahs)} premiers versets ---")
+    for a in ayahs:
         print(f"  {a['surah_number']}:{a['number']:>3} | {a['text_arabic']}")
 
     print("\n--- Aperçu : statistiques analytiques ---")
@@ -216,23 +301,44 @@ def print_preview(surahs: list, ayahs: list):
 # ============================================================
 # MAIN
 # ============================================================
+def layer_arg(value: str) -> tuple[str, str]:
+    """Valeur de --layer : CHAMP=CHEMIN, CHAMP en text_xxx."""
+    name, sep, path = value.partition("=")
+    if not sep or not name or not path:
+        raise argparse.ArgumentTypeError(f"CHAMP=CHEMIN attendu, obtenu {value!r}")
+    # Les couches suivent le verset jusqu'au .wqc (colonnes text_* de corpus_artifact)
+    if not name.startswith("text_") or name in ("text_arabic", "text_normalized"):
+        raise argparse.ArgumentTypeError(
+            f"couche invalide : {name!r} (attendu text_xxx, hors text_arabic / text_normalized)"
+        )
+    return name, path
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Parse les fichiers Tanzil")
+    parser.add_argument("--layer", action="append", default=[], type=layer_arg, metavar="CHAMP=CHEMIN",
+                        help="Couche de texte supplémentaire (ex: text_simple=data/quran_raw/quran-simple.xml)")
+    args = parser.parse_args()
+    layers = dict(args.layer)
+
     print("\n🕌 WikiQuran — parse_tanzil.py\n")
 
     # Vérification fichiers source
-    for f in [FILE_UTHMANI, FILE_METADATA]:
+    for f in [FILE_UTHMANI, FILE_METADATA, *layers.values()]:
         if not os.path.exists(f):
             print(f"❌ Fichier introuvable : {f}")
             exit(1)
 
-    # Pipeline
-    metadata        = parse_metadata()
-    surahs, ayahs   = parse_uthmani(metadata)
-    validate(surahs, ayahs)
+    # Pipeline — les versets vont du XML au JSON sans liste intermédiaire
+    metadata = parse_metadata()
+    stats    = export_json(parse_uthmani(metadata, layers))
+    if layers:
+        print(f"  ✅ Couches supplémentaires : {', '.join(layers)}")
+    validate(stats["surahs"], stats["ayah_count"], stats["without_text"])
 
     print("\n💾 Export JSON ...")
-    export_json(surahs, ayahs)
+    publish_json()
 
-    print_preview(surahs, ayahs)
+    print_preview(stats["surahs"], stats["preview"])
 
     print("\n✅ parse_tanzil.py terminé avec succès !\n")
\ No newline at end of file
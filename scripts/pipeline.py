@@ -0,0 +1,307 @@
+"""
+WikiQuran — scripts/pipeline.py
+Enchaîne tout le pipeline de données en une commande :
+    parse_tanzil ┐
+                 ├→ normalize → import_postgres → import_neo4j
+    parse_corpus ┘
+
+Chaque étape est identifiée par l'empreinte SHA-256 de son code, de ses entrées
+et des empreintes des étapes dont elle dépend. Une étape dont l'empreinte n'a pas
+changé (et dont les sorties sont intactes) est sautée. Les étapes indépendantes
+tournent en parallèle (processus séparés).
+
+Rapport JSON : durée et pic mémoire (RSS max) de chaque étape.
+
+Usage : python scripts/pipeline.py [--force] [--only normalize import_postgres]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+# ============================================================
+# Configuration
+# ============================================================
+DATA_RAW      = "data/quran_raw"
+DATA_ENRICHED = "data/quran_enriched"
+SCRIPTS_DIR   = os.path.dirname(os.path.abspath(__file__))
+UTILS_DIR     = os.path.join(SCRIPTS_DIR, "utils")
+
+CACHE_FILE  = os.path.join(DATA_ENRICHED, ".pipeline_cache.json")
+REPORT_FILE = os.path.join(DATA_ENRICHED, "pipeline_report.json")
+LOGS_DIR    = os.path.join(DATA_ENRICHED, "pipeline_logs")
+
+
+class Stage:
+    """Une étape : un script, ses fichiers d'entrée et de sortie, ses dépendances."""
+
+    def __init__(self, name: str, script: str, inputs: list[str],
+                 outputs: list[str], after: list[str]):
+        self.name = name
+        self.script = os.path.join(SCRIPTS_DIR, script)
+        self.inputs = inputs
+        self.outputs = outputs
+        self.after = after
+
+
+STAGES = [
+    Stage(
+        "parse_tanzil", "extraction/parse_tanzil.py",
+        inputs=[os.path.join(DATA_RAW, "quran-uthmani.xml"), os.path.join(DATA_RAW, "quran-data.xml")],
+        outputs=[os.path.join(DATA_ENRICHED, "surahs.json"), os.path.join(DATA_ENRICHED, "ayahs.json")],
+        after=[],
+    ),
+    Stage(
+        "parse_corpus", "extraction/parse_corpus.py",
+        inputs=[os.path.join(DATA_RAW, "quranic-corpus-morphology-0.4.txt")],
+        outputs=[
+            os.path.join(DATA_ENRICHED, "words.json"),
+            os.path.join(DATA_ENRICHED, "occurrences.json"),
+            os.path.join(DATA_ENRICHED, "roots.json"),
+        ],
+        after=[],
+    ),
+    Stage(
+        "normalize", "extraction/normalize.py",
+        inputs=[
+            os.path.join(DATA_ENRICHED, f"{name}.json")
+            for name in ("surahs", "ayahs", "roots", "words", "occurrences")
+        ],
+        outputs=[
+            os.path.join(DATA_ENRICHED, "wikiquran_final.json"),
+            os.path.join(DATA_ENRICHED, "wikiquran_final.wqc"),
+        ],
+        after=["parse_tanzil", "parse_corpus"],
+    ),
+    # Étapes base de données : pas de fichier de sortie, l'empreinte suffit
+    Stage(
+        "import_postgres", "database/import_postgres.py",
+        inputs=[os.path.join(DATA_ENRICHED, "wikiquran_final.wqc")],
+        outputs=[],
+        after=["normalize"],
+    ),
+    Stage(
+        "import_neo4j", "database/import_neo4j.py",
+        inputs=[],
+        outputs=[],
+        after=["import_postgres"],
+    ),
+]
+
+
+def separator(title: str):
+    print(f"\n{'=' * 60}")
+    print(f"  {title}")
+    print(f"{'=' * 60}\n")
+
+
+# ============================================================
+# Empreintes
+# ============================================================
+def file_hash(path: str) -> str:
+    """SHA-256 d'un fichier, lu par blocs. Fichier absent → 'missing'."""
+    if not os.path.exists(path):
+        return "missing"
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def utils_files() -> list[str]:
+    """Utilitaires partagés — une modification invalide toutes les étapes."""
+    return sorted(
+        os.path.join(UTILS_DIR, name)
+        for name in os.listdir(UTILS_DIR)
+        if name.endswith(".py")
+    )
+
+
+def stage_key(stage: Stage, upstream: dict[str, str]) -> str:
+    """Empreinte d'une étape : code + utilitaires + entrées + empreintes amont."""
+    digest = hashlib.sha256()
+    for path in [stage.script, *utils_files(), *stage.inputs]:
+        digest.update(f"{os.path.relpath(path)}={file_hash(path)}\n".encode())
+    for name in stage.after:
+        digest.update(f"{name}={upstream[name]}\n".encode())
+    return digest.hexdigest()
+
+
+def load_cache() -> dict:
+    if not os.path.exists(CACHE_FILE):
+        return {}
+    with open(CACHE_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_cache(cache: dict):
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    with open(CACHE_FILE, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+
+
+def is_fresh(stage: Stage, key: str, cache: dict) -> bool:
+    """Vrai si l'étape a déjà tourné avec cette empreinte et que ses sorties sont intactes."""
+    entry = cache.get(stage.name)
+    if not entry or entry["key"] != key:
+        return False
+    return all(entry["outputs"].get(path) == file_hash(path) for path in stage.outputs)
+
+
+# ============================================================
+# Exécution d'une étape
+# ============================================================
+def run_stage(stage: Stage) -> dict:
+    """
+    Lance le script dans un processus séparé (sortie → pipeline_logs/<étape>.log).
+    os.wait4 donne l'usage ressources du processus fils : ru_maxrss = pic RSS.
+    """
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    log_path = os.path.join(LOGS_DIR, f"{stage.name}.log")
+
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.Popen([sys.executable, stage.script], stdout=log, stderr=subprocess.STDOUT)
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss : kilo-octets sous Linux, octets sous macOS
+            peak_kb = usage.ru_maxrss if sys.platform != "darwin" else usage.ru_maxrss // 1024
+            peak_mb = round(peak_kb / 1024, 1)
+        else:
+            proc.wait()
+            peak_mb = None
+
+    return {
+        "returncode": proc.returncode,
+        "wall_s"    : round(time.perf_counter() - start, 2),
+        "peak_rss_mb": peak_mb,
+        "log"       : log_path,
+    }
+
+
+def tail(path: str, lines: int = 20) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return "".join(f.readlines()[-lines:])
+
+
+# ============================================================
+# Ordonnancement
+# ============================================================
+def run_pipeline(selected: set[str], force: bool) -> dict:
+    """
+    Lance les étapes dès que leurs dépendances sont terminées.
+    Une étape est recalculée si son empreinte a changé, si elle est forcée,
+    ou si une étape amont vient d'être recalculée (empreinte amont différente).
+    """
+    cache = load_cache()
+    stages = {stage.name: stage for stage in STAGES}
+    keys: dict[str, str] = {}
+    results: dict[str, dict] = {}
+    pending = [stage.name for stage in STAGES]
+    running = {}
+    failed = False
+
+    with ThreadPoolExecutor(max_workers=len(STAGES)) as pool:
+        while pending or running:
+            # 1. Étapes prêtes : dépendances terminées avec succès
+            for name in list(pending):
+                stage = stages[name]
+                if failed or any(dep not in results for dep in stage.after):
+                    continue
+                pending.remove(name)
+
+                # Dépendance en échec → étape abandonnée
+                if any(results[dep]["status"] in ("failed", "blocked") for dep in stage.after):
+                    results[name] = {"status": "blocked"}
+                    continue
+
+                key = stage_key(stage, keys)
+                keys[name] = key
+
+                if name not in selected:
+                    results[name] = {"status": "not_selected", "key": key}
+                    print(f"  ⏭️  {name:<16} non sélectionnée")
+                elif not force and is_fresh(stage, key, cache):
+                    results[name] = {"status": "skipped", "key": key}
+                    print(f"  ♻️  {name:<16} inchangée — sautée")
+                else:
+                    print(f"  ▶️  {name:<16} lancée")
+                    running[pool.submit(run_stage, stage)] = name
+
+            if not running:
+                if pending and failed:
+                    for name in pending:
+                        results[name] = {"status": "blocked"}
+                    pending.clear()
+                continue
+
+            # 2. Attendre la fin d'au moins une étape
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                stage = stages[name]
+                result = future.result()
+                result["key"] = keys[name]
+
+                if result["returncode"] == 0:
+                    result["status"] = "ran"
+                    cache[name] = {
+                        "key"    : keys[name],
+                        "outputs": {path: file_hash(path) for path in stage.outputs},
+                    }
+                    save_cache(cache)
+                    print(f"  ✅ {name:<16} {result['wall_s']:>8.2f} s  {result['peak_rss_mb']} Mo")
+                else:
+                    result["status"] = "failed"
+                    failed = True
+                    print(f"  ❌ {name:<16} code {result['returncode']} — voir {result['log']}")
+                    print(tail(result["log"]))
+                results[name] = result
+
+    return results
+
+
+def write_report(results: dict, started_at: str, wall_s: float):
+    report = {
+        "started_at": started_at,
+        "wall_s"    : round(wall_s, 2),
+        "stages"    : [{"name": stage.name, **results.get(stage.name, {})} for stage in STAGES],
+    }
+    os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
+    with open(REPORT_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n  💾 {REPORT_FILE}")
+
+
+# ============================================================
+# MAIN
+# ============================================================
+if __name__ == '__main__':
+    names = [stage.name for stage in STAGES]
+    parser = argparse.ArgumentParser(description="Pipeline de données WikiQuran avec cache")
+    parser.add_argument("--force", action="store_true", help="Ignorer le cache et tout relancer")
+    parser.add_argument("--only", nargs="+", choices=names, default=names,
+                        help="Étapes à exécuter (les autres ne sont pas lancées)")
+    args = parser.parse_args()
+
+    print("\n🕌 WikiQuran — pipeline.py\n")
+    separator("EXÉCUTION")
+
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    start = time.perf_counter()
+    results = run_pipeline(set(args.only), args.force)
+    write_report(results, started_at, time.perf_counter() - start)
+
+    if any(r.get("status") in ("failed", "blocked") for r in results.values()):
+        print("\n❌ Pipeline interrompu\n")
+        sys.exit(1)
+
+    print("\n✅ Pipeline terminé avec succès !\n")
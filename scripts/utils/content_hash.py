@@ -0,0 +1,71 @@
+"""
+WikiQuran — utils/content_hash.py
+Empreintes de contenu des lignes PostgreSQL (colonne content_hash).
+
+Une empreinte ne couvre que ce qui est projeté dans Neo4j :
+    root : buckwalter, arabe, nombre d'occurrences
+    word : forme, POS, lemme, racine (buckwalter)
+    ayah : sourate, numéro, et la suite (position, mot, racine) de ses occurrences
+Corriger la racine d'un mot change donc l'empreinte de chaque verset qui le contient :
+ce sont exactement les versets dont les SHARES_ROOT doivent être recalculés.
+
+Utilisé par import_postgres.py (après l'import) et import_neo4j.py --delta
+(avant la comparaison, pour prendre en compte les corrections faites à la main en SQL).
+"""
+
+# Colonnes ajoutées aux bases créées avant leur introduction
+SCHEMA_STATEMENTS = [
+    "ALTER TABLE root ADD COLUMN IF NOT EXISTS content_hash CHAR(32)",
+    "ALTER TABLE word ADD COLUMN IF NOT EXISTS content_hash CHAR(32)",
+    "ALTER TABLE ayah ADD COLUMN IF NOT EXISTS content_hash CHAR(32)",
+]
+
+# Table → UPDATE qui ne touche que les lignes dont l'empreinte a changé
+REFRESH_STATEMENTS = {
+    "root": """
+        UPDATE root r SET content_hash = h.hash
+        FROM (
+            SELECT id, md5(concat_ws('|', buckwalter, arabic, coalesce(occurrences_count::text, ''))) AS hash
+            FROM root
+        ) h
+        WHERE h.id = r.id AND r.content_hash IS DISTINCT FROM h.hash
+    """,
+    "word": """
+        UPDATE word w SET content_hash = h.hash
+        FROM (
+            SELECT w.id,
+                   md5(concat_ws('|', w.text_arabic, coalesce(w.pos, ''),
+                                 coalesce(w.lemma_buckwalter, ''), coalesce(r.buckwalter, ''))) AS hash
+            FROM word w
+            LEFT JOIN root r ON r.id = w.root_id
+        ) h
+        WHERE h.id = w.id AND w.content_hash IS DISTINCT FROM h.hash
+    """,
+    "ayah": """
+        UPDATE ayah a SET content_hash = h.hash
+        FROM (
+            SELECT a.id,
+                   md5(concat_ws('|', a.surah_id, a.number,
+                       string_agg(wo.position || ':' || wo.word_id || ':' || coalesce(r.buckwalter, ''),
+                                  ',' ORDER BY wo.position))) AS hash
+            FROM ayah a
+            LEFT JOIN word_occurrence wo ON wo.ayah_id = a.id
+            LEFT JOIN word w ON w.id = wo.word_id
+            LEFT JOIN root r ON r.id = w.root_id
+            GROUP BY a.id
+        ) h
+        WHERE h.id = a.id AND a.content_hash IS DISTINCT FROM h.hash
+    """,
+}
+
+
+def refresh_content_hashes(cur) -> dict[str, int]:
+    """
+    Recalcule les empreintes (dans la transaction du curseur, sans commit).
+    Retourne le nombre de lignes dont l'empreinte a changé, par table.
+    """
+    changed = {}
+    for table, sql in REFRESH_STATEMENTS.items():
+        cur.execute(sql)
+        changed[table] = cur.rowcount
+    return changed
@@ -0,0 +1,249 @@
+"""
+WikiQuran — utils/corpus_artifact.py
+Format binaire colonnaire du corpus final (remplace la lecture de wikiquran_final.json).
+Copie identique dans scripts/utils/ (écriture + import) et backend/app/utils/ (API).
+
+Disposition du fichier (entiers little-endian) :
+    MAGIC 'WQCA' | version u16 | réservé u16 | position de l'en-tête u64 | taille u32
+    colonnes alignées sur 8 octets :
+        - 'i4'  : int32, None codé par NULL_INT
+        - 'str' : table d'offsets uint32 (n + 1) + octets UTF-8 concaténés,
+                  plus un masque de nulls (1 octet par ligne) si la colonne en contient
+    en-tête JSON en fin de fichier (meta + [position, taille] de chaque bloc)
+Le fichier est lu par mmap : rien n'est décodé tant qu'une colonne n'est pas lue.
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+MAGIC = b"WQCA"
+VERSION = 1
+ALIGN = 8
+NULL_INT = -2 ** 31
+
+_PREAMBLE = struct.Struct("<4sHHQI")
+
+# Tables et colonnes — mêmes champs que wikiquran_final.json
+# (plus, pour ayahs, les couches text_* de parse_tanzil.py --layer : voir _columns)
+SCHEMA = {
+    "surahs": (
+        ("id", "i4"), ("number", "i4"), ("name_arabic", "str"), ("name_en", "str"),
+        ("name_transliteration", "str"), ("revelation_order", "i4"), ("type", "str"),
+        ("ayas_count", "i4"), ("rukus", "i4"),
+    ),
+    "ayahs": (
+        ("id", "i4"), ("surah_id", "i4"), ("surah_number", "i4"), ("number", "i4"),
+        ("text_arabic", "str"), ("text_normalized", "str"),
+    ),
+    "roots": (
+        ("id", "i4"), ("buckwalter", "str"), ("arabic", "str"),
+        ("arabic_display", "str"), ("occurrences_count", "i4"),
+    ),
+    "words": (
+        ("id", "i4"), ("form_buckwalter", "str"), ("root_id", "i4"),
+        ("root_bw", "str"), ("lemma_bw", "str"), ("pos", "str"),
+    ),
+    "occurrences": (
+        ("ayah_id", "i4"), ("word_id", "i4"), ("position", "i4"),
+        ("surah_number", "i4"), ("ayah_number", "i4"), ("root_bw", "str"),
+    ),
+}
+
+
+# Couches de texte supplémentaires : colonnes str ajoutées à ayahs
+LAYER_PREFIX = "text_"
+
+
+def _columns(table: str, rows: list[dict]) -> tuple:
+    """Colonnes fixes du SCHEMA, plus les couches text_* présentes dans les versets."""
+    columns = SCHEMA[table]
+    if table != "ayahs":
+        return columns
+    fixed = {name for name, _ in columns}
+    layers = sorted({k for row in rows for k in row if k.startswith(LAYER_PREFIX) and k not in fixed})
+    return columns + tuple((name, "str") for name in layers)
+
+
+def _le_bytes(values: array) -> bytes:
+    """array → octets little-endian, quel que soit l'ordre natif."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+# ============================================================
+# Écriture
+# ============================================================
+def write_artifact(final: dict, path: str):
+    """
+    Écrit le document final (même structure que wikiquran_final.json) au format binaire.
+    Les champs absents d'une ligne sont écrits à None.
+    """
+    header = {"meta": final.get("meta", {}), "tables": {}}
+
+    with open(path, "wb") as f:
+        f.write(b"\0" * _PREAMBLE.size)   # réservé, réécrit à la fin
+
+        def block(data: bytes) -> list[int]:
+            """Écrit un bloc aligné, retourne [position, taille]."""
+            f.write(b"\0" * (-f.tell() % ALIGN))
+            position = f.tell()
+            f.write(data)
+            return [position, len(data)]
+
+        for table in SCHEMA:
+            rows = final.get(table, [])
+            table_header = {"count": len(rows), "columns": {}}
+            for name, kind in _columns(table, rows):
+                values = [row.get(name) for row in rows]
+                column = {"type": kind}
+                if kind == "i4":
+                    column["data"] = block(_le_bytes(array("i", (NULL_INT if v is None else v for v in values))))
+                else:
+                    encoded = [b"" if v is None else v.encode("utf-8") for v in values]
+                    offsets = array("I", [0])
+                    for chunk in encoded:
+                        offsets.append(offsets[-1] + len(chunk))
+                    column["offsets"] = block(_le_bytes(offsets))
+                    column["data"] = block(b"".join(encoded))
+                    if any(v is None for v in values):
+                        column["nulls"] = block(bytes(v is None for v in values))
+                table_header["columns"][name] = column
+            header["tables"][table] = table_header
+
+        header_position, header_size = block(json.dumps(header, ensure_ascii=False).encode("utf-8"))
+        f.seek(0)
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, 0, header_position, header_size))
+
+
+# ============================================================
+# Lecture
+# ============================================================
+class StringColumn:
+    """Colonne de chaînes : décodage à la demande, ligne par ligne."""
+
+    def __init__(self, offsets, data: memoryview, nulls: memoryview | None):
+        self._offsets = offsets
+        self._data = data
+        self._nulls = nulls
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str | None:
+        if self._nulls is not None and self._nulls[i]:
+            return None
+        return str(self._data[self._offsets[i]:self._offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class Table:
+    """Une table du corpus : colonnes typées, lignes reconstituées en dict à la demande."""
+
+    def __init__(self, artifact: "CorpusArtifact", name: str, header: dict):
+        self._artifact = artifact
+        self.name = name
+        self.count = header["count"]
+        self._columns = header["columns"]
+        self._cache: dict = {}
+
+    def column(self, name: str):
+        """
+        Colonne brute : memoryview int32 (None = NULL_INT) ou StringColumn.
+        Aucune copie sur une machine little-endian.
+        """
+        if name not in self._cache:
+            spec = self._columns[name]
+            if spec["type"] == "i4":
+                self._cache[name] = self._artifact._ints(spec["data"], "i")
+            else:
+                nulls = spec.get("nulls")
+                self._cache[name] = StringColumn(
+                    self._artifact._ints(spec["offsets"], "I"),
+                    self._artifact._bytes(spec["data"]),
+                    self._artifact._bytes(nulls) if nulls else None,
+                )
+        return self._cache[name]
+
+    def value(self, name: str, i: int):
+        """Valeur d'une cellule, NULL_INT converti en None."""
+        value = self.column(name)[i]
+        return None if value == NULL_INT else value
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _row(self, i: int) -> dict:
+        return {name: self.value(name, i) for name in self._columns}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self.count))]
+        return self._row(index)
+
+    def __iter__(self):
+        return (self._row(i) for i in range(self.count))
+
+
+class CorpusArtifact:
+    """
+    Fichier du corpus ouvert en mmap.
+    artifact.table('ayahs') se parcourt comme la liste de dicts du JSON,
+    artifact.table('ayahs').column('id') donne la colonne typée sans rien décoder.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, header_position, header_size = _PREAMBLE.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} : pas un fichier corpus WikiQuran")
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"{path} : version {version} non supportée (attendu {VERSION})")
+
+        header = json.loads(self._map[header_position:header_position + header_size].decode("utf-8"))
+        self.meta: dict = header["meta"]
+        self._tables = header["tables"]
+
+    def table(self, name: str) -> Table:
+        return Table(self, name, self._tables[name])
+
+    def __getitem__(self, name: str):
+        """artifact['ayahs'] comme final['ayahs'] — compatibilité avec le code JSON."""
+        return self.meta if name == "meta" else self.table(name)
+
+    def _bytes(self, span: list[int]) -> memoryview:
+        position, length = span
+        return memoryview(self._map)[position:position + length]
+
+    def _ints(self, span: list[int], typecode: str):
+        view = self._bytes(span)
+        if sys.byteorder == "little":
+            return view.cast(typecode)
+        values = array(typecode, view.tobytes())
+        values.byteswap()
+        return values
+
+    def close(self):
+        # Les memoryview encore vivantes empêchent la fermeture : on laisse le GC s'en charger
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,94 @@
+"""
+WikiQuran — utils/progress.py
+Suivi de progression des imports longs : lignes/s, temps restant estimé, mémoire.
+
+    progress = Progress("SHARES_ROOT", total=len(rows), start=offset)
+    for ...:
+        progress.update(done)
+    progress.finish()
+
+Affiche au plus une ligne toutes les `every` secondes (et toujours la dernière),
+quel que soit le volume : 6 000 versets ou 6 millions de relations.
+"""
+
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+
+def rss_mb() -> float | None:
+    """Mémoire résidente actuelle du processus (Mo), pic RSS à défaut."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss : kilo-octets sous Linux, octets sous macOS
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+def format_duration(seconds: float) -> str:
+    """3725 → '1h02m05s'."""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m{secs:02d}s"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
+
+
+class Progress:
+    """
+    Progression d'une boucle par lots.
+    `start` : lignes déjà traitées lors d'une exécution précédente (reprise) —
+    elles comptent dans le pourcentage, pas dans le débit.
+    """
+
+    def __init__(self, label: str, total: int, start: int = 0, every: float = 5.0):
+        self.label = label
+        self.total = total
+        self.start = start
+        self.every = every
+        self.done = start
+        self._t0 = time.perf_counter()
+        self._last = self._t0
+
+    def rate(self) -> float:
+        """Lignes par seconde depuis le début de cette exécution."""
+        elapsed = time.perf_counter() - self._t0
+        return (self.done - self.start) / elapsed if elapsed > 0 else 0.0
+
+    def line(self) -> str:
+        pct = self.done * 100 / self.total if self.total else 100.0
+        rate = self.rate()
+        eta = format_duration((self.total - self.done) / rate) if rate > 0 else "?"
+        memory = rss_mb()
+        memory = f"{memory:,.0f} Mo" if memory is not None else "?"
+        return (f"  ⏳ {self.label} {self.done:>{len(f'{self.total:,}')},}/{self.total:,} "
+                f"({pct:5.1f}%) | {rate:,.0f} lignes/s | reste {eta} | RSS {memory}")
+
+    def update(self, done: int):
+        """Enregistre l'avancement ; affiche si `every` secondes se sont écoulées."""
+        self.done = done
+        now = time.perf_counter()
+        if now - self._last >= self.every or done >= self.total:
+            self._last = now
+            print(self.line(), flush=True)
+
+    def finish(self) -> float:
+        """Durée de cette exécution (s)."""
+        elapsed = time.perf_counter() - self._t0
+        print(f"  ⏱️  {self.label} : {format_duration(elapsed)} "
+              f"({self.rate():,.0f} lignes/s)", flush=True)
+        return elapsed